@@ -69,13 +69,22 @@ class Client(
         mock: t.Optional[bool] = None,
         override_baudrate: t.Optional[int] = None,
         generation: t.Optional[str] = None,
+        *,
+        unthrottled: bool = False,
     ) -> te.Self:
         """
         Open a new client
+
+        :param unthrottled:
+            If ``True``, the mock client produces results as fast as possible, ignoring the
+            configured update rate. Only supported together with ``mock``.
         """
         if len([e for e in [ip_address, serial_port, usb_device, mock] if e is not None]) > 1:
             raise ValueError("Only one connection can be selected")
 
+        if unthrottled and not mock:
+            raise ValueError("'unthrottled' is only supported by the mock client")
+
         for subclass in cls.__registry:
             try:
                 # For a class to be in the "__registry"-list it needs to be a subclass,
@@ -92,6 +101,7 @@ class Client(
                     mock,
                     override_baudrate,
                     generation,
+                    unthrottled=unthrottled,
                 )
             except ClientCreationError:
                 continue
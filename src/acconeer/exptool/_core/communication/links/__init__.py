@@ -1,8 +1,9 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from .buffered_link import BufferedLink, LinkError
 from .null_link import NullLink, NullLinkError
+from .receive_buffer import ReceiveBuffer
 from .serial_link import ExploreSerialLink, SerialLink, SerialProcessLink
 from .socket_link import SocketLink
 from .usb_link import USBLink
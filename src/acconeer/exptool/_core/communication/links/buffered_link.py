@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 import abc
@@ -36,6 +36,13 @@ class BufferedLink(abc.ABC):
         """Recieves `num_bytes` bytes."""
         pass
 
+    def recv_into(self, buffer: memoryview) -> None:
+        """Recieves exactly ``len(buffer)`` bytes into ``buffer``.
+
+        Links that can receive directly into ``buffer`` override this to avoid copies.
+        """
+        buffer[:] = self.recv(len(buffer))
+
     @abc.abstractmethod
     def recv_until(self, byte_sequence: bytes) -> bytes:
         """Collects all bytes until `byte_sequence` is encountered,
@@ -0,0 +1,124 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import typing as t
+
+
+class ReceiveBuffer:
+    """Offset-based buffer for received bytes
+
+    Received bytes are appended at the end of a preallocated ``bytearray`` and consumed from the
+    front by moving an offset, instead of re-slicing the whole buffer on every read. Remaining
+    bytes are only moved to the front of the buffer when more room is needed.
+
+    :meth:`find` remembers how much of the buffer has already been searched, so that a
+    terminator search that is repeated as more bytes arrive doesn't rescan the same bytes.
+    """
+
+    DEFAULT_CAPACITY = 1 << 16
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._buf = bytearray(capacity)
+        self._start = 0
+        self._end = 0
+        self._num_searched = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def clear(self) -> None:
+        self._start = 0
+        self._end = 0
+        self._num_searched = 0
+
+    def extend(self, data: t.Union[bytes, bytearray, memoryview]) -> None:
+        """Appends ``data`` to the end of the buffer"""
+        num_bytes = len(data)
+        self._reserve(num_bytes)
+        self._buf[self._end : self._end + num_bytes] = data
+        self._end += num_bytes
+
+    def fill(self, readinto: t.Callable[[memoryview], t.Optional[int]], max_bytes: int) -> int:
+        """Lets ``readinto`` write at most ``max_bytes`` directly into the end of the buffer
+
+        :param readinto:
+            A function like ``socket.recv_into``, writing into the given memoryview and returning
+            the number of bytes written.
+        :returns: The number of bytes written
+        """
+        self._reserve(max_bytes)
+        with memoryview(self._buf) as mv, mv[self._end : self._end + max_bytes] as view:
+            num_bytes = readinto(view) or 0
+
+        self._end += num_bytes
+        return num_bytes
+
+    def find(self, byte_sequence: bytes) -> int:
+        """Searches for ``byte_sequence``, skipping bytes that have already been searched
+
+        :returns:
+            The number of bytes up to and including ``byte_sequence`` if found, otherwise -1
+        """
+        search_start = self._start + max(0, self._num_searched - len(byte_sequence) + 1)
+        i = self._buf.find(byte_sequence, search_start, self._end)
+
+        if i < 0:
+            self._num_searched = len(self)
+            return -1
+
+        return i - self._start + len(byte_sequence)
+
+    def read(self, num_bytes: int) -> bytearray:
+        """Consumes and returns ``num_bytes`` bytes from the front of the buffer"""
+        start = self._start
+        end = start + num_bytes
+        if end > self._end:
+            raise ValueError(f"Cannot read {num_bytes} bytes, only {len(self)} are buffered")
+
+        data = self._buf[start:end]
+        self._consume(num_bytes)
+        return data
+
+    def read_into(self, out: memoryview) -> int:
+        """Consumes as many bytes as are buffered, and fits, into ``out``
+
+        :returns: The number of bytes written to ``out``
+        """
+        start = self._start
+        num_bytes = min(len(out), self._end - start)
+
+        if num_bytes > 0:
+            with memoryview(self._buf) as mv:
+                out[:num_bytes] = mv[start : start + num_bytes]
+
+        self._consume(num_bytes)
+        return num_bytes
+
+    def _consume(self, num_bytes: int) -> None:
+        self._start += num_bytes
+
+        if self._start == self._end:
+            self._start = 0
+            self._end = 0
+            self._num_searched = 0
+        elif self._num_searched > num_bytes:
+            self._num_searched -= num_bytes
+        else:
+            self._num_searched = 0
+
+    def _reserve(self, num_bytes: int) -> None:
+        """Makes sure there is room for ``num_bytes`` more bytes at the end of the buffer"""
+        if self._end + num_bytes <= len(self._buf):
+            return
+
+        num_buffered = len(self)
+        if self._start > 0:
+            self._buf[:num_buffered] = self._buf[self._start : self._end]
+            self._start = 0
+            self._end = num_buffered
+
+        if num_buffered + num_bytes > len(self._buf):
+            new_capacity = max(2 * len(self._buf), num_buffered + num_bytes)
+            self._buf.extend(bytes(new_capacity - len(self._buf)))
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 from __future__ import annotations
 
@@ -15,6 +15,7 @@ from typing import Optional, Tuple, Union
 import serial
 
 from .buffered_link import BufferedLink, LinkError
+from .receive_buffer import ReceiveBuffer
 
 
 log = logging.getLogger(__name__)
@@ -101,7 +102,7 @@ class ExploreSerialLink(SerialLink):
 
     def __init__(self, port: str, flowcontrol: bool = True) -> None:
         super().__init__(port, flowcontrol)
-        self._buf = bytearray()
+        self._buf = ReceiveBuffer()
 
     def _update_timeout(self) -> None:
         pass
@@ -116,7 +117,7 @@ class ExploreSerialLink(SerialLink):
         self._ser.port = self._port
         self._ser.rtscts = self._flowcontrol
         self._ser.open()
-        self._buf = bytearray()
+        self._buf.clear()
 
         if platform.system().lower() == "windows":
             self._ser.set_buffer_size(rx_size=10**6, tx_size=10**6)
@@ -131,40 +132,29 @@ class ExploreSerialLink(SerialLink):
                 raise LinkError("recv timeout")
 
             try:
-                r = bytearray(self._ser.read(self._SERIAL_READ_PACKET_SIZE))
+                self._buf.extend(self._ser.read(self._SERIAL_READ_PACKET_SIZE))
             except OSError as e:
                 raise LinkError from e
-            self._buf.extend(r)
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+        return self._buf.read(num_bytes)
 
     def recv_until(self, bs: bytes) -> bytes:
         assert self._ser is not None
         t0 = time()
         while True:
-            try:
-                i = self._buf.index(bs)
-            except ValueError:
-                pass
-            else:
+            num_bytes = self._buf.find(bs)
+            if num_bytes >= 0:
                 break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
             try:
-                r = bytearray(self._ser.read(self._SERIAL_READ_PACKET_SIZE))
+                self._buf.extend(self._ser.read(self._SERIAL_READ_PACKET_SIZE))
             except OSError as e:
                 raise LinkError from e
-            self._buf.extend(r)
 
-        i += 1
-        data = self._buf[:i]
-        self._buf = self._buf[i:]
-
-        return data
+        return self._buf.read(num_bytes)
 
 
 class SerialProcessLink(BaseSerialLink):
@@ -172,6 +162,7 @@ class SerialProcessLink(BaseSerialLink):
         super().__init__()
         self._port = port
         self._process: Optional[mp.Process] = None
+        self._buf = ReceiveBuffer()
 
     def _update_timeout(self) -> None:
         pass
@@ -218,7 +209,7 @@ class SerialProcessLink(BaseSerialLink):
 
         log.debug("connect - successful")
 
-        self._buf = bytearray()
+        self._buf.clear()
 
     def recv(self, num_bytes: int) -> bytes:
         self.__empty_queue_into_buf()
@@ -230,36 +221,23 @@ class SerialProcessLink(BaseSerialLink):
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+        return self._buf.read(num_bytes)
 
     def recv_until(self, bs: bytes) -> bytes:
         self.__empty_queue_into_buf()
 
-        n = len(bs)
-        si = 0
         t0 = time()
         while True:
-            buf_size = len(self._buf)
-            if buf_size >= n:
-                try:
-                    i = self._buf.index(bs, si)
-                except ValueError:
-                    pass
-                else:
-                    break
-
-                si = buf_size - n + 1
+            num_bytes = self._buf.find(bs)
+            if num_bytes >= 0:
+                break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
             self.__get_into_buf()
 
-        data = self._buf[: i + n]
-        self._buf = self._buf[i + n :]
-        return data
+        return self._buf.read(num_bytes)
 
     def send(self, data: bytes) -> None:
         self._send_queue.put(data)
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 from __future__ import annotations
 
@@ -7,17 +7,18 @@ from time import time
 from typing import Optional
 
 from .buffered_link import BufferedLink, LinkError
+from .receive_buffer import ReceiveBuffer
 
 
 class SocketLink(BufferedLink):
-    _CHUNK_SIZE = 4096
+    _CHUNK_SIZE = 65536
     _PORT = 6110
 
     def __init__(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
         super().__init__()
         self._host = host
         self._sock: Optional[socket.socket] = None
-        self._buf: bytearray = bytearray()
+        self._buf = ReceiveBuffer()
         self._port: int = self._PORT if (port is None) else port
 
     def _update_timeout(self) -> None:
@@ -35,46 +36,54 @@ class SocketLink(BufferedLink):
             self._sock = None
             raise LinkError("failed to connect") from e
 
-        self._buf = bytearray()
+        self._buf.clear()
 
-    def recv(self, num_bytes: int) -> bytes:
+    def _recv_into_buf(self) -> None:
         assert self._sock is not None
+        try:
+            num_bytes = self._buf.fill(self._sock.recv_into, self._CHUNK_SIZE)
+        except OSError as e:
+            raise LinkError from e
+
+        if num_bytes == 0:
+            raise LinkError("connection closed")
+
+    def recv(self, num_bytes: int) -> bytes:
         while len(self._buf) < num_bytes:
+            self._recv_into_buf()
+
+        return self._buf.read(num_bytes)
+
+    def recv_into(self, buffer: memoryview) -> None:
+        assert self._sock is not None
+        num_bytes = len(buffer)
+        num_received = self._buf.read_into(buffer)
+
+        # Anything not already buffered is received straight into ``buffer``
+        while num_received < num_bytes:
             try:
-                r = self._sock.recv(self._CHUNK_SIZE)
+                r = self._sock.recv_into(buffer[num_received:])
             except OSError as e:
                 raise LinkError from e
-            self._buf.extend(r)
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+            if r == 0:
+                raise LinkError("connection closed")
+
+            num_received += r
 
     def recv_until(self, bs: bytes) -> bytes:
-        assert self._sock is not None
         t0 = time()
         while True:
-            try:
-                i = self._buf.index(bs)
-            except ValueError:
-                pass
-            else:
+            num_bytes = self._buf.find(bs)
+            if num_bytes >= 0:
                 break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
-            try:
-                r = self._sock.recv(self._CHUNK_SIZE)
-            except OSError as e:
-                raise LinkError from e
-            self._buf.extend(r)
-
-        i += 1
-        data = self._buf[:i]
-        self._buf = self._buf[i:]
+            self._recv_into_buf()
 
-        return data
+        return self._buf.read(num_bytes)
 
     def send(self, data: bytes) -> None:
         assert self._sock is not None
@@ -85,4 +94,4 @@ class SocketLink(BufferedLink):
             self._sock.shutdown(socket.SHUT_RDWR)
             self._sock.close()
             self._sock = None
-        self._buf = bytearray()
+        self._buf.clear()
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 from __future__ import annotations
 
@@ -8,6 +8,7 @@ from typing import Any, Optional
 from acconeer.exptool._pyusb import PyUsbCdc
 
 from .buffered_link import BufferedLink, LinkError
+from .receive_buffer import ReceiveBuffer
 
 
 ComPort: Any
@@ -25,6 +26,7 @@ class USBLink(BufferedLink):
         self._vid = vid
         self._pid = pid
         self._serial = serial
+        self._buf = ReceiveBuffer()
 
     def _update_timeout(self) -> None:
         # timeout is manually handled in recv/recv_until
@@ -45,7 +47,7 @@ class USBLink(BufferedLink):
         if not self._port.open():
             raise LinkError(f"Unable to connect to port (vid={self._vid}, pid={self._pid}")
 
-        self._buf = bytearray()
+        self._buf.clear()
         self.send_break()
 
     def send_break(self) -> None:
@@ -60,39 +62,28 @@ class USBLink(BufferedLink):
                 raise LinkError("recv timeout")
 
             try:
-                r = bytearray(self._port.read())
+                self._buf.extend(self._port.read())
             except OSError as e:
                 raise LinkError from e
-            self._buf.extend(r)
 
-        data = self._buf[:num_bytes]
-        self._buf = self._buf[num_bytes:]
-        return data
+        return self._buf.read(num_bytes)
 
     def recv_until(self, bs: bytes) -> bytes:
         t0 = time()
         while True:
-            try:
-                i = self._buf.index(bs)
-            except ValueError:
-                pass
-            else:
+            num_bytes = self._buf.find(bs)
+            if num_bytes >= 0:
                 break
 
             if time() - t0 > self._timeout:
                 raise LinkError("recv timeout")
 
             try:
-                r = bytearray(self._port.read())
+                self._buf.extend(self._port.read())
             except OSError as e:
                 raise LinkError from e
-            self._buf.extend(r)
-
-        i += 1
-        data = self._buf[:i]
-        self._buf = self._buf[i:]
 
-        return data
+        return self._buf.read(num_bytes)
 
     def send(self, data: bytes) -> None:
         self._port.write(data)
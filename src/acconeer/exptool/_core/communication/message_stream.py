@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 from __future__ import annotations
 
@@ -6,6 +6,8 @@ import json
 import time
 import typing as t
 
+from acconeer.exptool._core.profiling import StageProfiler
+
 from .communication_protocol import CommunicationProtocol, Message
 from .links import BufferedLink
 
@@ -36,6 +38,7 @@ class MessageStream:
         self._message_handler = message_handler
 
         self.protocol = protocol
+        self.profiler: t.Optional[StageProfiler] = None
 
         self._stream = self._get_stream()
 
@@ -77,25 +80,44 @@ class MessageStream:
     def _get_stream(self) -> t.Iterator[Message]:
         """returns an iterator of parsed messages"""
         while True:
+            profiler = self.profiler
+            if profiler is not None:
+                timestamp = time.perf_counter_ns()
+
             try:
                 header_in_bytes = self._link.recv_until(self.protocol.end_sequence)
             except Exception as e:
                 self._error_callback(e)
 
+            if profiler is not None:
+                timestamp = profiler.lap("read_header", timestamp)
+
             try:
                 header: dict[str, t.Any] = json.loads(header_in_bytes)
             except json.JSONDecodeError:
                 self._error_callback(RuntimeError(f"Cannot decode header {header_in_bytes!r}"))
 
+            if profiler is not None:
+                timestamp = profiler.lap("parse_header", timestamp)
+
             try:
                 payload_size = header["payload_size"]
             except KeyError:
-                payload = bytes()
+                payload = bytearray()
             else:
+                # A new buffer per message, as parsed messages may keep views into it.
+                payload = bytearray(payload_size)
                 try:
-                    payload = self._link.recv(payload_size)
+                    self._link.recv_into(memoryview(payload))
                 except Exception as e:
                     self._error_callback(e)
 
+                if profiler is not None:
+                    timestamp = profiler.lap("read_payload", timestamp)
+
             resp = self.protocol.parse_message(header, payload)
+
+            if profiler is not None:
+                profiler.lap("parse_message", timestamp)
+
             yield resp
@@ -1,10 +1,13 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from __future__ import annotations
 
 from typing import Optional, Tuple
 
+import numpy as np
+import numpy.typing as npt
+
 
 def unwrap_ticks(
     ticks: list[int], minimum_tick: Optional[int], limit: int = 2**32
@@ -50,3 +53,65 @@ def unwrap_ticks(
         ticks = [num_wraps * limit + tick for tick in ticks]
 
     return ticks, max(ticks)
+
+
+def unwrap_ticks_array(
+    ticks: npt.ArrayLike, minimum_tick: Optional[int], limit: int = 2**32
+) -> Tuple[npt.NDArray[np.int64], Optional[int]]:
+    """Unwraps the ticks of several consecutive extended results at once
+
+    Gives the same result as calling :func:`unwrap_ticks` on each row of ``ticks`` in order,
+    passing the returned minimum tick on to the next call, but in a single NumPy pass.
+
+    This works since the number of wraps added to a row only depends on the number of wraps
+    added to the previous row, and on how far the smallest tick of the row is below the largest
+    tick of the previous row. The number of wraps of every row is thus a cumulative sum.
+
+    >>> unwrapped, minimum_tick = unwrap_ticks_array([[10, 90], [20, 30]], minimum_tick=70, limit=100)
+    >>> unwrapped.tolist(), minimum_tick
+    ([[110, 90], [120, 130]], 130)
+
+    :param ticks:
+        A ``(num_extended_results, num_entries)`` array of ticks. A 1-D array is treated as
+        extended results with a single entry.
+    :returns: The unwrapped ticks, in the same shape as ``ticks``, and the new minimum tick
+    """
+    ticks_array = np.asarray(ticks, dtype=np.int64)
+    one_dimensional = ticks_array.ndim == 1
+    if one_dimensional:
+        ticks_array = ticks_array[:, np.newaxis]
+
+    if ticks_array.ndim != 2:
+        raise ValueError("ticks must be a 1-D or 2-D array")
+
+    num_results, num_entries = ticks_array.shape
+    if num_results == 0:
+        return np.asarray(ticks, dtype=np.int64), minimum_tick
+    if num_entries == 0:
+        return ticks_array.copy(), None
+
+    if np.any((ticks_array < 0) | (ticks_array >= limit)):
+        raise ValueError("Tick value out of bounds")
+
+    # Wraps within an extended result
+    half_limit = limit // 2
+    spread = ticks_array.max(axis=1) - ticks_array.min(axis=1)
+    wraps_within = (spread > half_limit)[:, np.newaxis] & (ticks_array < half_limit)
+    ticks_array = ticks_array + wraps_within * limit
+
+    row_min = ticks_array.min(axis=1)
+    row_max = ticks_array.max(axis=1)
+
+    # Wraps between extended results: ceil((previous maximum - minimum) / limit)
+    num_wraps = np.empty(num_results, dtype=np.int64)
+    num_wraps[0] = 0 if minimum_tick is None else -((row_min[0] - minimum_tick) // limit)
+    num_wraps[1:] = -((row_min[1:] - row_max[:-1]) // limit)
+    num_wraps = np.cumsum(num_wraps)
+
+    ticks_array += (num_wraps * limit)[:, np.newaxis]
+    new_minimum_tick = int(row_max[-1] + num_wraps[-1] * limit)
+
+    if one_dimensional:
+        ticks_array = ticks_array[:, 0]
+
+    return ticks_array, new_minimum_tick
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -12,14 +12,46 @@ from numpy import typing as npt
 INT_16_COMPLEX = np.dtype([("real", "int16"), ("imag", "int16")])
 
 
-def int16_complex_array_to_complex(array: npt.NDArray[t.Any]) -> npt.NDArray[np.complex_]:
+def int16_complex_array_to_complex(
+    array: npt.NDArray[t.Any],
+    dtype: npt.DTypeLike = np.complex128,
+    out: t.Optional[npt.NDArray[t.Any]] = None,
+) -> npt.NDArray[t.Any]:
     """Converts an array with dtype = INT_16_COMPLEX
     (structured with parts "real" and "imag") into
     an array with plain complex dtype (non-structured).
+
+    The int16 pairs are cast straight into the output, without any float temporaries.
+
+    :param dtype: The complex output dtype, ``complex128`` (default) or ``complex64``
+    :param out:
+        Optional preallocated output array with the same shape as ``array``. If given,
+        ``dtype`` is ignored.
+    :returns: The converted array (``out`` if given)
     """
-    real = array["real"].astype("float")
-    imaginary = array["imag"].astype("float")
-    return real + 1.0j * imaginary  # type: ignore[no-any-return]
+    if out is None:
+        out = np.empty(array.shape, dtype=dtype)
+    elif out.shape != array.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {array.shape}")
+
+    if out.dtype.kind != "c":
+        raise ValueError(f"Output dtype must be complex, not {out.dtype}")
+
+    if (
+        array.dtype == INT_16_COMPLEX
+        and array.ndim > 0
+        and array.flags.c_contiguous
+        and out.flags.c_contiguous
+    ):
+        # View both arrays as (..., 2) arrays of (real, imag) and cast in a single pass
+        int16_pairs = array.view(np.int16).reshape(*array.shape, 2)
+        float_pairs = out.view(out.real.dtype).reshape(*out.shape, 2)
+        float_pairs[...] = int16_pairs
+    else:
+        out.real = array["real"]
+        out.imag = array["imag"]
+
+    return out
 
 
 def complex_array_to_int16_complex(array: npt.NDArray[np.complex_]) -> npt.NDArray[t.Any]:
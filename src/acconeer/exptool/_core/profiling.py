@@ -0,0 +1,211 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import math
+import time
+import typing as t
+
+import attrs
+import numpy as np
+import numpy.typing as npt
+
+
+# Durations are binned logarithmically, 10 bins per decade from 1 ns up to 100 s.
+_BINS_PER_DECADE = 10
+_NUM_BINS = 11 * _BINS_PER_DECADE + 1
+_BIN_EDGES_S: npt.NDArray[np.float64] = np.append(
+    0.0, 10.0 ** (np.arange(_NUM_BINS) / _BINS_PER_DECADE) * 1e-9
+)
+
+
+@attrs.frozen(kw_only=True)
+class StageStats:
+    """Aggregated durations of one stage
+
+    The durations are kept in a histogram with logarithmically spaced bins, so percentiles are
+    approximate, to within about 25%. The count, total, minimum and maximum are exact.
+    """
+
+    count: int
+    """Number of times the stage was timed"""
+
+    total_s: float
+    """Total time spent in the stage"""
+
+    min_s: float
+    """Shortest duration of the stage"""
+
+    max_s: float
+    """Longest duration of the stage"""
+
+    bin_edges_s: npt.NDArray[np.float64]
+    """The ``len(counts) + 1`` edges of the histogram bins"""
+
+    counts: npt.NDArray[np.int64]
+    """Number of durations in each histogram bin"""
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count
+
+    def percentile(self, q: float) -> float:
+        """Approximates the ``q``:th percentile of the durations from the histogram
+
+        :param q: Percentile, between 0 and 100
+        :returns: The upper edge of the bin the percentile falls in, clamped to min and max
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("q must be between 0 and 100")
+
+        cumulative_counts = np.cumsum(self.counts)
+        bin_idx = int(np.searchsorted(cumulative_counts, q / 100 * self.count))
+        return min(max(float(self.bin_edges_s[bin_idx + 1]), self.min_s), self.max_s)
+
+
+class _StageHistogram:
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: t.Union[int, float] = math.inf
+        self.max_ns = 0
+        self.counts = [0] * _NUM_BINS
+
+    def add(self, duration_ns: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        self.min_ns = min(self.min_ns, duration_ns)
+        self.max_ns = max(self.max_ns, duration_ns)
+
+        if duration_ns <= 1:
+            bin_idx = 0
+        else:
+            bin_idx = math.ceil(math.log10(duration_ns) * _BINS_PER_DECADE)
+
+        self.counts[min(bin_idx, _NUM_BINS - 1)] += 1
+
+
+class _StageTimer:
+    __slots__ = ("_histogram", "_start_ns")
+
+    def __init__(self, histogram: _StageHistogram) -> None:
+        self._histogram = histogram
+        self._start_ns = 0
+
+    def __enter__(self) -> None:
+        self._start_ns = time.perf_counter_ns()
+
+    def __exit__(self, *_: t.Any) -> None:
+        self._histogram.add(time.perf_counter_ns() - self._start_ns)
+
+
+class StageProfiler:
+    """Times the stages between reading a result from the link and using it
+
+    Each stage is timed with the monotonic ``time.perf_counter_ns`` and its durations are
+    aggregated into a histogram per stage. A profiler is opt-in: it is attached to a client (or
+    a processor backend plugin), which then times its stages. Without a profiler, the only
+    overhead is checking whether one is attached.
+
+    The stages of a client are
+
+    - ``read_header``, ``parse_header`` and ``read_payload``: reading and decoding a message from
+      the link. Reading the header includes waiting for the server to send the message
+    - ``parse_message``: parsing the message
+    - ``unwrap_ticks``: unwrapping the ticks of the results
+    - ``assemble_results``: constructing the results of the message
+    - ``record``: sampling the results in the attached recorder
+
+    and processor backend plugins add
+
+    - ``process``: processing the results
+    - ``plot_callback``: sending the processor result to be plotted
+
+    Example:
+
+    .. code-block:: python
+
+        profiler = StageProfiler()
+        client.attach_profiler(profiler)
+        ...
+        print(profiler.summary())
+    """
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, _StageHistogram] = {}
+
+    def measure(self, stage: str) -> t.ContextManager[None]:
+        """Returns a context manager that times the stage ``stage``
+
+        Each call returns a new context manager, so the same stage can be timed in nested or
+        concurrent ``with`` blocks.
+        """
+        try:
+            histogram = self._histograms[stage]
+        except KeyError:
+            histogram = self._histogram(stage)
+        return _StageTimer(histogram)
+
+    def lap(self, stage: str, start_ns: int) -> int:
+        """Adds the time from ``start_ns`` until now to the stage ``stage``
+
+        Consecutive stages are timed by passing the returned timestamp on to the next lap.
+
+        :param start_ns: A ``time.perf_counter_ns()`` timestamp of when the stage started
+        :returns: The ``time.perf_counter_ns()`` timestamp of when the stage ended
+        """
+        end_ns = time.perf_counter_ns()
+        try:
+            histogram = self._histograms[stage]
+        except KeyError:
+            histogram = self._histogram(stage)
+        histogram.add(end_ns - start_ns)
+        return end_ns
+
+    def _histogram(self, stage: str) -> _StageHistogram:
+        return self._histograms.setdefault(stage, _StageHistogram())
+
+    @property
+    def stats(self) -> dict[str, StageStats]:
+        """The aggregated durations of each stage timed so far, in the order first timed"""
+        return {
+            stage: StageStats(
+                count=histogram.count,
+                total_s=histogram.total_ns * 1e-9,
+                min_s=histogram.min_ns * 1e-9,
+                max_s=histogram.max_ns * 1e-9,
+                bin_edges_s=_BIN_EDGES_S,
+                counts=np.array(histogram.counts, dtype=np.int64),
+            )
+            for stage, histogram in self._histograms.items()
+            if histogram.count > 0
+        }
+
+    def reset(self) -> None:
+        """Forgets all durations timed so far"""
+        for histogram in self._histograms.values():
+            histogram.clear()
+
+    def summary(self) -> str:
+        """Returns a table of the count, mean, median, 99th percentile and max of each stage"""
+        header = ("stage", "count", "mean [us]", "p50 [us]", "p99 [us]", "max [us]")
+        rows = [
+            (
+                stage,
+                str(s.count),
+                f"{s.mean_s * 1e6:.1f}",
+                f"{s.percentile(50) * 1e6:.1f}",
+                f"{s.percentile(99) * 1e6:.1f}",
+                f"{s.max_s * 1e6:.1f}",
+            )
+            for stage, s in self.stats.items()
+        ]
+        widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+        return "\n".join(
+            "  ".join(cell.rjust(width) for cell, width in zip(row, widths))
+            for row in [header, *rows]
+        )
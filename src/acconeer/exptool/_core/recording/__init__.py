@@ -1,5 +1,13 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
-from .h5_record import ChunkedH5Saver, H5Recorder, H5Saver
+from .h5_record import (
+    BackPressure,
+    ChunkedH5Saver,
+    H5Recorder,
+    H5Saver,
+    SaverQueueFullError,
+    ThreadedH5Saver,
+    ThreadedH5SaverStats,
+)
 from .recorder import Recorder, RecorderAttachable
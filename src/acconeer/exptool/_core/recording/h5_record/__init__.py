@@ -1,5 +1,12 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from .recorder import H5Recorder
-from .saver import ChunkedH5Saver, H5Saver
+from .saver import (
+    BackPressure,
+    ChunkedH5Saver,
+    H5Saver,
+    SaverQueueFullError,
+    ThreadedH5Saver,
+    ThreadedH5SaverStats,
+)
@@ -1,11 +1,14 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from __future__ import annotations
 
+import queue
+import threading
 import typing as t
-from time import time
+from time import perf_counter, time
 
+import attrs
 import h5py
 import typing_extensions as te
 
@@ -15,6 +18,12 @@ _MetadataT = t.TypeVar("_MetadataT", contravariant=True)
 _ResultT = t.TypeVar("_ResultT", contravariant=True)
 _ServerInfoT = t.TypeVar("_ServerInfoT", contravariant=True)
 
+BackPressure = te.Literal["block", "drop_oldest", "raise"]
+
+
+class SaverQueueFullError(Exception):
+    pass
+
 
 class H5Saver(te.Protocol[_ConfigT, _MetadataT, _ResultT, _ServerInfoT]):
     """Interface for savers handling writing results to file"""
@@ -105,3 +114,191 @@ class ChunkedH5Saver(H5Saver[_ConfigT, _MetadataT, _ResultT, _ServerInfoT]):
             self._saver._sample(group, self._chunk_buffer)
             self._chunk_buffer = []
         self._saver._stop_session(group)
+
+
+@attrs.frozen(kw_only=True)
+class ThreadedH5SaverStats:
+    """Statistics of a :class:`ThreadedH5Saver`"""
+
+    queue_depth: int
+    """Number of results currently waiting to be written"""
+
+    max_queue_depth: int
+    """Largest number of results that have been waiting to be written at once"""
+
+    num_written: int
+    """Number of results handed over to the wrapped saver"""
+
+    num_dropped: int
+    """Number of results dropped due to a full queue (only with ``"drop_oldest"``)"""
+
+    mean_write_latency: float
+    """Mean time, in seconds, from a result being sampled until it was handed over"""
+
+    max_write_latency: float
+    """Largest time, in seconds, from a result being sampled until it was handed over"""
+
+
+class ThreadedH5Saver(H5Saver[_ConfigT, _MetadataT, _ResultT, _ServerInfoT]):
+    """Hands results over to a saver running in a dedicated writer thread
+
+    Sampling only puts results in a bounded queue, so that writing (and compressing) chunks of
+    results to file never stalls the caller. The queue is drained when the session is stopped.
+
+    :param saver:
+        Saver used to write results to file, called from the writer thread
+    :param queue_size:
+        Maximum number of results waiting to be written
+    :param back_pressure:
+        What to do when sampling while the queue is full. ``"block"`` waits until there is room in
+        the queue, ``"drop_oldest"`` drops the oldest result in the queue and ``"raise"`` raises a
+        :class:`SaverQueueFullError`. With ``"raise"``, no result of a sample is queued if there
+        is not room for all of them.
+    """
+
+    _SENTINEL = object()
+
+    _saver: H5Saver[_ConfigT, _MetadataT, _ResultT, _ServerInfoT]
+    _back_pressure: BackPressure
+    _queue: queue.Queue[t.Any]
+    _thread: t.Optional[threading.Thread]
+    _writer_error: t.Optional[BaseException]
+
+    def __init__(
+        self,
+        saver: H5Saver[_ConfigT, _MetadataT, _ResultT, _ServerInfoT],
+        queue_size: int = 1024,
+        back_pressure: BackPressure = "block",
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive")
+
+        if back_pressure not in t.get_args(BackPressure):
+            raise ValueError(f"Unknown back pressure policy {back_pressure!r}")
+
+        self._saver = saver
+        self._back_pressure = back_pressure
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._writer_error = None
+
+        self._stats_lock = threading.Lock()
+        self._max_queue_depth = 0
+        self._num_written = 0
+        self._num_dropped = 0
+        self._total_write_latency = 0.0
+        self._max_write_latency = 0.0
+
+    @property
+    def stats(self) -> ThreadedH5SaverStats:
+        with self._stats_lock:
+            return ThreadedH5SaverStats(
+                queue_depth=self._queue.qsize(),
+                max_queue_depth=self._max_queue_depth,
+                num_written=self._num_written,
+                num_dropped=self._num_dropped,
+                mean_write_latency=(
+                    self._total_write_latency / self._num_written if self._num_written else 0.0
+                ),
+                max_write_latency=self._max_write_latency,
+            )
+
+    def _start(self) -> None:
+        self._saver._start()
+
+    def _write_server_info(self, group: h5py.Group, server_info: _ServerInfoT) -> None:
+        self._saver._write_server_info(group, server_info)
+
+    def _start_session(
+        self, group: h5py.Group, *, config: _ConfigT, metadata: _MetadataT, **kwargs: t.Any
+    ) -> None:
+        self._saver._start_session(group, config=config, metadata=metadata, **kwargs)
+
+        self._thread = threading.Thread(target=self._writer, args=(group,), daemon=True)
+        self._thread.start()
+
+    def _sample(self, group: h5py.Group, results: t.Iterable[_ResultT]) -> None:
+        self._raise_writer_error()
+
+        if self._thread is None:
+            raise RuntimeError("No session started yet. This should not happen.")
+
+        results = list(results)
+
+        # Only this thread puts results in the queue, so there is at least as much room left
+        # when putting them. A sample is thereby either queued completely or not at all.
+        if self._back_pressure == "raise" and len(results) > (
+            self._queue.maxsize - self._queue.qsize()
+        ):
+            raise SaverQueueFullError(f"Writer queue is full ({self._queue.maxsize} results)")
+
+        for result in results:
+            self._put((perf_counter(), result))
+
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    def _stop_session(self, group: h5py.Group) -> None:
+        if self._thread is not None:
+            self._queue.put(self._SENTINEL)
+            self._thread.join()
+            self._thread = None
+
+        # Results handed over before a writer error are still flushed by the wrapped saver
+        try:
+            self._raise_writer_error()
+        finally:
+            self._saver._stop_session(group)
+
+    def _put(self, item: t.Tuple[float, _ResultT]) -> None:
+        if self._back_pressure == "block":
+            self._queue.put(item)
+            return
+
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                if self._back_pressure == "raise":
+                    raise SaverQueueFullError(
+                        f"Writer queue is full ({self._queue.maxsize} results)"
+                    ) from None
+
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                continue
+
+            with self._stats_lock:
+                self._num_dropped += 1
+
+    def _writer(self, group: h5py.Group) -> None:
+        while True:
+            item = self._queue.get()
+
+            if item is self._SENTINEL:
+                return
+
+            if self._writer_error is not None:
+                # Keep draining so that the sampling side never blocks on a dead writer.
+                continue
+
+            sample_time, result = item
+            try:
+                self._saver._sample(group, [result])
+            except BaseException as e:
+                self._writer_error = e
+                continue
+
+            latency = perf_counter() - sample_time
+            with self._stats_lock:
+                self._num_written += 1
+                self._total_write_latency += latency
+                self._max_write_latency = max(self._max_write_latency, latency)
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            error = self._writer_error
+            self._writer_error = None
+            raise error
@@ -1,20 +1,78 @@
-# Copyright (c) Acconeer AB, 2022
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
+import itertools
+import logging
+import queue
+import threading
+from time import monotonic
+
 import numpy as np
 
 from acconeer.exptool.a111._clients.base import BaseClient, ClientError
 
 
+log = logging.getLogger(__name__)
+
+
 class MultiClientWrapper(BaseClient):
-    def __init__(self, clients, **kwargs):
+    """Wraps one single sensor client per sensor as one multi sensor client
+
+    By default, the wrapped clients are read one after another, so getting a frame takes the sum
+    of the read times of all clients. With ``concurrent=True``, each client instead streams from
+    its own thread into a queue of its own, and frames are taken from all queues at once.
+
+    In concurrent mode, the frames of the clients are aligned in one of two ways:
+
+    - If ``max_skew`` is ``None``, the n:th frame of every client is put together. When a frame
+      of one client has been dropped, the n:th frames of the other clients are dropped too, which
+      is counted in :attr:`dropped_frames`.
+    - Otherwise, frames are aligned by when they arrived. Frames that arrived more than
+      ``max_skew`` seconds before the latest of the other clients' frames are dropped, which is
+      counted in :attr:`dropped_frames`.
+
+    At most ``queue_size`` frames per client wait to be taken. If frames arrive faster than they
+    are taken, the oldest waiting frame is dropped, which is also counted in
+    :attr:`dropped_frames`.
+
+    :param clients: The clients to wrap, one per sensor
+    :param concurrent: Whether to stream from all clients concurrently
+    :param max_skew:
+        In concurrent mode, the maximum time in seconds between the arrival of the frames that
+        are put together. ``None`` aligns frames by their order instead.
+    :param queue_size: In concurrent mode, the maximum number of waiting frames per client
+    """
+
+    def __init__(self, clients, concurrent=False, max_skew=None, queue_size=16, **kwargs):
         kwargs["squeeze"] = False
         super().__init__(**kwargs)
+
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive")
+
         self.clients = clients
+        self.concurrent = concurrent
+        self.max_skew = max_skew
+        self.queue_size = queue_size
+
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._queues = []
+        self._dropped_frames_lock = threading.Lock()
+        self._dropped_frames = [0] * len(clients)
 
         for client in clients:
             client.squeeze = False
 
+    @property
+    def dropped_frames(self):
+        """The number of frames of each client dropped in the current session
+
+        Frames are dropped to align frames, and when a client's queue is full.
+        """
+        with self._dropped_frames_lock:
+            return list(self._dropped_frames)
+
     def _connect(self):
         for client in self.clients:
             info = client.connect()
@@ -40,20 +98,119 @@ class MultiClientWrapper(BaseClient):
         for client in self.clients:
             client.start_session()
 
+        with self._dropped_frames_lock:
+            self._dropped_frames = [0] * len(self.clients)
+
+        if self.concurrent:
+            self._stop_event.clear()
+            self._queues = [queue.Queue(maxsize=self.queue_size) for _ in self.clients]
+            self._threads = [
+                threading.Thread(target=self._stream, args=(i, client, q), daemon=True)
+                for i, (client, q) in enumerate(zip(self.clients, self._queues))
+            ]
+
+            for thread in self._threads:
+                thread.start()
+
+    def _stream(self, client_idx, client, q):
+        try:
+            for frame_idx in itertools.count():
+                if self._stop_event.is_set():
+                    break
+
+                info, data = client.get_next()
+                self._put_dropping_oldest(client_idx, q, (monotonic(), frame_idx, info, data))
+        except Exception as e:
+            self._put_dropping_oldest(client_idx, q, e)
+
+    def _put_dropping_oldest(self, client_idx, q, item):
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                continue
+
+            self._count_dropped_frame(client_idx, "its queue is full")
+
+    def _count_dropped_frame(self, client_idx, reason):
+        with self._dropped_frames_lock:
+            self._dropped_frames[client_idx] += 1
+
+        log.debug("dropped a frame of sensor {} since {}".format(client_idx + 1, reason))
+
     def _get_next(self):
+        if self.concurrent:
+            results = self._get_next_aligned()
+        else:
+            results = [client.get_next() for client in self.clients]
+
         all_info = []
-        all_data = []
-        for client in self.clients:
-            info, data = client.get_next()
+        for info, _ in results:
             all_info.extend(info)
-            all_data.append(data)
 
-        return all_info, np.concatenate(all_data)
+        return all_info, np.concatenate([data for _, data in results])
+
+    def _get_next_aligned(self):
+        frames = [self._get_queued(i) for i in range(len(self.clients))]
+
+        while True:
+            if self.max_skew is None:
+                latest_frame_idx = max(frame_idx for _, frame_idx, _, _ in frames)
+                stale_idxs = [
+                    i
+                    for i, (_, frame_idx, _, _) in enumerate(frames)
+                    if frame_idx < latest_frame_idx
+                ]
+                reason = "the same frame of another sensor was dropped"
+            else:
+                latest_arrival = max(arrival for arrival, _, _, _ in frames)
+                stale_idxs = [
+                    i
+                    for i, (arrival, _, _, _) in enumerate(frames)
+                    if latest_arrival - arrival > self.max_skew
+                ]
+                reason = "it arrived too early to be aligned"
+
+            if not stale_idxs:
+                break
+
+            for i in stale_idxs:
+                self._count_dropped_frame(i, reason)
+                frames[i] = self._get_queued(i)
+
+        return [(info, data) for _, _, info, data in frames]
+
+    def _get_queued(self, client_idx):
+        item = self._queues[client_idx].get()
+
+        if isinstance(item, Exception):
+            raise ClientError(
+                "client of sensor {} failed to get next".format(client_idx + 1)
+            ) from item
+
+        return item
 
     def _stop_session(self):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join()
+
+        self._threads = []
+        self._queues = []
+
         for client in self.clients:
             client.stop_session()
 
     def _disconnect(self):
         for client in self.clients:
             client.disconnect()
+
+    @property
+    def description(self):
+        return ", ".join(client.description for client in self.clients)
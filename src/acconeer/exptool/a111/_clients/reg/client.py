@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 import abc
@@ -23,6 +23,7 @@ from acconeer.exptool.a111._clients.base import (
     decode_version_str,
 )
 from acconeer.exptool.a111._clients.reg import protocol, regmap
+from acconeer.exptool.a111._clients.reg.regmap import fmt_enc_val
 from acconeer.exptool.a111._modes import Mode
 
 
@@ -49,6 +50,7 @@ class RegBaseClient(BaseClient):
         self._mode = None
         self._config = None
         self._data_length = None
+        self._result_info_decoder = None
 
     def _setup_session(self, config):
         if len(config.sensor) > 1:
@@ -59,6 +61,7 @@ class RegBaseClient(BaseClient):
         mode = config.mode
         self._mode = mode
         self._config = config
+        self._result_info_decoder = regmap.ResultInfoDecoder(mode)
 
         self._write_reg("main_control", "stop")
         self._write_reg("mode_selection", mode)
@@ -258,22 +261,7 @@ class UARTClient(RegBaseClient):
         if not isinstance(packet, protocol.StreamData):
             raise ClientError("got unexpected type of frame")
 
-        info = {}
-        for addr, enc_val in packet.result_info:
-            try:
-                reg = regmap.get_reg(addr, self._mode)
-                val = reg.decode(enc_val)
-            except (protocol.ProtocolError, ValueError):
-                log.info("got unknown reg val in result info")
-                log.info("addr: {}, value: {}".format(addr, fmt_enc_val(enc_val)))
-            else:
-                k = reg.stripped_name
-                k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
-
-                if k is None:
-                    continue
-
-                info[k] = val
+        info = self._result_info_decoder.decode(packet.result_info)
 
         sweeps_per_frame = getattr(self._config, "sweeps_per_frame", None)
         data = protocol.decode_output_buffer(packet.buffer, self._mode, sweeps_per_frame)
@@ -463,14 +451,7 @@ class PollingUARTClient(UARTClient):
         buffer = self._read_buf_raw()
 
         info = {}
-        info_regs = regmap.get_data_info_regs(self._config.mode)
-        for reg in info_regs:
-            k = reg.stripped_name
-            k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
-
-            if k is None:
-                continue
-
+        for k, reg in self._result_info_decoder.data_info_regs:
             info[k] = self._read_reg(reg)
 
         if not self._measure_on_call:
@@ -626,6 +607,7 @@ class SPICommProcess(mp.Process):
         self.cmd_q = cmd_q
         self.data_q = data_q
         self.mode = None
+        self.result_info_decoder = None
 
     def run(self):
         self.log = logging.getLogger(__name__)
@@ -689,14 +671,7 @@ class SPICommProcess(mp.Process):
             buffer = bytearray()
 
         info = {}
-        info_regs = regmap.get_data_info_regs(self.mode)
-        for reg in info_regs:
-            k = reg.stripped_name
-            k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(k, k)
-
-            if k is None:
-                continue
-
+        for k, reg in self.result_info_decoder.data_info_regs:
             info[k] = self.read_reg(reg, do_log=False)
 
         self.write_reg("main_control", "clear_status", do_log=False)
@@ -715,6 +690,7 @@ class SPICommProcess(mp.Process):
 
     def update_state(self, mode, update_rate, buffer_size):
         self.mode = mode
+        self.result_info_decoder = regmap.ResultInfoDecoder(mode)
 
         if update_rate is None:
             self.poll_timeout = 1.0
@@ -765,10 +741,6 @@ class SPICommProcess(mp.Process):
         return self.dev.spi_master_single_read(size)
 
 
-def fmt_enc_val(enc_val):
-    return " ".join(["{:02x}".format(x) for x in enc_val])
-
-
 def decode_version_buffer(version: bytearray) -> dict:
     try:
         version_str = version.decode("ascii").strip()
@@ -1,6 +1,7 @@
-# Copyright (c) Acconeer AB, 2022
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
+import struct
 from collections import namedtuple
 
 import numpy as np
@@ -28,6 +29,7 @@ LEN_FIELD_SIZE = 2
 MIN_FRAME_SIZE = 1 + LEN_FIELD_SIZE + 1 + 1
 BYTEORDER = "little"
 BO = BYTEORDER
+REG_VAL_STRUCT = struct.Struct("<B{}s".format(REG_SIZE))
 
 START_MARKER = 0xCC
 END_MARKER = 0xCD
@@ -105,17 +107,10 @@ def unpack_stream_data_segment(segment):
         rest = rest[data_end_index:]
 
         if part_type == STREAM_RESULT_INFO:
-            s = ADDR_SIZE + REG_SIZE
-            if part_len % s != 0:
+            if part_len % REG_VAL_STRUCT.size != 0 or len(part_data) != part_len:
                 raise ProtocolError("invalid package length")
 
-            result_info = []
-            num_regs = part_len // s
-            for i in range(num_regs):
-                addr = part_data[s * i]
-                enc_val = part_data[s * i + 1 : s * (i + 1)]
-                rrv = RegVal(addr, enc_val)
-                result_info.append(rrv)
+            result_info = list(map(RegVal._make, REG_VAL_STRUCT.iter_unpack(part_data)))
         elif part_type == STREAM_BUFFER:
             buffer = part_data
         else:
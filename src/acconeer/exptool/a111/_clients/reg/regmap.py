@@ -1,8 +1,9 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 import enum
 import importlib.resources
+import logging
 import operator
 from functools import partial, reduce
 
@@ -15,6 +16,9 @@ from acconeer.exptool.a111._modes import Mode, get_mode
 from . import data
 
 
+log = logging.getLogger(__name__)
+
+
 BYTEORDER = "little"
 BO = BYTEORDER
 
@@ -253,6 +257,59 @@ def get_config_key_to_reg_map(mode):  # {config_key: reg}
     return m
 
 
+def fmt_enc_val(enc_val):
+    return " ".join(["{:02x}".format(x) for x in enc_val])
+
+
+class ResultInfoDecoder:
+    """Decodes the result info registers of a session
+
+    The register set is fixed for a session, so the info key and decode function of each
+    register address are looked up once, when the decoder is created, instead of per register
+    and frame.
+    """
+
+    def __init__(self, mode):
+        regs_by_addr = {}
+        for reg in get_regs_for_mode(mode):
+            regs_by_addr.setdefault(reg.addr, []).append(reg)
+
+        # Ambiguous addresses are left out, like get_reg refuses them
+        self._key_and_decode_by_addr = {
+            addr: (_info_key(reg), reg.decode)
+            for addr, (reg, *ambiguous) in regs_by_addr.items()
+            if not ambiguous
+        }
+
+        self.data_info_regs = [
+            (_info_key(reg), reg) for reg in get_data_info_regs(mode) if _info_key(reg) is not None
+        ]
+        """The info key and register of each data info register with an info key"""
+
+    def decode(self, result_info):
+        """Decodes the (address, encoded value) pairs of result info into an info dict
+
+        Registers that are unknown or fail to decode are logged and skipped.
+        """
+        info = {}
+        for addr, enc_val in result_info:
+            try:
+                key, decode = self._key_and_decode_by_addr[addr]
+                val = decode(enc_val)
+            except (KeyError, ValueError):
+                log.info("got unknown reg val in result info")
+                log.info("addr: {}, value: {}".format(addr, fmt_enc_val(enc_val)))
+            else:
+                if key is not None:
+                    info[key] = val
+
+        return info
+
+
+def _info_key(reg):
+    return STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, reg.stripped_name)
+
+
 def load_yaml():
     global REGISTERS
 
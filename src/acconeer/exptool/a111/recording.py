@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -9,7 +9,7 @@ import json
 import time
 import warnings
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 import attr
 import h5py
@@ -64,14 +64,219 @@ class Record:
     def sensor_config(self):
         return _configs.load(self.sensor_config_dump, self.mode)
 
+    def close(self):
+        """Closes the file of a record loaded lazily, see :func:`load_h5`
+
+        Records kept in memory have no file, in which case this does nothing.
+        """
+        if isinstance(self.data, _H5Frames):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class _RingBuffer:
+    """Items in the order they were appended, keeping only the last ``max_len`` if given
+
+    Once the buffer is full, the oldest item is overwritten in place.
+    """
+
+    def __init__(self, max_len=None):
+        self.max_len = max_len
+        self._items = []
+        self._oldest = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("index out of range")
+
+        return self._storage()[(self._oldest + index % len(self)) % len(self)]
+
+    def __iter__(self):
+        return iter(self.ordered())
+
+    def _storage(self):
+        return self._items
+
+    def _next_index(self):
+        """Returns where to write the next item, advancing the oldest item if full"""
+        if self.max_len is None or len(self) < self.max_len:
+            return len(self)
+
+        index = self._oldest
+        self._oldest = (self._oldest + 1) % self.max_len
+        return index
+
+    def append(self, item):
+        index = self._next_index()
+        if index == len(self._items):
+            self._items.append(item)
+        else:
+            self._items[index] = item
+
+    def ordered(self):
+        return self._items[self._oldest :] + self._items[: self._oldest]
+
+
+class _ArrayRingBuffer(_RingBuffer):
+    """A ring buffer of equally shaped arrays, copied into one preallocated array
+
+    Without ``max_len``, the array grows by doubling its capacity.
+    """
+
+    _INITIAL_CAPACITY = 16
+
+    def __init__(self, max_len=None):
+        super().__init__(max_len)
+        self._array = None
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.ordered(), dtype=dtype)
+
+    def _storage(self):
+        return self._array
+
+    def append(self, item):
+        item = np.asarray(item)
+
+        if self._array is None:
+            capacity = self.max_len or self._INITIAL_CAPACITY
+            self._array = np.empty((capacity,) + item.shape, dtype=item.dtype)
+        elif self._len == len(self._array) and self.max_len is None:
+            array = np.empty((2 * self._len,) + self._array.shape[1:], dtype=self._array.dtype)
+            array[: self._len] = self._array
+            self._array = array
+
+        self._array[self._next_index()] = item
+        self._len = min(self._len + 1, len(self._array))
+
+    def ordered(self):
+        if self._array is None:
+            return np.array([])
+
+        if self._oldest == 0:
+            return self._array[: self._len]
+
+        return np.concatenate([self._array[self._oldest :], self._array[: self._oldest]])
+
+
+class _H5FrameWriter:
+    """Appends frames to resizable datasets of an HDF5 file, one chunk of frames at a time
+
+    The data info is stored column-wise, as one ``(num_frames, num_sensors)`` dataset per key
+    in the ``data_info`` group. Unlike :func:`save_h5`, the frames are not compressed, since
+    compressing while recording costs several times more than writing. Resaving the file with
+    :func:`save_h5` compresses it.
+    """
+
+    # About 0.5 MiB of frames are written at a time
+    CHUNK_BYTES = 2**19
+
+    def __init__(self, path: Union[str, Path], record: Record):
+        self.file = h5py.File(str(path), "x")
+
+        for k, v in _pack_metadata(record).items():
+            _create_h5_dataset(self.file, k, v)
+
+        self._staged_data = None
+        self._staged_sample_times = None
+        self._staged_info = {}
+        self._datasets = []
+        self._num_staged = 0
+        self._num_written = 0
+
+    def _create_datasets(self, data_info: list, data: np.ndarray):
+        chunk_len = max(1, self.CHUNK_BYTES // data.nbytes)
+
+        self._staged_data = np.empty((chunk_len,) + data.shape, dtype=data.dtype)
+        self._staged_sample_times = np.empty(chunk_len)
+        staged = {"data": self._staged_data, "sample_times": self._staged_sample_times}
+
+        for key in data_info[0]:
+            column = np.asarray([info[key] for info in data_info])
+            if column.dtype.kind not in "biuf":
+                raise TypeError(f"Data info '{key}' can not be stored as a column")
+
+            self._staged_info[key] = np.empty((chunk_len, len(data_info)), column.dtype)
+            staged[f"data_info/{key}"] = self._staged_info[key]
+
+        for name, array in staged.items():
+            dataset = self.file.create_dataset(
+                name,
+                shape=(0,) + array.shape[1:],
+                maxshape=(None,) + array.shape[1:],
+                chunks=array.shape,
+                dtype=array.dtype,
+            )
+            self._datasets.append((dataset, array))
+
+    def append(self, data_info: list, data: np.ndarray, sample_time: float):
+        if self._staged_data is None:
+            self._create_datasets(data_info, data)
+
+        i = self._num_staged
+        self._staged_data[i] = data
+        self._staged_sample_times[i] = sample_time
+        for key, column in self._staged_info.items():
+            column[i] = [info[key] for info in data_info]
+
+        self._num_staged += 1
+        if self._num_staged == len(self._staged_data):
+            self.flush()
+
+    def flush(self):
+        if self._num_staged == 0:
+            return
+
+        num_frames = self._num_written + self._num_staged
+        for dataset, array in self._datasets:
+            dataset.resize(num_frames, axis=0)
+            dataset[self._num_written :] = array[: self._num_staged]
+
+        self._num_written = num_frames
+        self._num_staged = 0
+
+    def close(self):
+        if self._staged_data is None:
+            _create_h5_dataset(self.file, "data", np.array([]))
+            _create_h5_dataset(self.file, "data_info", json.dumps([]))
+            _create_h5_dataset(self.file, "sample_times", np.array([]))
+        else:
+            self.flush()
+
+        self.file.close()
+
 
 class Recorder:
+    """Records frames of an A111 session
+
+    By default, the frames are kept in memory in :attr:`record`. If ``max_len`` is given, only the
+    latest ``max_len`` frames are kept.
+
+    If ``path`` is given, the frames are instead appended to a new HDF5 file at ``path`` as they
+    are sampled, a chunk at a time. The file is finished by :meth:`close`, and the returned record
+    reads its frames lazily from the file. The file is then kept open until the record is closed
+    with :meth:`Record.close`, or by using the record as a context manager.
+    """
+
     def __init__(self, **kwargs):
         sensor_config = kwargs.pop("sensor_config")
         session_info = kwargs.pop("session_info")
         module_key = kwargs.pop("module_key", None)
         processing_config = kwargs.pop("processing_config", None)
         rss_version = kwargs.pop("rss_version", None)
+        path = kwargs.pop("path", None)
 
         mode = kwargs.pop("mode", sensor_config.mode)
 
@@ -92,6 +297,9 @@ class Recorder:
         else:
             raise TypeError("Unexpected processing config type")
 
+        if path is not None and self.max_len is not None:
+            raise ValueError("max_len can not be used when recording to a file")
+
         self.record = Record(
             mode=mode,
             sensor_config_dump=sensor_config._dumps(),
@@ -103,8 +311,15 @@ class Recorder:
             timestamp=datetime.datetime.now().isoformat(timespec="seconds"),
         )
 
-        self.record.data = []
-        self.record.sample_times = []
+        self.path = path
+        self._writer = None
+
+        if path is None:
+            self.record.data = _ArrayRingBuffer(self.max_len)
+            self.record.data_info = _RingBuffer(self.max_len)
+            self.record.sample_times = _ArrayRingBuffer(self.max_len)
+        else:
+            self._writer = _H5FrameWriter(path, self.record)
 
     def sample(self, data_info: list, data: np.ndarray):
         expected_num_dims = 3 if self.record.mode == _modes.Mode.SPARSE else 2
@@ -113,19 +328,29 @@ class Recorder:
             data = data[None, ...]
             data_info = [data_info]
 
-        self.record.data.append(data.copy())
-        self.record.data_info.append(copy.deepcopy(data_info))
+        if self._writer is not None:
+            self._writer.append(data_info, data, time.time())
+            return
 
+        # The data info values are scalars, so copying the dicts is a deep copy
+        self.record.data.append(data)
+        self.record.data_info.append([dict(info) for info in data_info])
         self.record.sample_times.append(time.time())
 
-        if self.max_len is not None and len(self.record.data) > self.max_len:
-            self.record.data.pop(0)
-            self.record.data_info.pop(0)
-            self.record.sample_times.pop(0)
-
     def close(self):
-        self.record.data = np.array(self.record.data)
-        self.record.sample_times = np.array(self.record.sample_times)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+            loaded = load_h5(self.path, lazy=True)
+            self.record.data = loaded.data
+            self.record.data_info = loaded.data_info
+            self.record.sample_times = loaded.sample_times
+        elif isinstance(self.record.data, _RingBuffer):
+            self.record.data = self.record.data.ordered()
+            self.record.data_info = self.record.data_info.ordered()
+            self.record.sample_times = self.record.sample_times.ordered()
+
         return self.record
 
 
@@ -142,11 +367,16 @@ def save(filename: Union[str, Path], record: Record):
         raise ValueError("Unknown file format")
 
 
-def pack(record: Record) -> dict:
+def _pack_metadata(record: Record) -> dict:
     packed = attr.asdict(record, filter=lambda attr, v: attr.type in (str, Optional[str]))
     packed["mode"] = record.mode.name.lower()
     packed["session_info"] = json.dumps(record.session_info)
-    packed["data_info"] = json.dumps(record.data_info)
+    return {k: v for k, v in packed.items() if v is not None}
+
+
+def pack(record: Record) -> dict:
+    packed = _pack_metadata(record)
+    packed["data_info"] = json.dumps(list(record.data_info))
 
     data = np.array(record.data)
     if np.isrealobj(data):
@@ -159,8 +389,6 @@ def pack(record: Record) -> dict:
     if record.sample_times is not None:
         packed["sample_times"] = np.array(record.sample_times)
 
-    packed = {k: v for k, v in packed.items() if v is not None}
-
     return packed
 
 
@@ -184,16 +412,20 @@ def save_h5(filename: Union[str, Path], record: Record):
 
     with h5py.File(filename, "w") as f:
         for k, v in packed.items():
-            if isinstance(v, str):
-                dtype = h5py.special_dtype(vlen=str)
-                compression = None
-            elif isinstance(v, np.ndarray):
-                dtype = v.dtype
-                compression = "gzip"
-            else:
-                raise TypeError
+            _create_h5_dataset(f, k, v)
 
-            f.create_dataset(k, data=v, dtype=dtype, compression=compression)
+
+def _create_h5_dataset(f: h5py.File, name: str, value: Union[str, np.ndarray]):
+    if isinstance(value, str):
+        dtype = h5py.special_dtype(vlen=str)
+        compression = None
+    elif isinstance(value, np.ndarray):
+        dtype = value.dtype
+        compression = "gzip"
+    else:
+        raise TypeError
+
+    f.create_dataset(name, data=value, dtype=dtype, compression=compression)
 
 
 def load(filename: Union[str, Path]) -> Record:
@@ -211,7 +443,7 @@ def unpack(packed: dict) -> Record:
     kwargs = {}
 
     data = packed["data"]
-    if np.isrealobj(data):
+    if isinstance(data, np.ndarray) and np.isrealobj(data):
         data = data.astype("float")
 
     kwargs["data"] = data
@@ -232,7 +464,9 @@ def unpack(packed: dict) -> Record:
     kwargs["mode"] = mode
 
     kwargs["session_info"] = json.loads(packed["session_info"])
-    kwargs["data_info"] = json.loads(packed["data_info"])
+    kwargs["data_info"] = packed["data_info"]
+    if isinstance(kwargs["data_info"], str):
+        kwargs["data_info"] = json.loads(kwargs["data_info"])
 
     kwargs["sample_times"] = packed.get("sample_times", None)
 
@@ -255,15 +489,103 @@ def load_npz(filename: Union[str, Path]) -> Record:
     return unpack(packed)
 
 
-def load_h5(filename: Union[str, Path]) -> Record:
+class _H5Frames:
+    """The frames of a record, read from an HDF5 dataset when indexed
+
+    Real valued frames are converted to floats, like when the whole record is loaded.
+    """
+
+    def __init__(self, dataset: h5py.Dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, index: Any) -> np.ndarray:
+        frames = self.dataset[index]
+        if np.isrealobj(frames):
+            frames = frames.astype("float")
+
+        return frames
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[()], dtype=dtype)
+
+    @property
+    def shape(self):
+        return self.dataset.shape
+
+    def close(self):
+        self.dataset.file.close()
+
+
+class _ColumnarDataInfo:
+    """The data info of a record, assembled per frame from one array per key
+
+    The arrays have the shape ``(num_frames, num_sensors)``.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+        self._num_frames = len(next(iter(columns.values()))) if columns else 0
+
+    def __len__(self):
+        return self._num_frames
+
+    def __getitem__(self, index: int) -> list[dict[str, Any]]:
+        if not -len(self) <= index < len(self):
+            raise IndexError("index out of range")
+
+        rows = {key: column[index].tolist() for key, column in self.columns.items()}
+        num_sensors = len(next(iter(rows.values()))) if rows else 0
+        return [{key: row[i] for key, row in rows.items()} for i in range(num_sensors)]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self) -> list[list[dict[str, Any]]]:
+        columns = {key: column.tolist() for key, column in self.columns.items()}
+        return [
+            [dict(zip(columns, values)) for values in zip(*frame_rows)]
+            for frame_rows in zip(*columns.values())
+        ]
+
+
+def load_h5(filename: Union[str, Path], lazy: bool = False) -> Record:
+    """Loads an A111 record from an HDF5 file
+
+    :param filename: The path of the file
+    :param lazy:
+        If ``True``, the frames are read from the file when they are indexed instead of all at
+        once. The file is then kept open until the record is closed with :meth:`Record.close`,
+        or by using the record as a context manager.
+    """
     filename = str(filename)
 
-    with h5py.File(filename, "r") as f:
+    f = h5py.File(filename, "r")
+    try:
         if "generation" in f:
             raise Exception(
                 f"The file '{filename}' is not an A111 record, try a121.load_record instead"
             )
-        packed = {k: v[()] for k, v in f.items()}
+
+        packed = {}
+        for k, v in f.items():
+            if isinstance(v, h5py.Group):
+                # Data info written column-wise by a recorder with a path
+                packed[k] = _ColumnarDataInfo({key: column[()] for key, column in v.items()})
+                if not lazy:
+                    packed[k] = packed[k].to_list()
+            elif k == "data" and lazy:
+                packed[k] = _H5Frames(v)
+            else:
+                packed[k] = v[()]
+    except Exception:
+        f.close()
+        raise
+
+    if not lazy:
+        f.close()
 
     for k, v in packed.items():
         if isinstance(v, bytes):
@@ -20,6 +20,7 @@ from acconeer.exptool._core.int_16_complex import (
     complex_array_to_int16_complex,
     int16_complex_array_to_complex,
 )
+from acconeer.exptool._core.profiling import StageProfiler, StageStats
 
 from ._cli import ExampleArgumentParser, get_client_args
 from ._core import (
@@ -1,9 +1,10 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
 
 import abc
+import time
 import typing as t
 
 import typing_extensions as te
@@ -11,6 +12,7 @@ import typing_extensions as te
 from acconeer.exptool._core.communication import Client as BaseClient
 from acconeer.exptool._core.communication import ClientCreationError, ClientError
 from acconeer.exptool._core.entities import ClientInfo
+from acconeer.exptool._core.profiling import StageProfiler
 from acconeer.exptool.a121._core.entities import (
     Metadata,
     Result,
@@ -18,9 +20,18 @@ from acconeer.exptool.a121._core.entities import (
     SensorConfig,
     ServerInfo,
     SessionConfig,
+    StackedResults,
 )
 from acconeer.exptool.a121._core.recording import Recorder
-from acconeer.exptool.a121._core.utils import unextend
+from acconeer.exptool.a121._core.utils import (
+    iterate_extended_structure_values,
+    map_over_extended_structure,
+    transpose_extended_structures,
+    unextend,
+)
+
+
+_T = t.TypeVar("_T")
 
 
 class Client(
@@ -43,6 +54,8 @@ class Client(
         mock: t.Optional[bool] = None,
         override_baudrate: t.Optional[int] = None,
         generation: t.Optional[str] = "a121",
+        *,
+        unthrottled: bool = False,
     ) -> te.Self:
         if generation != "a121":
             raise ClientCreationError
@@ -55,6 +68,7 @@ class Client(
             mock,
             override_baudrate,
             generation="a121",
+            unthrottled=unthrottled,
         )
 
     def __init__(self, client_info: ClientInfo) -> None:
@@ -62,10 +76,11 @@ class Client(
         self._sensor_calibrations: t.Optional[dict[int, SensorCalibration]] = None
         self._calibrations_provided: dict[int, bool] = {}
         self._session_config: t.Optional[SessionConfig] = None
+        self._profiler: t.Optional[StageProfiler] = None
 
     def _return_results(
-        self, extended_results: list[dict[int, Result]]
-    ) -> t.Union[Result, list[dict[int, Result]]]:
+        self, extended_results: list[dict[int, _T]]
+    ) -> t.Union[_T, list[dict[int, _T]]]:
         if self.session_config.extended:
             return extended_results
         else:
@@ -156,6 +171,94 @@ class Client(
         """
         ...
 
+    def get_next_batch(
+        self, num_frames: int, timeout: t.Optional[float] = None
+    ) -> t.Union[StackedResults, list[dict[int, StackedResults]]]:
+        """Gets the next ``num_frames`` results from the server, stacked per entry
+
+        :param num_frames: The maximum number of frames to get.
+        :param timeout:
+            If given, stop waiting for more frames after ``timeout`` seconds and return the
+            frames received so far. At least one frame is always returned.
+        :returns:
+            A ``StackedResults`` if the setup ``SessionConfig.extended is False``,
+            ``list[dict[int, StackedResults]]`` otherwise.
+        :raises:
+            ``ClientError`` if ``Client``'s session is not started.
+            ``ValueError`` if ``num_frames`` is less than 1.
+        """
+        self._assert_session_started()
+
+        if num_frames < 1:
+            raise ValueError("num_frames must be at least 1")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return self._return_results(self._get_next_extended_batch(num_frames, deadline))
+
+    def _get_next_extended_batch(
+        self, num_frames: int, deadline: t.Optional[float]
+    ) -> list[dict[int, StackedResults]]:
+        """Gets and stacks at most ``num_frames`` extended results
+
+        Clients that can get several results at once more efficiently than with repeated calls to
+        :meth:`get_next` override this.
+
+        :param deadline: A ``time.monotonic()`` deadline after which no more frames are waited for
+        """
+        extended_results_list = []
+        for _ in range(num_frames):
+            extended_results_list.append(self._get_next_extended())
+
+            if deadline is not None and time.monotonic() > deadline:
+                break
+
+        return map_over_extended_structure(
+            StackedResults.from_results, transpose_extended_structures(extended_results_list)
+        )
+
+    def _get_next_extended(self) -> list[dict[int, Result]]:
+        """Like :meth:`get_next`, but always returns extended results"""
+        results = self.get_next()
+
+        if isinstance(results, Result):
+            ((sensor_id, _),) = self.session_config.groups[0].items()
+            return [{sensor_id: results}]
+        else:
+            return results
+
+    @property
+    def profiler(self) -> t.Optional[StageProfiler]:
+        """The attached :class:`StageProfiler`, if any"""
+        return self._profiler
+
+    def attach_profiler(self, profiler: StageProfiler) -> None:
+        """Starts timing the stages of getting results with ``profiler``
+
+        A profiler can be attached and detached at any time, also during a session.
+
+        :raises: ``ClientError`` if a profiler is already attached.
+        """
+        if self._profiler is not None:
+            raise ClientError(
+                "Client already has a profiler attached. "
+                + "Try detaching the current profiler before attaching a new profiler."
+            )
+
+        self._set_profiler(profiler)
+
+    def detach_profiler(self) -> t.Optional[StageProfiler]:
+        """Stops timing the stages of getting results
+
+        :returns: The previously attached profiler, if any
+        """
+        previously_attached_profiler = self._profiler
+        self._set_profiler(None)
+        return previously_attached_profiler
+
+    def _set_profiler(self, profiler: t.Optional[StageProfiler]) -> None:
+        """Clients that time stages outside of this class override this to pass on ``profiler``"""
+        self._profiler = profiler
+
     def _recorder_start(self, recorder: Recorder) -> None:
         recorder._start(
             client_info=self.client_info,
@@ -180,8 +283,28 @@ class Client(
 
     def _recorder_sample(self, result: list[dict[int, Result]]) -> None:
         if self._recorder is not None:
+            profiler = self._profiler
+            if profiler is not None:
+                timestamp = time.perf_counter_ns()
+
             self._recorder._sample(result)
 
+            if profiler is not None:
+                profiler.lap("record", timestamp)
+
+    def _recorder_sample_batch(
+        self, extended_stacked_results: list[dict[int, StackedResults]]
+    ) -> None:
+        if self._recorder is not None:
+            num_frames = len(next(iterate_extended_structure_values(extended_stacked_results)))
+            for i in range(num_frames):
+                self._recorder_sample(
+                    [
+                        {sensor_id: stacked[i] for sensor_id, stacked in group.items()}
+                        for group in extended_stacked_results
+                    ]
+                )
+
     def _recorder_stop_session(self) -> None:
         if self._recorder is not None:
             self._recorder._stop_session()
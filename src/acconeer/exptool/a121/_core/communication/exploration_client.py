@@ -1,12 +1,15 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
 
 import logging
-from typing import NoReturn, Optional, Tuple, Type, TypeVar, Union
+import time
+from typing import Any, Mapping, NoReturn, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 import attrs
+import numpy as np
+import numpy.typing as npt
 import typing_extensions as te
 
 from acconeer.exptool._core.communication import (
@@ -23,15 +26,19 @@ from acconeer.exptool._core.communication.communication_protocol.messages.log_me
     ServerLog,
 )
 from acconeer.exptool._core.communication.links.helpers import ensure_connected_link
-from acconeer.exptool._core.communication.unwrap_ticks import unwrap_ticks
+from acconeer.exptool._core.communication.unwrap_ticks import unwrap_ticks, unwrap_ticks_array
 from acconeer.exptool._core.entities import ClientInfo
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
+from acconeer.exptool._core.profiling import StageProfiler
 from acconeer.exptool.a121._core.entities import (
     Metadata,
     Result,
+    ResultContext,
     SensorCalibration,
     SensorConfig,
     ServerInfo,
     SessionConfig,
+    StackedResults,
 )
 from acconeer.exptool.a121._core.utils import (
     create_extended_structure,
@@ -60,6 +67,7 @@ class ExplorationClient(Client, register=True):
     _protocol: Type[ExplorationProtocol]
     _tick_unwrapper: TickUnwrapper
     _server_info: Optional[ServerInfo]
+    _result_assembler: Optional[ResultAssembler]
     _result_queue: list[list[dict[int, Result]]]
     _log_queue: list[ServerLog]
 
@@ -73,6 +81,8 @@ class ExplorationClient(Client, register=True):
         mock: Optional[bool] = None,
         override_baudrate: Optional[int] = None,
         generation: Optional[str] = "a121",
+        *,
+        unthrottled: bool = False,
     ) -> te.Self:
         if generation != "a121":
             raise ClientCreationError
@@ -98,6 +108,7 @@ class ExplorationClient(Client, register=True):
         super().__init__(client_info)
         self._tick_unwrapper = TickUnwrapper()
         self._server_info = None
+        self._result_assembler = None
         self._log_queue = []
         self._closed = False
         self._crashing = False
@@ -216,6 +227,12 @@ class ExplorationClient(Client, register=True):
                 setup_response.grouped_metadatas, self._session_config.groups
             )
         ]
+        self._result_assembler = ResultAssembler(
+            self._metadata,
+            self.server_info.ticks_per_second,
+            self._tick_unwrapper,
+            profiler=self._profiler,
+        )
         self._sensor_calibrations = setup_response.sensor_calibrations
 
         if self.session_config.extended:
@@ -267,25 +284,40 @@ class ExplorationClient(Client, register=True):
 
         result_message = self._server_stream.wait_for_message(a121_messages.ResultMessage)
 
-        if self._metadata is None:
+        if self._result_assembler is None:
             raise RuntimeError(f"{self} has no metadata")
 
-        if self._server_info is None:
-            raise RuntimeError(f"{self} has no system info")
+        extended_results = self._result_assembler.assemble(result_message)
 
-        if self._session_config is None:
-            raise RuntimeError(f"{self} has no session config")
+        self._recorder_sample(extended_results)
+        return self._return_results(extended_results)
 
-        extended_results = result_message.get_extended_results(
-            tps=self._server_info.ticks_per_second,
-            metadata=self._metadata,
-            config_groups=self._session_config.groups,
-        )
+    def _get_next_extended_batch(
+        self, num_frames: int, deadline: Optional[float]
+    ) -> list[dict[int, StackedResults]]:
+        if self._result_assembler is None:
+            raise RuntimeError(f"{self} has no metadata")
 
-        extended_results = self._tick_unwrapper.unwrap_ticks(extended_results)
+        result_messages = []
+        for _ in range(num_frames):
+            result_messages.append(
+                self._server_stream.wait_for_message(a121_messages.ResultMessage)
+            )
 
-        self._recorder_sample(extended_results)
-        return self._return_results(extended_results)
+            if deadline is not None and time.monotonic() > deadline:
+                break
+
+        extended_stacked_results = self._result_assembler.assemble_batch(result_messages)
+
+        self._recorder_sample_batch(extended_stacked_results)
+
+        return extended_stacked_results
+
+    def _set_profiler(self, profiler: Optional[StageProfiler]) -> None:
+        super()._set_profiler(profiler)
+        self._server_stream.profiler = profiler
+        if self._result_assembler is not None:
+            self._result_assembler.profiler = profiler
 
     def stop_session(self) -> None:
         self._assert_session_started()
@@ -318,6 +350,7 @@ class ExplorationClient(Client, register=True):
             self._tick_unwrapper = TickUnwrapper()
             self._server_info = None
             self._metadata = None
+            self._result_assembler = None
             self._log_queue.clear()
             self._link.disconnect()
             self._closed = True
@@ -340,10 +373,19 @@ class TickUnwrapper:
     def __init__(self) -> None:
         self.next_minimum_tick: Optional[int] = None
 
+    def unwrap(self, ticks: list[int]) -> list[int]:
+        """Unwraps the ticks of one extended result"""
+        unwrapped_ticks, self.next_minimum_tick = unwrap_ticks(ticks, self.next_minimum_tick)
+        return unwrapped_ticks
+
+    def unwrap_array(self, ticks: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        """Unwraps the ticks of consecutive extended results, one extended result per row"""
+        unwrapped_ticks, self.next_minimum_tick = unwrap_ticks_array(ticks, self.next_minimum_tick)
+        return unwrapped_ticks
+
     def unwrap_ticks(self, extended_results: list[dict[int, Result]]) -> list[dict[int, Result]]:
         result_items = list(iterate_extended_structure(extended_results))
-        ticks = [result.tick for _, _, result in result_items]
-        unwrapped_ticks, self.next_minimum_tick = unwrap_ticks(ticks, self.next_minimum_tick)
+        unwrapped_ticks = self.unwrap([result.tick for _, _, result in result_items])
 
         def f(result_item: Tuple[int, int, Result], updated_tick: int) -> Tuple[int, int, Result]:
             group_index, sensor_id, result = result_item
@@ -351,3 +393,141 @@ class TickUnwrapper:
             return (group_index, sensor_id, updated_result)
 
         return create_extended_structure(map(f, result_items, unwrapped_ticks))
+
+
+class ResultAssembler:
+    """Assembles extended results from the result messages of a session
+
+    Everything that only depends on the session (the frame blob layout, the result contexts and
+    the sensor ids of each group) is set up once, so that assembling an extended result only
+    constructs each ``Result`` once, with its tick already unwrapped.
+    """
+
+    def __init__(
+        self,
+        extended_metadata: list[dict[int, Metadata]],
+        ticks_per_second: int,
+        tick_unwrapper: TickUnwrapper,
+        profiler: Optional[StageProfiler] = None,
+    ) -> None:
+        self.profiler = profiler
+        self._frame_blob_layout = a121_messages.FrameBlobLayout.from_metadata(extended_metadata)
+        self._tick_unwrapper = tick_unwrapper
+        self._groups = [
+            [
+                (sensor_id, ResultContext(metadata=metadata, ticks_per_second=ticks_per_second))
+                for sensor_id, metadata in metadata_group.items()
+            ]
+            for metadata_group in extended_metadata
+        ]
+
+    def assemble(self, result_message: a121_messages.ResultMessage) -> list[dict[int, Result]]:
+        profiler = self.profiler
+        if profiler is not None:
+            timestamp = time.perf_counter_ns()
+
+        grouped_result_infos = result_message.grouped_result_infos
+        ticks = self._tick_unwrapper.unwrap(
+            [result_info["tick"] for group in grouped_result_infos for result_info in group]
+        )
+
+        if profiler is not None:
+            timestamp = profiler.lap("unwrap_ticks", timestamp)
+
+        extended_frames = self._frame_blob_layout.divide(result_message.frame_blob)
+        tick_iter = iter(ticks)
+
+        extended_results = [
+            {
+                sensor_id: Result(
+                    data_saturated=result_info["data_saturated"],
+                    frame_delayed=result_info["frame_delayed"],
+                    calibration_needed=result_info["calibration_needed"],
+                    temperature=result_info["temperature"],
+                    frame=frames[sensor_id],
+                    tick=next(tick_iter),
+                    context=context,
+                )
+                for (sensor_id, context), result_info in zip(group, result_info_group)
+            }
+            for group, result_info_group, frames in zip(
+                self._groups, grouped_result_infos, extended_frames
+            )
+        ]
+
+        if profiler is not None:
+            profiler.lap("assemble_results", timestamp)
+
+        return extended_results
+
+    def assemble_batch(
+        self, result_messages: list[a121_messages.ResultMessage]
+    ) -> list[dict[int, StackedResults]]:
+        """Assembles the results of several messages into stacked results per entry
+
+        The frames of each entry are contiguous arrays, stacked in the first dimension.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            timestamp = time.perf_counter_ns()
+
+        num_frames = len(result_messages)
+        layout = self._frame_blob_layout
+
+        frame_blobs: npt.NDArray[Any] = np.empty(
+            (num_frames, layout.num_elements), dtype=INT_16_COMPLEX
+        )
+        result_infos: list[Sequence[Mapping[str, Any]]] = []
+        for i, result_message in enumerate(result_messages):
+            frame_blobs[i] = np.frombuffer(
+                result_message.frame_blob, dtype=INT_16_COMPLEX, count=layout.num_elements
+            )
+            message_result_infos = [
+                result_info
+                for group in result_message.grouped_result_infos
+                for result_info in group
+            ]
+            result_infos.append(message_result_infos)
+
+        def field(name: str, dtype: Any) -> npt.NDArray[Any]:
+            """Returns a (num_frames, num_entries) array of the field ``name``"""
+            return np.array(
+                [[info[name] for info in infos] for infos in result_infos], dtype=dtype
+            )
+
+        data_saturated = field("data_saturated", bool)
+        frame_delayed = field("frame_delayed", bool)
+        calibration_needed = field("calibration_needed", bool)
+        temperature = field("temperature", int)
+
+        if profiler is not None:
+            unwrap_start = time.perf_counter_ns()
+
+        tick = self._tick_unwrapper.unwrap_array(field("tick", np.int64))
+
+        if profiler is not None:
+            unwrap_end = profiler.lap("unwrap_ticks", unwrap_start)
+
+        extended_stacked_results = []
+        entry_idx = 0
+        for group, layout_group in zip(self._groups, layout.groups):
+            stacked_group = {}
+            for (sensor_id, context), (_, offset, shape) in zip(group, layout_group):
+                frames = frame_blobs[:, offset : offset + shape[0] * shape[1]]
+                stacked_group[sensor_id] = StackedResults(
+                    data_saturated=data_saturated[:, entry_idx],
+                    frame_delayed=frame_delayed[:, entry_idx],
+                    calibration_needed=calibration_needed[:, entry_idx],
+                    temperature=temperature[:, entry_idx],
+                    frame=np.ascontiguousarray(frames).reshape(num_frames, *shape),
+                    tick=tick[:, entry_idx],
+                    context=context,
+                )
+                entry_idx += 1
+            extended_stacked_results.append(stacked_group)
+
+        if profiler is not None:
+            # Everything but unwrapping the ticks
+            profiler.lap("assemble_results", timestamp + (unwrap_end - unwrap_start))
+
+        return extended_stacked_results
@@ -1,6 +1,6 @@
 # Copyright (c) Acconeer AB, 2022-2023
 # All rights reserved
 #
-from .result_message import EmptyResultMessage, ResultMessage
+from .result_message import EmptyResultMessage, FrameBlobLayout, ResultMessage
 from .sensor_info_response import SensorInfoResponse
 from .setup_response import SetupResponse
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 from __future__ import annotations
 
@@ -34,6 +34,49 @@ class ResultMessageHeader(te.TypedDict):
     payload_size: int
 
 
+@attrs.frozen
+class FrameBlobLayout:
+    """Where the frame of each sensor is located in the frame blob of a :class:`ResultMessage`
+
+    The layout only depends on the session's metadata, so it is computed once per session
+    and reused for every message.
+    """
+
+    groups: list[list[t.Tuple[int, int, t.Tuple[int, int]]]]
+    """Per group, a ``(sensor_id, offset, frame_shape)`` entry per sensor (offset in elements)"""
+
+    num_elements: int
+    """Total number of INT_16_COMPLEX elements in the frame blob"""
+
+    @classmethod
+    def from_metadata(cls, extended_metadata: list[dict[int, Metadata]]) -> FrameBlobLayout:
+        offset = 0
+        groups = []
+        for metadata_group in extended_metadata:
+            group = []
+            for sensor_id, metadata in metadata_group.items():
+                group.append((sensor_id, offset, metadata.frame_shape))
+                offset += metadata.frame_data_length
+            groups.append(group)
+
+        return cls(groups=groups, num_elements=offset)
+
+    def divide(self, frame_blob: bytes) -> list[dict[int, npt.NDArray[t.Any]]]:
+        """Divides ``frame_blob`` into frames without copying
+
+        The returned frames are views into ``frame_blob``.
+        """
+        data = np.frombuffer(frame_blob, dtype=INT_16_COMPLEX, count=self.num_elements)
+
+        return [
+            {
+                sensor_id: data[offset : offset + shape[0] * shape[1]].reshape(shape)
+                for sensor_id, offset, shape in group
+            }
+            for group in self.groups
+        ]
+
+
 @attrs.frozen
 class EmptyResultMessage(Message):
     """
@@ -72,36 +115,6 @@ class ResultMessage(Message):
             context=context,
         )
 
-    @classmethod
-    def _get_array_from_blob(
-        cls, frame_blob: bytes, start: int, end: int, frame_shape: t.Tuple[int, int]
-    ) -> npt.NDArray[t.Any]:
-        raw_frame_data = frame_blob[start:end]
-        assert len(raw_frame_data) == end - start
-        np_frame = np.frombuffer(raw_frame_data, dtype=INT_16_COMPLEX)
-        resized_frame = np.resize(np_frame, frame_shape)
-        return resized_frame
-
-    @classmethod
-    def _divide_frame_blob(
-        cls, frame_blob: bytes, extended_metadata: list[dict[int, Metadata]]
-    ) -> list[dict[int, npt.NDArray[t.Any]]]:
-        start = 0
-        result = []
-        for metadata_group in extended_metadata:
-            result_group: dict[int, npt.NDArray[t.Any]] = {}
-            result.append(result_group)
-            for sensor_id, metadata in metadata_group.items():
-                end = start + metadata.frame_data_length * 4  # 4 = sizeof(int_16_complex)
-
-                result_group[sensor_id] = cls._get_array_from_blob(
-                    frame_blob, start, end, metadata.frame_shape
-                )
-
-                start = end
-
-        return result
-
     @classmethod
     def parse(cls, header: t.Dict[str, t.Any], payload: bytes) -> ResultMessage:
         t.cast(ResultMessageHeader, header)
@@ -115,8 +128,12 @@ class ResultMessage(Message):
         tps: int,
         metadata: list[dict[int, Metadata]],
         config_groups: list[dict[int, SensorConfig]],
+        frame_blob_layout: t.Optional[FrameBlobLayout] = None,
     ) -> list[dict[int, Result]]:
-        extended_frames = self._divide_frame_blob(self.frame_blob, metadata)
+        if frame_blob_layout is None:
+            frame_blob_layout = FrameBlobLayout.from_metadata(metadata)
+
+        extended_frames = frame_blob_layout.divide(self.frame_blob)
         extended_contexts = map_over_extended_structure(
             functools.partial(self._create_result_context, ticks_per_second=tps), metadata
         )
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -27,6 +27,7 @@ from acconeer.exptool.a121._core.entities import (
     SensorInfo,
     ServerInfo,
     SessionConfig,
+    StackedResults,
     SubsweepConfig,
 )
 from acconeer.exptool.a121._core.utils import unextend
@@ -76,9 +77,12 @@ class MockClient(Client, register=True):
 
     _client_info: ClientInfo
     _connected: bool
+    _unthrottled: bool
     _start_time: float
     _mock_update_rate: float
     _mock_next_data_time: float
+    _mock_profiles: list[dict[int, npt.NDArray[np.complex_]]]
+    _mock_contexts: list[dict[int, ResultContext]]
 
     @classmethod
     def open(
@@ -90,6 +94,8 @@ class MockClient(Client, register=True):
         mock: Optional[bool] = None,
         override_baudrate: Optional[int] = None,
         generation: Optional[str] = "a121",
+        *,
+        unthrottled: bool = False,
     ) -> te.Self:
         if generation != "a121":
             raise ClientCreationError
@@ -99,14 +105,28 @@ class MockClient(Client, register=True):
 
         client_info = ClientInfo._from_open(mock=mock)
 
-        return cls(client_info=client_info)
+        return cls(client_info=client_info, unthrottled=unthrottled)
 
-    def __init__(self, client_info: ClientInfo = ClientInfo(mock=MockInfo())) -> None:
+    def __init__(
+        self,
+        client_info: ClientInfo = ClientInfo(mock=MockInfo()),
+        *,
+        unthrottled: bool = False,
+    ) -> None:
+        """
+        :param client_info: Client info
+        :param unthrottled:
+            If ``True``, results are produced as fast as possible, ignoring both the configured
+            update rate and ``MAX_MOCK_UPDATE_RATE_HZ``. Useful to benchmark processing.
+        """
         super().__init__(client_info)
         self._start_time = time.perf_counter()
         self._connected = True
+        self._unthrottled = unthrottled
         self._mock_update_rate = self.MAX_MOCK_UPDATE_RATE_HZ
         self._mock_next_data_time = 0.0
+        self._mock_profiles = []
+        self._mock_contexts = []
 
     @classmethod
     def _sensor_config_to_metadata(
@@ -145,13 +165,12 @@ class MockClient(Client, register=True):
         return metadata_list
 
     @classmethod
-    def _get_mock_data(cls, sensor_id: int, subsweep: SubsweepConfig) -> npt.NDArray[np.complex_]:
-        noise: npt.NDArray[np.complex_] = np.random.normal(
-            0, cls.NOISE_AMPLITUDE, size=2 * subsweep.num_points
-        ).view(np.complex_)
-
+    def _get_mock_profile(
+        cls, sensor_id: int, subsweep: SubsweepConfig
+    ) -> npt.NDArray[np.complex_]:
+        """The deterministic (noise free) part of a mocked subsweep"""
         if not subsweep.enable_tx:
-            return noise
+            return np.zeros(subsweep.num_points, dtype=np.complex_)
 
         object_distance = cls.SENSOR_OBJECTS[sensor_id]["distance_mm"] / (
             1000 * cls.BASE_STEP_LENGTH_M
@@ -167,7 +186,7 @@ class MockClient(Client, register=True):
         )
 
         if subsweep.enable_loopback:
-            return direct_leakage + noise
+            return direct_leakage
 
         signal: npt.NDArray[np.complex_] = (
             np.exp(1j * phase)
@@ -175,46 +194,56 @@ class MockClient(Client, register=True):
             * np.exp(-((points - object_distance) ** 2) / (2 * std**2))
         )
 
-        return direct_leakage + signal + noise
+        return direct_leakage + signal
 
     @classmethod
-    def _sensor_config_to_frame(
-        cls, sensor_id: int, sensor_config: SensorConfig, metadata: Metadata
-    ) -> npt.NDArray[Any]:
-        frame: npt.NDArray[Any] = np.ndarray(
-            shape=(sensor_config._sweeps_per_frame, metadata.sweep_data_length),
-            dtype=INT_16_COMPLEX,
+    def _sensor_config_to_profile(
+        cls, sensor_id: int, sensor_config: SensorConfig
+    ) -> npt.NDArray[np.complex_]:
+        """The deterministic part of a mocked sweep, i.e. all subsweeps concatenated"""
+        return np.concatenate(
+            [cls._get_mock_profile(sensor_id, subsweep) for subsweep in sensor_config.subsweeps]
         )
-        for sweep in range(0, sensor_config._sweeps_per_frame):
-            sweep_offset = 0
-            for subsweep in sensor_config.subsweeps:
-                subsweep_data = cls._get_mock_data(sensor_id, subsweep)
-                for idx, point in enumerate(subsweep_data):
-                    frame[sweep][sweep_offset + idx]["real"] = point.real
-                    frame[sweep][sweep_offset + idx]["imag"] = point.imag
-                sweep_offset += subsweep.num_points
+
+    @classmethod
+    def _profile_to_frame(
+        cls, profile: npt.NDArray[np.complex_], sweeps_per_frame: int
+    ) -> npt.NDArray[Any]:
+        """Creates a frame of ``sweeps_per_frame`` noisy copies of a (precomputed) sweep profile"""
+        noise = np.random.normal(0, cls.NOISE_AMPLITUDE, size=(sweeps_per_frame, profile.size, 2))
+
+        frame: npt.NDArray[Any] = np.empty((sweeps_per_frame, profile.size), dtype=INT_16_COMPLEX)
+        frame["real"] = profile.real + noise[..., 0]
+        frame["imag"] = profile.imag + noise[..., 1]
         return frame
 
-    def _sensor_config_to_result(self, sensor_id: int, sensor_config: SensorConfig) -> Result:
-        metadata = self._sensor_config_to_metadata(sensor_config, update_rate=None)
-        return Result(
-            data_saturated=False,
-            frame_delayed=False,
-            calibration_needed=False,
-            temperature=int(self.CALIBRATION_TEMPERATURE + np.random.normal(0, 2)),
-            tick=int((time.perf_counter() - self._start_time) * self.TICKS_PER_SECOND),
-            frame=self._sensor_config_to_frame(sensor_id, sensor_config, metadata),
-            context=ResultContext(ticks_per_second=self.TICKS_PER_SECOND, metadata=metadata),
+    def _session_config_to_result(self, config: SessionConfig) -> list[dict[int, Result]]:
+        tick = int((time.perf_counter() - self._start_time) * self.TICKS_PER_SECOND)
+        temperatures = iter(
+            np.random.normal(
+                self.CALIBRATION_TEMPERATURE, 2, size=sum(len(group) for group in config.groups)
+            )
         )
 
-    def _session_config_to_result(self, config: SessionConfig) -> list[dict[int, Result]]:
-        result_list = []
-        for group in config.groups:
-            result_dict = {}
-            for sensor_id, sensor_config in group.items():
-                result_dict[sensor_id] = self._sensor_config_to_result(sensor_id, sensor_config)
-            result_list.append(result_dict)
-        return result_list
+        return [
+            {
+                sensor_id: Result(
+                    data_saturated=False,
+                    frame_delayed=False,
+                    calibration_needed=False,
+                    temperature=int(next(temperatures)),
+                    tick=tick,
+                    frame=self._profile_to_frame(
+                        profiles[sensor_id], sensor_config._sweeps_per_frame
+                    ),
+                    context=contexts[sensor_id],
+                )
+                for sensor_id, sensor_config in group.items()
+            }
+            for group, profiles, contexts in zip(
+                config.groups, self._mock_profiles, self._mock_contexts
+            )
+        ]
 
     def setup_session(  # type: ignore[override]
         self,
@@ -233,6 +262,26 @@ class MockClient(Client, register=True):
         self._session_config = config
         self._metadata = self._session_config_to_metadata(config)
 
+        # The deterministic part of the mocked data, and the result contexts, are the same for
+        # every frame in the session. Only noise is generated per frame.
+        self._mock_profiles = [
+            {
+                sensor_id: self._sensor_config_to_profile(sensor_id, sensor_config)
+                for sensor_id, sensor_config in group.items()
+            }
+            for group in config.groups
+        ]
+        self._mock_contexts = [
+            {
+                sensor_id: ResultContext(
+                    ticks_per_second=self.TICKS_PER_SECOND,
+                    metadata=self._sensor_config_to_metadata(sensor_config, update_rate=None),
+                )
+                for sensor_id, sensor_config in group.items()
+            }
+            for group in config.groups
+        ]
+
         self._sensor_calibrations = {}
         for group in config.groups:
             for sensor_id, sensor_config in group.items():
@@ -275,15 +324,68 @@ class MockClient(Client, register=True):
 
         extended_results = self._session_config_to_result(self.session_config)
 
-        delta = self._mock_next_data_time - time.perf_counter()
-        if delta > 0:
-            time.sleep(delta)
+        if not self._unthrottled:
+            delta = self._mock_next_data_time - time.perf_counter()
+            if delta > 0:
+                time.sleep(delta)
 
-        self._mock_next_data_time += 1 / self._mock_update_rate
+            self._mock_next_data_time += 1 / self._mock_update_rate
 
         self._recorder_sample(extended_results)
         return self._return_results(extended_results)
 
+    def _get_next_extended_batch(
+        self, num_frames: int, deadline: Optional[float]
+    ) -> list[dict[int, StackedResults]]:
+        now = time.perf_counter()
+
+        if self._unthrottled:
+            tick_times = np.full(num_frames, now - self._start_time)
+        else:
+            frame_period = 1 / self._mock_update_rate
+
+            if deadline is not None:
+                # Only include frames that are due before the deadline
+                deadline_perf_counter = now + (deadline - time.monotonic())
+                num_due = int((deadline_perf_counter - self._mock_next_data_time) / frame_period)
+                num_frames = max(1, min(num_frames, num_due + 1))
+
+            frame_times = self._mock_next_data_time + frame_period * np.arange(num_frames)
+            tick_times = frame_times - self._start_time
+
+        ticks = (tick_times * self.TICKS_PER_SECOND).astype(np.int64)
+        extended_stacked_results = [
+            {
+                sensor_id: StackedResults(
+                    data_saturated=np.zeros(num_frames, dtype=bool),
+                    frame_delayed=np.zeros(num_frames, dtype=bool),
+                    calibration_needed=np.zeros(num_frames, dtype=bool),
+                    temperature=np.random.normal(
+                        self.CALIBRATION_TEMPERATURE, 2, size=num_frames
+                    ).astype(int),
+                    tick=ticks,
+                    frame=self._profile_to_frame(
+                        profiles[sensor_id], num_frames * sensor_config._sweeps_per_frame
+                    ).reshape(num_frames, sensor_config._sweeps_per_frame, -1),
+                    context=contexts[sensor_id],
+                )
+                for sensor_id, sensor_config in group.items()
+            }
+            for group, profiles, contexts in zip(
+                self.session_config.groups, self._mock_profiles, self._mock_contexts
+            )
+        ]
+
+        if not self._unthrottled:
+            delta = frame_times[-1] - time.perf_counter()
+            if delta > 0:
+                time.sleep(delta)
+
+            self._mock_next_data_time += num_frames * frame_period
+
+        self._recorder_sample_batch(extended_stacked_results)
+        return extended_stacked_results
+
     def stop_session(self) -> None:
         self._assert_session_started()
         self._recorder_stop_session()
@@ -10,10 +10,15 @@ import numpy as np
 import numpy.typing as npt
 
 from acconeer.exptool._core.class_creation.attrs import attrs_ndarray_eq
-from acconeer.exptool._core.int_16_complex import int16_complex_array_to_complex
 
 from .metadata import Metadata
-from .utils import get_subsweeps_from_frame
+from .utils import (
+    concatenate_subsweeps,
+    get_cached_complex_frame,
+    get_cached_subframes,
+    get_state_without_caches,
+    set_state_with_empty_caches,
+)
 
 
 @attrs.frozen(kw_only=True)
@@ -61,6 +66,19 @@ class Result:
 
     _context: ResultContext = attrs.field()
 
+    _complex_frames: dict[np.dtype[t.Any], npt.NDArray[t.Any]] = attrs.field(
+        init=False, factory=dict, eq=False, repr=False
+    )
+    _subframes: dict[np.dtype[t.Any], list[npt.NDArray[t.Any]]] = attrs.field(
+        init=False, factory=dict, eq=False, repr=False
+    )
+
+    def __getstate__(self) -> dict[str, t.Any]:
+        return get_state_without_caches(self)
+
+    def __setstate__(self, state: dict[str, t.Any]) -> None:
+        set_state_with_empty_caches(self, state)
+
     @property
     def frame(self) -> npt.NDArray[np.complex_]:
         """Frame data in a complex float data format
@@ -68,13 +86,49 @@ class Result:
         2-D with dimensions (sweep, distance).
         """
 
-        return int16_complex_array_to_complex(self._frame)
+        return self.get_frame()
 
     @property
     def subframes(self) -> list[npt.NDArray[np.complex_]]:
         """Frame split up into subframes, one for every subsweep config used"""
 
-        return get_subsweeps_from_frame(self.frame, self._context.metadata)
+        return self.get_subframes()
+
+    def get_frame(self, dtype: npt.DTypeLike = np.complex128) -> npt.NDArray[t.Any]:
+        """Frame data converted to the complex ``dtype``
+
+        The conversion is only done once per dtype. The returned array is shared between calls,
+        and is therefore read-only.
+
+        :param dtype: ``complex128`` (default, same as :attr:`frame`) or ``complex64``
+        """
+
+        return get_cached_complex_frame(self._complex_frames, self._frame, dtype)
+
+    def get_subframes(self, dtype: npt.DTypeLike = np.complex128) -> list[npt.NDArray[t.Any]]:
+        """Like :attr:`subframes`, but converted to the complex ``dtype``
+
+        See :meth:`get_frame`. The split is also only done once per dtype.
+        """
+
+        return get_cached_subframes(self._subframes, self.get_frame(dtype), self._context.metadata)
+
+    def get_concatenated_subframes(
+        self, subsweep_indexes: t.Sequence[int], dtype: npt.DTypeLike = np.complex128
+    ) -> npt.NDArray[t.Any]:
+        """The given subframes concatenated along the distance dimension
+
+        Same as ``np.concatenate([result.subframes[i] for i in subsweep_indexes], axis=1)``,
+        but without the intermediate copies. If the subsweeps are stored next to each other,
+        the returned array is a read-only view of :meth:`get_frame`.
+
+        :param subsweep_indexes: Indexes of the subsweeps to concatenate, in order
+        :param dtype: See :meth:`get_frame`
+        """
+
+        return concatenate_subsweeps(
+            self.get_frame(dtype), self._context.metadata, subsweep_indexes
+        )
 
     @property
     def tick_time(self) -> float:
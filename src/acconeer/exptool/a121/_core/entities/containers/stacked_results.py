@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -10,10 +10,15 @@ import numpy as np
 import numpy.typing as npt
 
 from acconeer.exptool._core.class_creation.attrs import attrs_ndarray_eq
-from acconeer.exptool._core.int_16_complex import int16_complex_array_to_complex
 
 from .result import Result, ResultContext
-from .utils import get_subsweeps_from_frame
+from .utils import (
+    concatenate_subsweeps,
+    get_cached_complex_frame,
+    get_cached_subframes,
+    get_state_without_caches,
+    set_state_with_empty_caches,
+)
 
 
 NDArrayBool = npt.NDArray[np.bool_]
@@ -40,17 +45,62 @@ class StackedResults:
     temperature: NDArrayBool = attrs.field(eq=attrs_ndarray_eq)
     _frame: npt.NDArray[t.Any] = attrs.field(eq=attrs_ndarray_eq)
 
-    tick: NDArrayInt = attrs.field()
+    tick: NDArrayInt = attrs.field(eq=attrs_ndarray_eq)
 
     _context: ResultContext = attrs.field()
 
+    _complex_frames: dict[np.dtype[t.Any], npt.NDArray[t.Any]] = attrs.field(
+        init=False, factory=dict, eq=False, repr=False
+    )
+    _subframes: dict[np.dtype[t.Any], list[npt.NDArray[t.Any]]] = attrs.field(
+        init=False, factory=dict, eq=False, repr=False
+    )
+
+    def __getstate__(self) -> dict[str, t.Any]:
+        return get_state_without_caches(self)
+
+    def __setstate__(self, state: dict[str, t.Any]) -> None:
+        set_state_with_empty_caches(self, state)
+
+    @classmethod
+    def from_results(cls, results: t.Sequence[Result]) -> StackedResults:
+        """Stacks a non-empty sequence of results from the same entry"""
+        if len(results) == 0:
+            raise ValueError("Cannot stack an empty sequence of results")
+
+        return cls(
+            data_saturated=np.array([r.data_saturated for r in results], dtype=bool),
+            frame_delayed=np.array([r.frame_delayed for r in results], dtype=bool),
+            calibration_needed=np.array([r.calibration_needed for r in results], dtype=bool),
+            temperature=np.array([r.temperature for r in results], dtype=int),
+            tick=np.array([r.tick for r in results], dtype=np.int64),
+            frame=np.stack([r._frame for r in results]),
+            context=results[0]._context,
+        )
+
     @property
     def frame(self) -> npt.NDArray[np.complex_]:
-        return int16_complex_array_to_complex(self._frame)
+        return self.get_frame()
 
     @property
     def subframes(self) -> list[npt.NDArray[np.complex_]]:
-        return get_subsweeps_from_frame(self.frame, self._context.metadata)
+        return self.get_subframes()
+
+    def get_frame(self, dtype: npt.DTypeLike = np.complex128) -> npt.NDArray[t.Any]:
+        """See :meth:`Result.get_frame`"""
+        return get_cached_complex_frame(self._complex_frames, self._frame, dtype)
+
+    def get_subframes(self, dtype: npt.DTypeLike = np.complex128) -> list[npt.NDArray[t.Any]]:
+        """See :meth:`Result.get_subframes`"""
+        return get_cached_subframes(self._subframes, self.get_frame(dtype), self._context.metadata)
+
+    def get_concatenated_subframes(
+        self, subsweep_indexes: t.Sequence[int], dtype: npt.DTypeLike = np.complex128
+    ) -> npt.NDArray[t.Any]:
+        """See :meth:`Result.get_concatenated_subframes`"""
+        return concatenate_subsweeps(
+            self.get_frame(dtype), self._context.metadata, subsweep_indexes
+        )
 
     @property
     def tick_time(self) -> npt.NDArray[np.float_]:
@@ -59,7 +109,26 @@ class StackedResults:
     def __len__(self) -> int:
         return len(self._frame)
 
+    @t.overload
     def __getitem__(self, key: int) -> Result:
+        ...
+
+    @t.overload
+    def __getitem__(self, key: slice) -> StackedResults:
+        ...
+
+    def __getitem__(self, key: t.Union[int, slice]) -> t.Union[Result, StackedResults]:
+        if isinstance(key, slice):
+            return StackedResults(
+                calibration_needed=self.calibration_needed[key],
+                data_saturated=self.data_saturated[key],
+                frame_delayed=self.frame_delayed[key],
+                temperature=self.temperature[key],
+                tick=self.tick[key],
+                frame=self._frame[key],
+                context=self._context,
+            )
+
         return Result(
             calibration_needed=self.calibration_needed[key],
             data_saturated=self.data_saturated[key],
@@ -1,13 +1,16 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
 
 import typing as t
 
+import attrs
 import numpy as np
 import numpy.typing as npt
 
+from acconeer.exptool._core.int_16_complex import int16_complex_array_to_complex
+
 from .metadata import Metadata
 
 
@@ -22,3 +25,107 @@ def get_subsweeps_from_frame(frame: npt.NDArray[T], metadata: Metadata) -> list[
     offsets = metadata.subsweep_data_offset
     lengths = metadata.subsweep_data_length
     return [frame[..., o : o + l] for o, l in zip(offsets, lengths)]
+
+
+def get_subsweep_columns(
+    metadata: Metadata, subsweep_indexes: t.Sequence[int]
+) -> t.Union[slice, npt.NDArray[np.intp]]:
+    """Gets the columns (indices of the <data points> dimension) of the given subsweeps
+
+    A slice is returned if the subsweeps are stored next to each other, in the given order.
+    Otherwise, an index array is returned.
+    """
+    if len(subsweep_indexes) == 0:
+        raise ValueError("At least one subsweep index must be given")
+
+    offsets = metadata.subsweep_data_offset
+    lengths = metadata.subsweep_data_length
+    starts = [int(offsets[i]) for i in subsweep_indexes]
+    stops = [int(offsets[i] + lengths[i]) for i in subsweep_indexes]
+
+    if starts[1:] == stops[:-1]:
+        return slice(starts[0], stops[-1])
+
+    columns: npt.NDArray[np.intp] = np.concatenate(
+        [np.arange(start, stop) for start, stop in zip(starts, stops)]
+    )
+    return columns
+
+
+def concatenate_subsweeps(
+    frame: npt.NDArray[T], metadata: Metadata, subsweep_indexes: t.Sequence[int]
+) -> npt.NDArray[T]:
+    """Concatenates the given subsweeps of a frame (2D) or frames (3D) along the innermost
+    dimension.
+
+    Equivalent to ``np.concatenate([subframes[i] for i in subsweep_indexes], axis=-1)``, but
+    returns a view of ``frame`` if the subsweeps are stored next to each other, and is done
+    in a single copy otherwise.
+    """
+    return frame[..., get_subsweep_columns(metadata, subsweep_indexes)]
+
+
+def get_cached_complex_frame(
+    cache: dict[np.dtype[t.Any], npt.NDArray[t.Any]],
+    int16_complex_frame: npt.NDArray[t.Any],
+    dtype: npt.DTypeLike,
+) -> npt.NDArray[t.Any]:
+    """Converts ``int16_complex_frame`` to ``dtype``, at most once per ``cache`` and dtype
+
+    The converted frame is shared between callers, so it is made read-only.
+    """
+    key = np.dtype(dtype)
+
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
+    frame = int16_complex_array_to_complex(int16_complex_frame, dtype=key)
+    frame.flags.writeable = False
+    cache[key] = frame
+    return frame
+
+
+def get_cached_subframes(
+    cache: dict[np.dtype[t.Any], list[npt.NDArray[t.Any]]],
+    frame: npt.NDArray[t.Any],
+    metadata: Metadata,
+) -> list[npt.NDArray[t.Any]]:
+    """Splits ``frame`` into subframes, at most once per ``cache`` and dtype
+
+    The subframes are views of ``frame``. A new list is returned on every call, so that
+    callers can't modify the cached one.
+    """
+    try:
+        subframes = cache[frame.dtype]
+    except KeyError:
+        subframes = get_subsweeps_from_frame(frame, metadata)
+        cache[frame.dtype] = subframes
+
+    return list(subframes)
+
+
+_CACHE_FIELD_NAMES = ("_complex_frames", "_subframes")
+
+
+def get_state_without_caches(obj: t.Any) -> dict[str, t.Any]:
+    """Returns the pickled state of an attrs result container, without the cached frames
+
+    The cached frames are several times larger than the original frame, and would otherwise be
+    pickled along with the container, e.g. when sent between processes.
+    """
+    return {
+        field.name: getattr(obj, field.name)
+        for field in attrs.fields(type(obj))
+        if field.name not in _CACHE_FIELD_NAMES
+    }
+
+
+def set_state_with_empty_caches(obj: t.Any, state: dict[str, t.Any]) -> None:
+    """Restores a state from :func:`get_state_without_caches`, with empty caches"""
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+
+    for name in _CACHE_FIELD_NAMES:
+        object.__setattr__(obj, name, {})
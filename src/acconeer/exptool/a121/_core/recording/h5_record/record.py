@@ -1,14 +1,15 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
 
 import re
 import warnings
-from typing import Callable, Iterator, Tuple, TypeVar
+from typing import Any, Callable, Iterator, Optional, Tuple, TypeVar
 
 import h5py
 import numpy as np
+import numpy.typing as npt
 from packaging.version import Version
 
 import acconeer.exptool
@@ -38,9 +39,12 @@ class H5RecordException(RecordException):
 
 
 class H5SessionRecord(SessionRecord):
+    _DEFAULT_BLOCK_SIZE = 256
+
     def __init__(self, group: h5py.Group, ticks_per_second: int) -> None:
         self._group = group
         self._ticks_per_second = ticks_per_second
+        self._memmaps: dict[str, Optional[np.memmap[Any, Any]]] = {}
 
     @property
     def extended_metadata(self) -> list[dict[int, Metadata]]:
@@ -48,11 +52,53 @@ class H5SessionRecord(SessionRecord):
 
     @property
     def extended_results(self) -> Iterator[list[dict[int, Result]]]:
-        for frame_no in range(self.num_frames):
-            yield self._get_result_for_all_entries(frame_no)
+        return self.iter_extended_results()
+
+    def iter_extended_results(
+        self, block_size: int = _DEFAULT_BLOCK_SIZE
+    ) -> Iterator[list[dict[int, Result]]]:
+        """Iterates over the extended results, reading ``block_size`` frames at a time
+
+        Every dataset of every entry is read from file one block at a time and the
+        :class:`ResultContext` is only created once per entry. The yielded results are views into
+        the block that was read, so no additional copies of the frames are made.
+
+        :param block_size: Number of frames read from file at a time
+        :raises: ValueError if ``block_size`` is not positive
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+
+        entries = self._get_entries()
+        contexts = utils.map_over_extended_structure(
+            self._get_result_context_for_entry_group, entries
+        )
+        entries_and_contexts = utils.zip_extended_structures(entries, contexts)
+        num_frames = self.num_frames
+
+        for block_start in range(0, num_frames, block_size):
+            block = slice(block_start, min(block_start + block_size, num_frames))
+            stacked_blocks = utils.map_over_extended_structure(
+                lambda entry_and_context: self._entry_group_to_stacked_results(
+                    *entry_and_context, frames=block
+                ),
+                entries_and_contexts,
+            )
+
+            for frame_idx in range(block.stop - block.start):
+                yield [
+                    {sensor_id: stacked[frame_idx] for sensor_id, stacked in group.items()}
+                    for group in stacked_blocks
+                ]
 
     @property
     def extended_stacked_results(self) -> list[dict[int, StackedResults]]:
+        """The extended stacked results
+
+        If the record was stored with contiguous (uncompressed) datasets, see
+        :class:`H5Recorder`, the results are memory-mapped from the file instead of being read
+        into memory.
+        """
         return self._map_over_entries(self._entry_group_to_stacked_results)
 
     @property
@@ -89,31 +135,68 @@ class H5SessionRecord(SessionRecord):
     def _get_metadata_for_entry_group(g: h5py.Group) -> Metadata:
         return Metadata.from_json(g["metadata"][()])
 
-    def _get_result_for_all_entries(self, frame_no: int) -> list[dict[int, Result]]:
-        def entry_group_to_result(entry_group: h5py.Group) -> Result:
-            return Result(
-                data_saturated=entry_group["result/data_saturated"][frame_no],
-                frame_delayed=entry_group["result/frame_delayed"][frame_no],
-                calibration_needed=entry_group["result/calibration_needed"][frame_no],
-                temperature=entry_group["result/temperature"][frame_no],
-                tick=entry_group["result/tick"][frame_no],
-                frame=np.array(entry_group["result/frame"][frame_no]),
-                context=self._get_result_context_for_entry_group(entry_group),
-            )
+    def _entry_group_to_stacked_results(
+        self,
+        entry_group: h5py.Group,
+        context: Optional[ResultContext] = None,
+        frames: slice = slice(None),
+    ) -> StackedResults:
+        if context is None:
+            context = self._get_result_context_for_entry_group(entry_group)
 
-        return self._map_over_entries(entry_group_to_result)
+        result_group = entry_group["result"]
 
-    def _entry_group_to_stacked_results(self, entry_group: h5py.Group) -> StackedResults:
         return StackedResults(
-            data_saturated=entry_group["result/data_saturated"][()],
-            calibration_needed=entry_group["result/calibration_needed"][()],
-            temperature=entry_group["result/temperature"][()],
-            tick=entry_group["result/tick"][()],
-            frame_delayed=entry_group["result/frame_delayed"][()],
-            frame=entry_group["result/frame"][()],
-            context=self._get_result_context_for_entry_group(entry_group),
+            data_saturated=self._read_dataset(result_group["data_saturated"], frames),
+            calibration_needed=self._read_dataset(result_group["calibration_needed"], frames),
+            temperature=self._read_dataset(result_group["temperature"], frames),
+            tick=self._read_dataset(result_group["tick"], frames),
+            frame_delayed=self._read_dataset(result_group["frame_delayed"], frames),
+            frame=self._read_dataset(result_group["frame"], frames),
+            context=context,
         )
 
+    def _read_dataset(self, dataset: h5py.Dataset, frames: slice) -> npt.NDArray[Any]:
+        """Reads ``frames`` from ``dataset``
+
+        Contiguous, uncompressed datasets in files on disk are memory-mapped instead of read. The
+        returned array is then a plain ``ndarray`` view of the ``np.memmap``, so that it compares
+        equal to arrays that were read into memory.
+        """
+        memmap = self._get_memmap(dataset)
+
+        if memmap is None:
+            return dataset[frames]  # type: ignore[no-any-return]
+
+        return memmap[frames].view(np.ndarray)
+
+    def _get_memmap(self, dataset: h5py.Dataset) -> Optional[np.memmap[Any, Any]]:
+        """Returns the ``np.memmap`` of ``dataset``, created once, or ``None`` if not mappable"""
+        if dataset.name in self._memmaps:
+            return self._memmaps[dataset.name]
+
+        offset = dataset.id.get_offset()
+        memory_mappable = (
+            dataset.file.driver == "sec2"
+            and dataset.chunks is None
+            and dataset.compression is None
+            and dataset.external is None
+            and offset is not None
+        )
+
+        memmap = None
+        if memory_mappable:
+            memmap = np.memmap(
+                dataset.file.filename,
+                dtype=dataset.dtype,
+                mode="r",
+                offset=offset,
+                shape=dataset.shape,
+            )
+
+        self._memmaps[dataset.name] = memmap
+        return memmap
+
     def _get_result_context_for_entry_group(self, entry_group: h5py.Group) -> ResultContext:
         return ResultContext(
             metadata=self._get_metadata_for_entry_group(entry_group),
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -53,6 +53,31 @@ class H5Recorder(
     :param mode:
         The file mode to use if a path-like object was given for ``path_or_file``. Default value is
         'x', meaning that we open for exclusive creation, failing if the file already exists.
+    :param contiguous:
+        If ``True``, results are stored uncompressed in contiguous datasets instead of being
+        compressed. Such records can be memory-mapped when loaded, meaning that
+        :attr:`H5Record.extended_stacked_results` does not need to read all frames into memory.
+        While recording, results are written to a temporary file next to the record, named
+        ``<record name>.<random>.results``. They are only copied to the record when the session
+        is stopped, so:
+
+        - Stopping takes time proportional to the size of the session, about as long as writing
+          the results once more.
+        - If the recording process crashes or is killed before the session is stopped, the
+          record has no results of that session. The results sampled so far are then left in the
+          temporary file, an HDF5 file with the result datasets at the same paths as in a record.
+
+        Default value is ``False``, compressing the results.
+    :param threaded:
+        If ``True``, results are written to file by a dedicated writer thread, so that sampling
+        (e.g. in ``Client.get_next``) never waits for results to be compressed and written.
+        Results waiting to be written are kept in a queue, see :attr:`writer_stats`.
+    :param queue_size:
+        Maximum number of results waiting to be written when ``threaded``.
+    :param back_pressure:
+        What to do when sampling while the queue is full when ``threaded``. ``"block"`` (default)
+        waits until there is room in the queue, ``"drop_oldest"`` drops the oldest result waiting
+        to be written and ``"raise"`` raises a ``SaverQueueFullError``.
     :param _chunk_size:
         If given, data will be written to file every ``_chunk_size`` samples.
 
@@ -79,15 +104,31 @@ class H5Recorder(
         ] = None,
         mode: str = "x",
         *,
+        contiguous: bool = False,
+        threaded: bool = False,
+        queue_size: int = 1024,
+        back_pressure: h5_record.BackPressure = "block",
         _chunk_size: t.Optional[int] = None,
         _lib_version: t.Optional[str] = None,
         _timestamp: t.Optional[str] = None,
         _uuid: t.Optional[str] = None,
     ) -> None:
+        saver: h5_record.H5Saver[
+            SessionConfig,
+            t.List[t.Dict[int, Metadata]],
+            t.List[t.Dict[int, Result]],
+            ServerInfo,
+        ] = h5_record.ChunkedH5Saver(H5Saver(contiguous=contiguous), _chunk_size=_chunk_size)
+
+        if threaded:
+            saver = h5_record.ThreadedH5Saver(
+                saver, queue_size=queue_size, back_pressure=back_pressure
+            )
+
         super().__init__(
             path_or_file,
             "a121",
-            h5_record.ChunkedH5Saver(H5Saver(), _chunk_size=_chunk_size),
+            saver,
             attachable,
             mode,
             _lib_version=_lib_version,
@@ -95,6 +136,17 @@ class H5Recorder(
             _uuid=_uuid,
         )
 
+    @property
+    def writer_stats(self) -> t.Optional[h5_record.ThreadedH5SaverStats]:
+        """Queue depth and write latency statistics of the writer thread
+
+        ``None`` if the recorder is not ``threaded``.
+        """
+        if isinstance(self._saver, h5_record.ThreadedH5Saver):
+            return self._saver.stats
+
+        return None
+
     def _start_session(
         self,
         *,
@@ -1,8 +1,10 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from __future__ import annotations
 
+import os
+import tempfile
 import typing as t
 
 import h5py
@@ -35,12 +37,28 @@ class H5Saver(
         ServerInfo,  # Server info type
     ]
 ):
-    """H5Saver for A121 data"""
+    """H5Saver for A121 data
+
+    :param contiguous:
+        If ``True``, results are stored uncompressed in contiguous datasets, which allows them to
+        be memory-mapped when loaded. The results of a session are only in the record once the
+        session is stopped. See :class:`H5Recorder`.
+    """
+
+    _CONSOLIDATION_BLOCK_SIZE = 1024
 
     _num_frames_current_session: int
+    _contiguous: bool
+    _result_group_names: t.List[str]
+    _scratch_file: t.Optional[h5py.File]
+    _scratch_file_obj: t.Optional[t.IO[bytes]]
 
-    def __init__(self) -> None:
+    def __init__(self, contiguous: bool = False) -> None:
         self._num_frames_current_session = 0
+        self._contiguous = contiguous
+        self._result_group_names = []
+        self._scratch_file = None
+        self._scratch_file_obj = None
 
     def _start(self) -> None:
         pass
@@ -69,6 +87,9 @@ class H5Saver(
             track_times=False,
         )
 
+        if self._contiguous:
+            self._open_scratch_file(group.file)
+
         for i, metadata_group_dict in enumerate(metadata):
             group_group = group.create_group(f"group_{i}")
 
@@ -84,7 +105,15 @@ class H5Saver(
                 )
 
                 result_group = entry_group.create_group("result")
-                self._create_result_datasets(result_group, single_metadata)
+                if self._scratch_file is None:
+                    self._create_result_datasets(result_group, single_metadata)
+                else:
+                    self._create_result_datasets(
+                        self._scratch_file.create_group(result_group.name),
+                        single_metadata,
+                        compression=None,
+                    )
+                self._result_group_names.append(result_group.name)
 
         if (calibrations is None) != (calibrations_provided is None):
             raise ValueError(
@@ -109,15 +138,21 @@ class H5Saver(
             results=list(results),
         )
 
+        if self._scratch_file is not None:
+            # Keeps the results sampled so far readable from the scratch file after a crash
+            self._scratch_file.flush()
+
     @staticmethod
-    def _create_result_datasets(g: h5py.Group, metadata: Metadata) -> None:
+    def _create_result_datasets(
+        g: h5py.Group, metadata: Metadata, compression: t.Optional[str] = "gzip"
+    ) -> None:
         g.create_dataset(
             "data_saturated",
             shape=(0,),
             maxshape=(None,),
             dtype=bool,
             track_times=False,
-            compression="gzip",
+            compression=compression,
         )
         g.create_dataset(
             "frame_delayed",
@@ -125,7 +160,7 @@ class H5Saver(
             maxshape=(None,),
             dtype=bool,
             track_times=False,
-            compression="gzip",
+            compression=compression,
         )
         g.create_dataset(
             "calibration_needed",
@@ -133,7 +168,7 @@ class H5Saver(
             maxshape=(None,),
             dtype=bool,
             track_times=False,
-            compression="gzip",
+            compression=compression,
         )
         g.create_dataset(
             "temperature",
@@ -141,7 +176,7 @@ class H5Saver(
             maxshape=(None,),
             dtype=int,
             track_times=False,
-            compression="gzip",
+            compression=compression,
         )
 
         g.create_dataset(
@@ -150,7 +185,7 @@ class H5Saver(
             maxshape=(None,),
             dtype=np.dtype("int64"),
             track_times=False,
-            compression="gzip",
+            compression=compression,
         )
 
         g.create_dataset(
@@ -159,7 +194,7 @@ class H5Saver(
             maxshape=(None, *metadata.frame_shape),
             dtype=INT_16_COMPLEX,
             track_times=False,
-            compression="gzip",
+            compression=compression,
         )
 
     def _write_results_to_file(
@@ -172,6 +207,9 @@ class H5Saver(
         if len(results) == 0:
             return 0
 
+        if self._scratch_file is not None:
+            group = self._scratch_file[group.name]
+
         res: t.List[Result]
         for group_idx, entry_idx, res in utils.iterate_extended_structure_as_entry_list(
             utils.transpose_extended_structures(results)
@@ -209,5 +247,62 @@ class H5Saver(
         g["tick"][dataset_slice] = [result.tick for result in results]
         g["frame"][dataset_slice] = [result._frame for result in results]
 
+    def _open_scratch_file(self, file: h5py.File) -> None:
+        """Opens a temporary file that results are written to while recording
+
+        HDF5 can only resize chunked datasets, and never reclaims the space of deleted datasets.
+        Results are therefore written to chunked datasets in a temporary file, and are copied to
+        contiguous datasets in the record once the number of frames is known.
+
+        The temporary file is named after the record and placed next to it if possible, e.g.
+        ``record.h5.<random>.results``. It is removed when the session is stopped, but is left
+        behind with the results sampled so far if the recording process is killed.
+        """
+        if file.driver == "sec2":
+            directory, record_name = os.path.split(os.path.abspath(file.filename))
+        else:
+            directory, record_name = None, "record"
+
+        self._scratch_file_obj = tempfile.NamedTemporaryFile(
+            dir=directory, prefix=f"{record_name}.", suffix=".results"
+        )
+        self._scratch_file = h5py.File(self._scratch_file_obj, "w")
+
+    def _close_scratch_file(self) -> None:
+        if self._scratch_file is not None:
+            self._scratch_file.close()
+            self._scratch_file = None
+
+        if self._scratch_file_obj is not None:
+            self._scratch_file_obj.close()
+            self._scratch_file_obj = None
+
+    @classmethod
+    def _copy_contiguous(cls, source: h5py.Group, destination: h5py.Group) -> None:
+        """Copies every (chunked) dataset in ``source`` to a contiguous dataset in ``destination``
+
+        The datasets are copied block by block, so only one block is held in memory at a time.
+        """
+        for name, chunked in source.items():
+            contiguous = destination.create_dataset(
+                name,
+                shape=chunked.shape,
+                dtype=chunked.dtype,
+                track_times=False,
+            )
+
+            for start in range(0, len(chunked), cls._CONSOLIDATION_BLOCK_SIZE):
+                block = slice(start, start + cls._CONSOLIDATION_BLOCK_SIZE)
+                contiguous[block] = chunked[block]
+
     def _stop_session(self, group: h5py.Group) -> None:
-        self._num_frames_current_session = 0
+        try:
+            if self._scratch_file is not None:
+                for result_group_name in self._result_group_names:
+                    self._copy_contiguous(
+                        self._scratch_file[result_group_name], group.file[result_group_name]
+                    )
+        finally:
+            self._close_scratch_file()
+            self._result_group_names = []
+            self._num_frames_current_session = 0
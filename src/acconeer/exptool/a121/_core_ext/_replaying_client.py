@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -19,6 +19,7 @@ from acconeer.exptool.a121 import (
     SensorConfig,
     ServerInfo,
     SessionConfig,
+    StackedResults,
 )
 
 
@@ -46,6 +47,7 @@ class _ReplayingClient(Client, register=False):
         self._is_started: bool = False
         self._result_iterator: Iterator[list[dict[int, Result]]] = iter([])
         self._origin_time: Optional[float] = None
+        self._num_replayed_frames = 0
         self._session_idx = 0
         self._cycled_session_idx = cycled_session_idx
         self._realtime_replay = realtime_replay
@@ -94,6 +96,7 @@ class _ReplayingClient(Client, register=False):
         self._result_iterator = self._record.session(self._actual_session_idx).extended_results
         self._is_started = True
         self._origin_time = None
+        self._num_replayed_frames = 0
 
     def get_next(self) -> Union[Result, list[dict[int, Result]]]:  # type: ignore[override]
         if not self.session_is_setup:
@@ -106,6 +109,7 @@ class _ReplayingClient(Client, register=False):
         except StopIteration:
             raise _StopReplay
 
+        self._num_replayed_frames += 1
         some_result = next(core_utils.iterate_extended_structure_values(result))
 
         if self._realtime_replay:
@@ -124,6 +128,18 @@ class _ReplayingClient(Client, register=False):
         else:
             return core_utils.unextend(result)
 
+    def _get_next_extended_batch(
+        self, num_frames: int, deadline: Optional[float]
+    ) -> list[dict[int, StackedResults]]:
+        # Don't let the end of the record discard the frames of a partially replayed batch
+        num_remaining_frames = (
+            self._record.session(self._actual_session_idx).num_frames - self._num_replayed_frames
+        )
+        if num_remaining_frames <= 0:
+            raise _StopReplay
+
+        return super()._get_next_extended_batch(min(num_frames, num_remaining_frames), deadline)
+
     def stop_session(self) -> Any:
         try:
             _ = next(self._result_iterator)
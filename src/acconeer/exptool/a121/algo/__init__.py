@@ -11,6 +11,7 @@ from ._base import (
     GenericProcessorBase,
     ProcessorBase,
 )
+from ._parameter_sweep import run_parameter_sweep, write_summary_table
 from ._utils import (
     APPROX_BASE_STEP_LENGTH_M,
     ENVELOPE_FWHM_M,
@@ -18,13 +19,16 @@ from ._utils import (
     RLG_PER_HWAAS_MAP,
     PeakSortingMethod,
     ReflectorShape,
+    TimeSeriesBuffer,
     _convert_amplitude_to_strength,
     _convert_multiple_amplitudes_to_strengths,
     calc_processing_gain,
     calculate_loopback_peak_location,
     double_buffering_frame_filter,
     exponential_smoothing_coefficient,
+    exponential_smoothing_scan,
     find_peaks,
+    find_peaks_mask,
     get_approx_fft_vels,
     get_distance_filter_coeffs,
     get_distance_filter_edge_margin,
@@ -32,5 +36,6 @@ from ._utils import (
     get_distances_m,
     get_temperature_adjustment_factors,
     interpolate_peaks,
+    interpolate_peaks_array,
     select_prf,
 )
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -30,8 +30,40 @@ class GenericProcessorBase(abc.ABC, Generic[InputT, ResultT]):
         ...
 
 
-ProcessorBase = GenericProcessorBase[a121.Result, ResultT]
-ExtendedProcessorBase = GenericProcessorBase[List[Dict[int, a121.Result]], ResultT]
+class ProcessorBase(GenericProcessorBase[a121.Result, ResultT]):
+    def process_batch(self, stacked_results: a121.StackedResults) -> List[ResultT]:
+        """Processes stacked results, giving the same results as processing them one by one
+
+        Processors override this where frames can be processed more efficiently together.
+
+        :param stacked_results: Results of the entry the processor was set up for
+        :returns: One processor result per frame
+        """
+        return [self.process(stacked_results[i]) for i in range(len(stacked_results))]
+
+
+class ExtendedProcessorBase(GenericProcessorBase[List[Dict[int, a121.Result]], ResultT]):
+    def process_batch(
+        self, extended_stacked_results: List[Dict[int, a121.StackedResults]]
+    ) -> List[ResultT]:
+        """Processes extended stacked results, giving the same results as processing them one by
+        one
+
+        Processors override this where frames can be processed more efficiently together.
+
+        :param extended_stacked_results: Stacked results of every entry in the session
+        :returns: One processor result per frame
+        """
+        num_frames = len(next(iter(extended_stacked_results[0].values())))
+        return [
+            self.process(
+                [
+                    {sensor_id: stacked_results[i] for sensor_id, stacked_results in group.items()}
+                    for group in extended_stacked_results
+                ]
+            )
+            for i in range(num_frames)
+        ]
 
 
 class Controller(abc.ABC, Generic[ConfigT, ResultT]):
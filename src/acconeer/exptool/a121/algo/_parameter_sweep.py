@@ -0,0 +1,232 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import csv
+import functools
+import itertools
+import multiprocessing.context
+import multiprocessing.util
+import os
+import sys
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+import attrs
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool import a121
+
+from ._base import AlgoProcessorConfigBase, ProcessorBase
+
+
+ProcessorConfigT = t.TypeVar("ProcessorConfigT", bound=AlgoProcessorConfigBase)
+ProcessorResultT = t.TypeVar("ProcessorResultT")
+
+SummaryRow = t.Dict[str, t.Any]
+SummarizeFunction = t.Callable[[t.List[ProcessorResultT]], t.Mapping[str, t.Any]]
+
+# Set in each worker process by _init_worker
+_worker_shared_memory: t.Optional[shared_memory.SharedMemory] = None
+_worker_stacked_results: t.Optional[a121.StackedResults] = None
+
+
+def _replay_session(
+    record: a121.Record, session_index: int, group_index: int, sensor_id: t.Optional[int]
+) -> t.Tuple[a121.SensorConfig, a121.Metadata, a121.StackedResults]:
+    """Replays a whole session of a record and stacks the results of one entry"""
+    session = record.session(session_index)
+    group = session.session_config.groups[group_index]
+
+    if sensor_id is None:
+        if len(group) != 1:
+            raise ValueError("sensor_id must be given when the group has several sensors")
+        (sensor_id,) = group.keys()
+
+    client = a121._ReplayingClient(record, cycled_session_idx=session_index, realtime_replay=False)
+    client.start_session()
+    extended_stacked_results = client._get_next_extended_batch(session.num_frames, None)
+    client.stop_session()
+
+    return (
+        group[sensor_id],
+        session.extended_metadata[group_index][sensor_id],
+        extended_stacked_results[group_index][sensor_id],
+    )
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attaches to the shared memory ``name`` without registering it with the resource tracker
+
+    The process that created the shared memory owns it and unlinks it. Worker processes share
+    its resource tracker, so unregistering after attaching would also forget the registration
+    of the owner. Before Python 3.13, registering is therefore skipped while attaching.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _close_worker_shared_memory() -> None:
+    global _worker_shared_memory, _worker_stacked_results
+
+    # The frame is a view of the shared memory, which can only be closed once it is released
+    _worker_stacked_results = None
+    if _worker_shared_memory is not None:
+        _worker_shared_memory.close()
+        _worker_shared_memory = None
+
+
+def _init_worker(
+    shared_memory_name: str, frame_shape: t.Tuple[int, ...], template: a121.StackedResults
+) -> None:
+    global _worker_shared_memory, _worker_stacked_results
+
+    _worker_shared_memory = _attach_shared_memory(shared_memory_name)
+    # Unlike atexit hooks, finalizers also run when forked worker processes exit
+    multiprocessing.util.Finalize(None, _close_worker_shared_memory, exitpriority=0)
+    frame: npt.NDArray[t.Any] = np.ndarray(
+        frame_shape, dtype=template._frame.dtype, buffer=_worker_shared_memory.buf
+    )
+    frame.flags.writeable = False
+    _worker_stacked_results = attrs.evolve(template, frame=frame)
+
+
+def _evaluate(
+    processor_config: AlgoProcessorConfigBase,
+    *,
+    processor_cls: t.Type[ProcessorBase[t.Any]],
+    sensor_config: a121.SensorConfig,
+    metadata: a121.Metadata,
+    summarize: SummarizeFunction[t.Any],
+    batch_size: int,
+) -> t.Mapping[str, t.Any]:
+    stacked_results = _worker_stacked_results
+    assert stacked_results is not None
+
+    processor = processor_cls(  # type: ignore[call-arg]
+        sensor_config=sensor_config,
+        metadata=metadata,
+        processor_config=processor_config,
+    )
+
+    processor_results = []
+    for start in range(0, len(stacked_results), batch_size):
+        processor_results.extend(
+            processor.process_batch(stacked_results[start : start + batch_size])
+        )
+
+    return summarize(processor_results)
+
+
+def run_parameter_sweep(
+    record_path: t.Union[str, Path],
+    processor_cls: t.Type[ProcessorBase[ProcessorResultT]],
+    base_processor_config: ProcessorConfigT,
+    grid: t.Mapping[str, t.Sequence[t.Any]],
+    summarize: SummarizeFunction[ProcessorResultT],
+    *,
+    session_index: int = 0,
+    group_index: int = 0,
+    sensor_id: t.Optional[int] = None,
+    max_workers: t.Optional[int] = None,
+    batch_size: int = 1000,
+    mp_context: t.Optional[multiprocessing.context.BaseContext] = None,
+) -> t.List[SummaryRow]:
+    """Processes a recording once per processor config in a grid, in a process pool
+
+    The session is replayed and decoded once. Its frames are shared with the worker processes
+    through shared memory, and each worker processes them with
+    :meth:`ProcessorBase.process_batch`.
+
+    ``processor_cls`` is constructed with the ``sensor_config``, ``metadata`` and
+    ``processor_config`` keyword arguments, like the processors in ``a121.algo``. It and
+    ``summarize`` are sent to the worker processes, so they must be picklable, e.g. defined at
+    module level.
+
+    :param record_path: Path to the H5 recording
+    :param processor_cls: The processor to evaluate
+    :param base_processor_config: Processor config that the grid parameters are applied to
+    :param grid:
+        Values to try per processor config parameter. Every combination of values is evaluated.
+    :param summarize: Summarizes the processor results of a config as a mapping of columns
+    :param session_index: The session to process
+    :param group_index: The group of the entry to process
+    :param sensor_id: The sensor of the entry to process. Optional if the group has one sensor.
+    :param max_workers: Number of worker processes. Defaults to the number of CPUs.
+    :param batch_size: Number of frames passed to each ``process_batch`` call
+    :param mp_context:
+        The multiprocessing context that worker processes are started with, e.g.
+        ``multiprocessing.get_context("spawn")``. Defaults to the default start method.
+    :returns:
+        One row per combination in the grid, with the parameter values followed by the summary
+    """
+    parameter_names = list(grid.keys())
+    parameter_combinations = [
+        dict(zip(parameter_names, values)) for values in itertools.product(*grid.values())
+    ]
+    processor_configs = [
+        attrs.evolve(base_processor_config, **parameters) for parameters in parameter_combinations
+    ]
+
+    with a121.open_record(record_path) as record:
+        (sensor_config, metadata, stacked_results) = _replay_session(
+            record, session_index, group_index, sensor_id
+        )
+
+    for processor_config in processor_configs:
+        processor_config.validate(sensor_config)
+
+    frame = stacked_results._frame
+    shm = shared_memory.SharedMemory(create=True, size=max(frame.nbytes, 1))
+    try:
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+        # Everything but the frame is small enough to be pickled to each worker
+        template = attrs.evolve(stacked_results, frame=frame[:0])
+
+        evaluate = functools.partial(
+            _evaluate,
+            processor_cls=processor_cls,
+            sensor_config=sensor_config,
+            metadata=metadata,
+            summarize=summarize,
+            batch_size=batch_size,
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count() or 1, len(processor_configs) or 1),
+            initializer=_init_worker,
+            mp_context=mp_context,
+            initargs=(shm.name, frame.shape, template),
+        ) as executor:
+            summaries = list(executor.map(evaluate, processor_configs))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return [
+        {**parameters, **summary} for parameters, summary in zip(parameter_combinations, summaries)
+    ]
+
+
+def write_summary_table(rows: t.Sequence[SummaryRow], path: t.Union[str, Path]) -> None:
+    """Writes the rows of :func:`run_parameter_sweep` as a CSV table
+
+    The columns are the union of the row keys, in order of first appearance.
+    """
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
@@ -38,6 +38,7 @@ class A121BackendPluginBase(Generic[T], BackendPlugin[T]):
     _opened_record: Optional[a121.H5Record]
     _started: bool = False
     _recorder: Optional[a121.H5Recorder] = None
+    _client_profiler: Optional[a121.StageProfiler] = None
 
     def __init__(
         self, callback: Callable[[Message], None], generation: PluginGeneration, key: str
@@ -154,6 +155,18 @@ class A121BackendPluginBase(Generic[T], BackendPlugin[T]):
     def end_session(self) -> None:
         pass
 
+    def _attach_client_profiler(self, profiler: a121.StageProfiler) -> None:
+        assert self.client is not None
+        self.client.attach_profiler(profiler)
+        self._client_profiler = profiler
+
+    def _detach_client_profiler(self) -> None:
+        """Detaches the profiler from the client, if it was attached by this plugin"""
+        profiler = self._client_profiler
+        self._client_profiler = None
+        if profiler is not None and self.client is not None and self.client.profiler is profiler:
+            self.client.detach_profiler()
+
     @is_task
     def start_session(self, *, with_recorder: bool = True) -> None:
         if self._started:
@@ -178,6 +191,7 @@ class A121BackendPluginBase(Generic[T], BackendPlugin[T]):
             recorder = self.client.detach_recorder()
             if recorder is not None:
                 recorder.close()
+            self._detach_client_profiler()
             self.callback(PluginStateMessage(state=PluginState.LOADED_IDLE))
             raise HandledException("Could not start") from exc
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import abc
 import itertools
+import time
 from typing import Callable, Dict, Generic, List, Mapping, Optional, Type, Union
 
 import attrs
@@ -80,6 +81,7 @@ class GenericProcessorBackendPluginBase(
     A121BackendPluginBase[ProcessorBackendPluginSharedState[ProcessorConfigT]],
 ):
     _processor_instance: Optional[GenericProcessorBase[InputT, ResultT]]
+    _profiler: Optional[a121.StageProfiler]
     _started: bool
 
     PLUGIN_PRESETS: Mapping[int, Callable[[], ProcessorPluginPreset[ProcessorConfigT]]] = {}
@@ -89,9 +91,32 @@ class GenericProcessorBackendPluginBase(
     ):
         super().__init__(callback=callback, generation=generation, key=key)
         self._processor_instance = None
+        self._profiler = None
         self._log: BackendLogger = BackendLogger.getLogger(__name__)
         self.restore_defaults()
 
+    @property
+    def profiler(self) -> Optional[a121.StageProfiler]:
+        """The attached :class:`StageProfiler`, if any"""
+        return self._profiler
+
+    def attach_profiler(self, profiler: a121.StageProfiler) -> None:
+        """Starts timing the stages of getting and processing results with ``profiler``
+
+        The profiler is attached to the client of each session started after this call, so it
+        also times the stages of the client.
+        """
+        self._profiler = profiler
+
+    def detach_profiler(self) -> Optional[a121.StageProfiler]:
+        """Stops timing stages from the next started session
+
+        :returns: The previously attached profiler, if any
+        """
+        previously_attached_profiler = self._profiler
+        self._profiler = None
+        return previously_attached_profiler
+
     def _load_from_cache(self, file: h5py.File) -> None:
         self.shared_state.session_config = a121.SessionConfig.from_json(file["session_config"][()])
         self.shared_state.processor_config = self.get_processor_config_cls().from_json(
@@ -182,6 +207,9 @@ class GenericProcessorBackendPluginBase(
 
             self.client.attach_recorder(recorder)
 
+        if self._profiler is not None:
+            self._attach_client_profiler(self._profiler)
+
         metadata = self.client.setup_session(session_config)
         self.shared_state.metadata = metadata
 
@@ -207,6 +235,8 @@ class GenericProcessorBackendPluginBase(
         if recorder is not None:
             recorder.close()
 
+        self._detach_client_profiler()
+
     @classmethod
     @abc.abstractmethod
     def get_processor(
@@ -270,10 +300,20 @@ class ProcessorBackendPluginBase(
         if result.frame_delayed:
             self.send_status_message(self._format_warning(FRAME_DELAYED_MESSAGE))
 
+        profiler = self._profiler
+        if profiler is not None:
+            timestamp = time.perf_counter_ns()
+
         processor_result = self._processor_instance.process(result)
 
+        if profiler is not None:
+            timestamp = profiler.lap("process", timestamp)
+
         self.callback(PlotMessage(result=processor_result))
 
+        if profiler is not None:
+            profiler.lap("plot_callback", timestamp)
+
 
 class ExtendedProcessorBackendPluginBase(
     GenericProcessorBackendPluginBase[
@@ -318,6 +358,16 @@ class ExtendedProcessorBackendPluginBase(
         if any(r.frame_delayed for r in result_list):
             self.send_status_message(self._format_warning(FRAME_DELAYED_MESSAGE))
 
+        profiler = self._profiler
+        if profiler is not None:
+            timestamp = time.perf_counter_ns()
+
         processor_result = self._processor_instance.process(results)
 
+        if profiler is not None:
+            timestamp = profiler.lap("process", timestamp)
+
         self.callback(PlotMessage(result=processor_result))
+
+        if profiler is not None:
+            profiler.lap("plot_callback", timestamp)
@@ -9,7 +9,7 @@ from typing import Any, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
-from scipy.signal import butter, filtfilt
+from scipy.signal import butter, filtfilt, lfilter
 
 from acconeer.exptool import a121
 from acconeer.exptool.a121.algo import AlgoParamEnum
@@ -198,19 +198,51 @@ def interpolate_peaks(
     :param step_length: Step length in points.
     :param step_length_m: Step length in meters.
     """
-    estimated_distances = []
-    estimated_amplitudes = []
-    for peak_idx in peak_idxs:
-        x = np.arange(peak_idx - 1, peak_idx + 2, 1)
-        y = abs_sweep[peak_idx - 1 : peak_idx + 2]
-        a = (x[0] * (y[2] - y[1]) + x[1] * (y[0] - y[2]) + x[2] * (y[1] - y[0])) / (
-            (x[0] - x[1]) * (x[0] - x[2]) * (x[1] - x[2])
-        )
-        b = (y[1] - y[0]) / (x[1] - x[0]) - a * (x[0] + x[1])
-        c = y[0] - a * x[0] ** 2 - b * x[0]
-        peak_loc = -b / (2 * a)
-        estimated_distances.append((start_point + peak_loc * step_length) * step_length_m)
-        estimated_amplitudes.append(a * peak_loc**2 + b * peak_loc + c)
+    estimated_distances, estimated_amplitudes = interpolate_peaks_array(
+        abs_sweep,
+        np.asarray(peak_idxs, dtype=int),
+        start_point,
+        step_length,
+        step_length_m,
+    )
+    return list(estimated_distances), list(estimated_amplitudes)
+
+
+def interpolate_peaks_array(
+    abs_sweep: npt.NDArray[np.float_],
+    peak_idxs: Union[npt.NDArray[np.int_], Tuple[npt.NDArray[np.int_], ...]],
+    start_point: int,
+    step_length: int,
+    step_length_m: float,
+) -> Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]:
+    """Like :func:`interpolate_peaks`, but interpolates all peaks at once.
+
+    :param abs_sweep: Absolute value of mean sweep, or sweeps (2-D, (<sweeps>, <distances>)).
+    :param peak_idxs:
+        Indexes of identified peaks. For 2-D ``abs_sweep``, a tuple of indexes like the one
+        returned by ``np.nonzero(find_peaks_mask(abs_sweep, threshold))``.
+    :param start_point: Start point.
+    :param step_length: Step length in points.
+    :param step_length_m: Step length in meters.
+    :returns: Estimated distances and amplitudes, one per peak.
+    """
+    if not isinstance(peak_idxs, tuple):
+        peak_idxs = (peak_idxs,)
+
+    *outer_idxs, x1 = peak_idxs
+    x0 = x1 - 1
+    x2 = x1 + 1
+    y0 = abs_sweep[(*outer_idxs, x0)]
+    y1 = abs_sweep[(*outer_idxs, x1)]
+    y2 = abs_sweep[(*outer_idxs, x2)]
+
+    a = (x0 * (y2 - y1) + x1 * (y0 - y2) + x2 * (y1 - y0)) / ((x0 - x1) * (x0 - x2) * (x1 - x2))
+    b = (y1 - y0) / (x1 - x0) - a * (x0 + x1)
+    c = y0 - a * x0**2 - b * x0
+    peak_loc = -b / (2 * a)
+    estimated_distances = (start_point + peak_loc * step_length) * step_length_m
+    # float_power gives the same result as squaring a single float64, unlike ** on arrays
+    estimated_amplitudes = a * np.float_power(peak_loc, 2) + b * peak_loc + c
     return estimated_distances, estimated_amplitudes
 
 
@@ -246,41 +278,98 @@ def find_peaks(abs_sweep: npt.NDArray[np.float_], threshold: npt.NDArray[np.floa
     """
     if threshold is None:
         raise ValueError
-    found_peaks = []
-    d = 1
-    N = len(abs_sweep)
-    while d < (N - 1):
-        if np.isnan(threshold[d - 1]):
-            d += 1
-            continue
-        if np.isnan(threshold[d + 1]):
-            break
-        if abs_sweep[d] <= threshold[d]:
-            d += 2
-            continue
-        if abs_sweep[d - 1] <= threshold[d - 1]:
-            d += 1
-            continue
-        if abs_sweep[d - 1] >= abs_sweep[d]:
-            d += 1
-            continue
-        d_upper = d + 1
-        while True:
-            if (d_upper) >= (N - 1):
-                break
-            if np.isnan(threshold[d_upper]):
-                break
-            if abs_sweep[d_upper] <= threshold[d_upper]:
-                break
-            if abs_sweep[d_upper] > abs_sweep[d]:
-                break
-            elif abs_sweep[d_upper] < abs_sweep[d]:
-                found_peaks.append(int(np.argmax(abs_sweep[d:d_upper]) + d))
-                break
-            else:
-                d_upper += 1
-        d = d_upper
-    return found_peaks
+    return np.flatnonzero(find_peaks_mask(abs_sweep, threshold)).tolist()  # type: ignore[no-any-return]
+
+
+def find_peaks_mask(
+    abs_sweep: npt.NDArray[np.float_], threshold: npt.NDArray[np.float_]
+) -> npt.NDArray[np.bool_]:
+    """Like :func:`find_peaks`, but returns a mask of the peaks and handles many sweeps at once.
+
+    A plateau of equal values counts as a single peak, located at its first point. The search
+    stops where the threshold turns NaN, like :func:`find_peaks` does. ``abs_sweep`` must not
+    contain NaN.
+
+    :param abs_sweep: Absolute value of mean sweep, or sweeps (2-D, (<sweeps>, <distances>)).
+    :param threshold: Threshold throughout the sweep, broadcastable to ``abs_sweep``.
+    :returns: Boolean array, the same shape as ``abs_sweep``, that is true at the peaks.
+    """
+    if threshold is None:
+        raise ValueError
+
+    abs_sweep = np.asarray(abs_sweep)
+    sweeps = np.atleast_2d(abs_sweep)
+    thresholds = np.atleast_2d(np.broadcast_to(threshold, abs_sweep.shape))
+    N = sweeps.shape[-1]
+
+    if N < 3:
+        return np.zeros(abs_sweep.shape, dtype=bool)
+
+    # The search visits the points from left to right, looking at a point and its neighbors.
+    # Whether a point is a peak only depends on its surroundings, but the search skips some
+    # points and stops at the first visited point followed by a NaN threshold. Which points are
+    # skipped is worked out below.
+    positions = np.arange(N)
+    prev = slice(0, N - 2)
+    cur = slice(1, N - 1)
+    nxt = slice(2, N)
+
+    valid = ~np.isnan(thresholds)
+    with np.errstate(invalid="ignore"):
+        below = sweeps <= thresholds
+
+    # Points at or below the threshold make the search skip the following point. In a run of
+    # such points, every other point is thus skipped, starting from the second one.
+    skipping = np.zeros_like(valid)
+    skipping[:, cur] = valid[:, prev] & valid[:, nxt] & below[:, cur]
+    run_starts = skipping.copy()
+    run_starts[:, 1:] &= ~skipping[:, :-1]
+    run_start = np.maximum.accumulate(np.where(run_starts, positions, 0), axis=-1)
+    visited_skipping = skipping & ((positions - run_start) % 2 == 0)
+    skipped = np.zeros_like(valid)
+    skipped[:, 1:] = visited_skipping[:, :-1]
+
+    # Rising edges above the threshold are followed along plateaus of equal values. The first
+    # point after a plateau is where the search continues.
+    rising = np.zeros_like(valid)
+    rising[:, cur] = (
+        valid[:, prev]
+        & valid[:, nxt]
+        & ~below[:, cur]
+        & ~below[:, prev]
+        & (sweeps[:, prev] < sweeps[:, cur])
+    )
+    on_plateau = np.zeros_like(valid)
+    on_plateau[:, cur] = valid[:, cur] & ~below[:, cur] & (sweeps[:, cur] == sweeps[:, prev])
+    plateau_end = np.where(on_plateau, N, positions)
+    plateau_end = np.minimum.accumulate(plateau_end[:, ::-1], axis=-1)[:, ::-1]
+    after_plateau = np.full_like(plateau_end, N)
+    after_plateau[:, :-1] = plateau_end[:, 1:]
+
+    after_idx = np.minimum(after_plateau, N - 1)
+    after_value = np.take_along_axis(sweeps, after_idx, axis=-1)
+    is_peak = (
+        rising
+        & (after_plateau < N - 1)
+        & np.take_along_axis(valid & ~below, after_idx, axis=-1)
+        & (after_value < sweeps)
+    )
+
+    last_rising = np.maximum.accumulate(np.where(rising, positions, -1), axis=-1)
+    last_rising_before = np.full_like(last_rising, -1)
+    last_rising_before[:, 1:] = last_rising[:, :-1]
+    within_plateau = (last_rising_before >= 0) & (
+        np.take_along_axis(after_plateau, np.maximum(last_rising_before, 0), axis=-1) > positions
+    )
+    skipped |= within_plateau
+
+    stopping = np.zeros_like(valid)
+    stopping[:, cur] = valid[:, prev] & ~valid[:, nxt]
+    stopping &= ~skipped
+    stop = np.where(stopping.any(axis=-1), stopping.argmax(axis=-1), N)
+
+    is_peak &= positions < stop[:, np.newaxis]
+    return is_peak.reshape(abs_sweep.shape)
 
 
 def get_temperature_adjustment_factors(
@@ -392,36 +481,15 @@ def double_buffering_frame_filter(_frame: npt.NDArray[Any]) -> Optional[npt.NDAr
     threshold = MEAN_ABS_DEV_OUTLIER_TH * frame_diff_mad
     outliers = frame_diff_abs > threshold
 
-    # Perform filtering at each distance to remove outliers
-    filtered_frame_real = frame_real.copy()
-    filtered_frame_imag = frame_imag.copy()
-    for d in range(n_d):
-        if np.any(outliers[:, d]):
-            args = np.where(outliers[:, d])[0]
-            for idx in args:
-                if idx <= 1:
-                    # Median filtering for the first two and the last two sweeps
-                    filtered_frame_real[idx, d] = np.median(filtered_frame_real[idx : idx + 4, d])
-                    filtered_frame_imag[idx, d] = np.median(filtered_frame_imag[idx : idx + 4, d])
-                elif idx >= n_s - 2:
-                    filtered_frame_real[idx, d] = np.median(filtered_frame_real[idx - 3 : idx, d])
-                    filtered_frame_imag[idx, d] = np.median(filtered_frame_imag[idx - 3 : idx, d])
-                else:
-                    # Interpolation for the remaining sweeps
-                    filtered_frame_real[idx, d] = int(
-                        (
-                            2 * filtered_frame_real[max(idx - 1, 0), d]
-                            + filtered_frame_real[min(idx + 2, n_s - 1), d]
-                        )
-                        / 3
-                    )
-                    filtered_frame_imag[idx, d] = int(
-                        (
-                            2 * filtered_frame_imag[max(idx - 1, 0), d]
-                            + filtered_frame_imag[min(idx + 2, n_s - 1), d]
-                        )
-                        / 3
-                    )
+    # Remove the outliers
+    filtered_frame_real = frame_real
+    filtered_frame_imag = frame_imag
+    if np.any(outliers):
+        filtered_frame_parts = _remove_double_buffering_outliers(
+            np.stack([frame_real, frame_imag], axis=-1), outliers
+        )
+        filtered_frame_real = filtered_frame_parts[..., 0]
+        filtered_frame_imag = filtered_frame_parts[..., 1]
 
     filtered_frame = np.empty((n_s, n_d), dtype=np.complex_)
     filtered_frame.real = filtered_frame_real
@@ -430,6 +498,46 @@ def double_buffering_frame_filter(_frame: npt.NDArray[Any]) -> Optional[npt.NDAr
     return filtered_frame
 
 
+def _remove_double_buffering_outliers(
+    frame: npt.NDArray[Any], outliers: npt.NDArray[np.bool_]
+) -> npt.NDArray[Any]:
+    """Replaces the outliers in a frame, with the real and imaginary parts in the last dimension.
+
+    The outliers are replaced in order of increasing sweep index, and replacements may depend on
+    already replaced outliers in earlier sweeps.
+    """
+    n_s = frame.shape[0]
+    filtered_frame = frame.copy()
+
+    # Median filtering for the first two sweeps, using the original sweeps
+    for idx in (0, 1):
+        (cols,) = np.nonzero(outliers[idx])
+        if cols.size > 0:
+            filtered_frame[idx, cols] = np.median(frame[idx : idx + 4, cols], axis=0)
+
+    # Interpolation for the remaining sweeps, between the (possibly replaced) sweep before and
+    # the original sweep two positions ahead. In a run of consecutive outliers, each outlier
+    # depends on the previous one, so the runs are worked through one step at a time.
+    remaining = np.zeros_like(outliers)
+    remaining[2:-2] = outliers[2:-2]
+    while np.any(remaining):
+        first_in_run = remaining.copy()
+        first_in_run[1:] &= ~remaining[:-1]
+        rows, cols = np.nonzero(first_in_run)
+        before = filtered_frame[rows - 1, cols].astype(np.int64)
+        two_ahead = frame[rows + 2, cols]
+        filtered_frame[rows, cols] = np.trunc((2 * before + two_ahead) / 3)
+        remaining &= ~first_in_run
+
+    # Median filtering for the last two sweeps, using the earlier, possibly replaced, sweeps
+    for idx in (n_s - 2, n_s - 1):
+        (cols,) = np.nonzero(outliers[idx])
+        if cols.size > 0:
+            filtered_frame[idx, cols] = np.median(filtered_frame[idx - 3 : idx, cols], axis=0)
+
+    return filtered_frame
+
+
 def select_prf(breakpoint: int, profile: a121.Profile) -> a121.PRF:
     """Calculates the highest possible PRF for the given breakpoint.
 
@@ -520,6 +628,48 @@ def exponential_smoothing_coefficient(fs: float, time_constant: float) -> float:
     return float(np.exp(-dt / time_constant))
 
 
+def exponential_smoothing_scan(
+    samples: npt.NDArray[Any], smoothing_factors: npt.ArrayLike, initial: npt.ArrayLike
+) -> npt.NDArray[Any]:
+    """Exponentially smooths samples along the first axis
+
+    Gives the same states as updating ``state = sf * state + (1.0 - sf) * sample`` one sample at
+    a time, starting from ``initial``. Once the smoothing factor stays constant, the recursion is
+    run by :func:`scipy.signal.lfilter` instead of sample by sample.
+
+    :param samples: Samples, stacked in the first dimension
+    :param smoothing_factors: One smoothing factor, or one per sample
+    :param initial: State before the first sample
+    :returns: The state after each sample
+    """
+    num_samples = samples.shape[0]
+    sfs = np.broadcast_to(np.asarray(smoothing_factors, dtype=float), (num_samples,))
+    state = np.asarray(initial)
+    states = np.empty(
+        (num_samples, *np.broadcast_shapes(samples.shape[1:], state.shape)),
+        dtype=np.result_type(samples, state, float),
+    )
+
+    (changes,) = np.nonzero(sfs[1:] != sfs[:-1])
+    constant_start = int(changes[-1]) + 1 if changes.size > 0 else 0
+
+    for i in range(constant_start):
+        state = sfs[i] * state + (1.0 - sfs[i]) * samples[i]
+        states[i] = state
+
+    if constant_start < num_samples:
+        sf = sfs[constant_start]
+        states[constant_start:] = lfilter(
+            [1.0 - sf],
+            [1.0, -sf],
+            samples[constant_start:],
+            axis=0,
+            zi=np.broadcast_to(sf * state, states.shape[1:])[np.newaxis],
+        )[0]
+
+    return states
+
+
 def _safe_ceil(x: float) -> float:
     """Perform safe ceil.
 
@@ -591,3 +741,77 @@ def _convert_amplitude_to_strength(
     rlg_db = RLG_PER_HWAAS_MAP[subsweep_config.profile] + 10 * np.log10(subsweep_config.hwaas)
 
     return float(s_db - n_db - rlg_db + r_db - processing_gain_db)
+
+
+class TimeSeriesBuffer:
+    """Fixed length time series, updated a few samples at a time
+
+    Each sample is stored twice, ``length`` rows apart, in a circular buffer. The latest
+    ``length`` samples are thereby always available as a contiguous view, and adding samples
+    costs the same regardless of the length of the time series.
+
+    The time series is initially filled with zeros.
+
+    :param length: Number of samples in the time series
+    :param sample_shape: Shape of each sample, e.g. the number of points for a time series of sweeps
+    :param dtype: Data type of the samples
+    :param unwrap:
+        Unwrap added samples as phase, continuing from the latest sample. This gives the same
+        time series as ``np.unwrap`` over the whole time series would.
+    """
+
+    def __init__(
+        self,
+        length: int,
+        sample_shape: Tuple[int, ...] = (),
+        dtype: npt.DTypeLike = float,
+        unwrap: bool = False,
+    ) -> None:
+        if length < 1:
+            raise ValueError("length must be at least 1")
+
+        self._length = length
+        self._unwrap = unwrap
+        self._buffer = np.zeros((2 * length, *sample_shape), dtype=dtype)
+        self._start = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def data(self) -> npt.NDArray[Any]:
+        """The time series, oldest sample first
+
+        This is a read-only view of the buffer. Its content changes when samples are added.
+        """
+        view = self._buffer[self._start : self._start + self._length]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def latest(self) -> npt.NDArray[Any]:
+        """The latest sample"""
+        return self._buffer[self._start + self._length - 1]  # type: ignore[no-any-return]
+
+    def append(self, sample: npt.ArrayLike) -> None:
+        """Adds a sample, dropping the oldest one"""
+        self.extend(np.expand_dims(sample, axis=0))
+
+    def extend(self, samples: npt.ArrayLike) -> None:
+        """Adds samples along the first axis, dropping as many of the oldest ones"""
+        samples = np.asarray(samples)
+
+        if self._unwrap:
+            samples = np.unwrap(np.concatenate([self.latest[np.newaxis], samples]), axis=0)[1:]
+
+        samples = samples[-self._length :]
+        num_samples = samples.shape[0]
+
+        num_before_wrap = min(num_samples, self._length - self._start)
+        num_after_wrap = num_samples - num_before_wrap
+        for offset in [0, self._length]:
+            start = self._start + offset
+            self._buffer[start : start + num_before_wrap] = samples[:num_before_wrap]
+            self._buffer[offset : offset + num_after_wrap] = samples[num_before_wrap:]
+
+        self._start = (self._start + num_samples) % self._length
@@ -19,6 +19,7 @@ from acconeer.exptool.a121.algo import (
     AlgoParamEnum,
     AlgoProcessorConfigBase,
     ProcessorBase,
+    TimeSeriesBuffer,
     exponential_smoothing_coefficient,
 )
 from acconeer.exptool.a121.algo.presence import Processor as PresenceProcessor
@@ -116,7 +117,7 @@ class BreathingProcessor(ProcessorBase[BreathingProcessorResult]):
     filt_sparse_iq_buffer: npt.NDArray[np.complex_]
     angle_buffer: npt.NDArray[np.float_]
     filt_angle_buffer: npt.NDArray[np.float_]
-    breathing_motion_buffer: npt.NDArray[np.float_]
+    breathing_motion_buffer: TimeSeriesBuffer
     breathing_rate_history: npt.NDArray[np.float_]
     all_breathing_rate_history: npt.NDArray[np.float_]
     heart_rate_history: npt.NDArray[np.float_]
@@ -163,6 +164,7 @@ class BreathingProcessor(ProcessorBase[BreathingProcessorResult]):
         # PSD frequency vector.
         self.frequencies = np.fft.rfftfreq(self.padded_time_series_length, 1 / self.frame_rate)
         self.time_vector = np.linspace(-self.HISTORY_S, 0, int(self.frame_rate * self.HISTORY_S))
+        self.window = np.hamming(self.time_series_length)[:, np.newaxis]
 
         self.reinitialize_processor(0, self.num_points)
 
@@ -210,13 +212,10 @@ class BreathingProcessor(ProcessorBase[BreathingProcessorResult]):
         self.filt_angle_buffer[0] = filt_angle
 
         # Add filtered angle to breathing motion fifo buffer.
-        self.breathing_motion_buffer = np.roll(self.breathing_motion_buffer, shift=-1, axis=0)
-        self.breathing_motion_buffer[-1] = filt_angle
+        self.breathing_motion_buffer.append(filt_angle)
 
         # Calculate psd of signal.
-        windowed_breathing_motion_buffer = (
-            self.breathing_motion_buffer * np.hamming(self.time_series_length)[:, np.newaxis]
-        )
+        windowed_breathing_motion_buffer = self.breathing_motion_buffer.data * self.window
         psd = np.fft.rfft(
             windowed_breathing_motion_buffer, axis=0, n=self.padded_time_series_length
         )
@@ -287,7 +286,7 @@ class BreathingProcessor(ProcessorBase[BreathingProcessorResult]):
         extra_result = BreathingProcessorExtraResult(
             psd=psd_weighted,
             frequencies=self.frequencies,
-            breathing_motion=self.breathing_motion_buffer[:, self.center_distance_idx],
+            breathing_motion=self.breathing_motion_buffer.data[:, self.center_distance_idx].copy(),
             time_vector=self.time_vector,
             all_breathing_rate_history=self.all_breathing_rate_history,
             breathing_rate_history=self.breathing_rate_history,
@@ -318,8 +317,8 @@ class BreathingProcessor(ProcessorBase[BreathingProcessorResult]):
         self.filt_angle_buffer = np.zeros(shape=(self.a_angle.size - 1, num_points_to_analyze))
 
         # Memory for breathing motion time series.
-        self.breathing_motion_buffer = np.zeros(
-            shape=(self.time_series_length, num_points_to_analyze)
+        self.breathing_motion_buffer = TimeSeriesBuffer(
+            self.time_series_length, (num_points_to_analyze,)
         )
 
         # State variables.
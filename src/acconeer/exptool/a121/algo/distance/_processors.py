@@ -160,6 +160,8 @@ class Processor(ProcessorBase[ProcessorResult]):
 
     CFAR_GUARD_LENGTH_ADJUSTMENT = 4
     CFAR_WINDOW_LENGTH_ADJUSTMENT = 0.25
+    # Windows shorter than this are faster to sum by convolution than by cumulative sums
+    CFAR_CUMSUM_MIN_WINDOW_LENGTH = 8
 
     # Standard deviation of angle in direct leakage over multiple sensor restarts.
     PHASE_JITTER_RESTART_STD = 0.05
@@ -352,8 +354,7 @@ class Processor(ProcessorBase[ProcessorResult]):
             raise ValueError(ERROR_MSG)
 
     def process(self, result: a121.Result) -> ProcessorResult:
-        range_subframes = [result.subframes[i] for i in self.range_subsweep_indexes]
-        frame = np.concatenate(range_subframes, axis=1)
+        frame = result.get_concatenated_subframes(self.range_subsweep_indexes)
         if self.processor_config.measurement_type == MeasurementType.CLOSE_RANGE:
             lb_angle = np.angle(result.subframes[self.CLOSE_RANGE_LOOPBACK_IDX]).astype(float)
             if (
@@ -382,6 +383,32 @@ class Processor(ProcessorBase[ProcessorResult]):
 
         raise RuntimeError
 
+    def process_batch(self, stacked_results: a121.StackedResults) -> List[ProcessorResult]:
+        """Processes stacked results, giving the same results as processing them one by one
+
+        In distance estimation mode, the sweeps of all frames are compensated and filtered at
+        once. The calibration modes process frames one by one.
+        """
+        if self.processor_mode != ProcessorMode.DISTANCE_ESTIMATION or len(stacked_results) == 0:
+            return super().process_batch(stacked_results)
+
+        frames = stacked_results.get_concatenated_subframes(self.range_subsweep_indexes)
+        if self.processor_config.measurement_type == MeasurementType.CLOSE_RANGE:
+            lb_angles = np.angle(stacked_results.subframes[self.CLOSE_RANGE_LOOPBACK_IDX])
+            frames = self._apply_phase_jitter_compensation(
+                self.context, frames, lb_angles.astype(float)
+            )
+
+        sweeps = frames.mean(axis=1)
+        filtered_sweeps = filtfilt(self.b, self.a, sweeps, axis=1)
+        abs_sweeps = np.abs(filtered_sweeps)
+        abs_sweeps = abs_sweeps[:, self.filt_margin : -self.filt_margin]
+
+        return [
+            self._process_distance_estimation(abs_sweep, int(temperature))
+            for abs_sweep, temperature in zip(abs_sweeps, stacked_results.temperature)
+        ]
+
     @staticmethod
     def _apply_phase_jitter_compensation(
         context: ProcessorContext,
@@ -427,6 +454,11 @@ class Processor(ProcessorBase[ProcessorResult]):
             self.guard_half_length = self._calc_cfar_guard_half_length(
                 self.profile, self.step_length
             )
+            # The noise part of the threshold doesn't depend on the sweep
+            self.cfar_noise_threshold = self.cfar_abs_noise * self.num_stds_in_threshold
+            self.cfar_cumsum = np.empty(self.num_points_cropped + 1)
+            self.cfar_kernel = np.full(self.window_length, 1 / (2 * self.window_length))
+            self.cfar_threshold = np.empty(self.num_points_cropped)
 
         self.offset_m = get_distance_offset(
             self.context.loopback_peak_location_m, self.profile, self.context.reference_temperature
@@ -468,7 +500,8 @@ class Processor(ProcessorBase[ProcessorResult]):
         if self.processor_config.threshold_method == ThresholdMethod.CFAR:
             cfar_margin_slice = slice(self.cfar_margin, -self.cfar_margin)
             abs_sweep = abs_sweep[cfar_margin_slice]
-            threshold = self.threshold[cfar_margin_slice]
+            # The CFAR threshold is updated in place, so the result gets a copy of it
+            threshold = self.threshold[cfar_margin_slice].copy()
             distances_m = self.distances_m[cfar_margin_slice]
         else:
             threshold = self.threshold
@@ -556,13 +589,16 @@ class Processor(ProcessorBase[ProcessorResult]):
         self, abs_sweep: npt.NDArray[np.float_], temperature: int
     ) -> npt.NDArray[np.float_]:
         if self.threshold_method == ThresholdMethod.CFAR:
-            return self._calculate_cfar_threshold(
+            threshold = self._calculate_cfar_mean(
                 abs_sweep,
                 self.window_length,
                 self.guard_half_length,
-                self.num_stds_in_threshold,
-                self.cfar_abs_noise,
+                cumsum=self.cfar_cumsum,
+                kernel=self.cfar_kernel,
+                out=self.cfar_threshold,
             )
+            threshold += self.cfar_noise_threshold
+            return threshold
         elif (
             self.threshold_method == ThresholdMethod.FIXED
             or self.threshold_method == ThresholdMethod.FIXED_STRENGTH
@@ -631,8 +667,9 @@ class Processor(ProcessorBase[ProcessorResult]):
 
         return threshold
 
-    @staticmethod
+    @classmethod
     def _calculate_cfar_threshold(
+        cls,
         abs_sweep: npt.NDArray[np.float_],
         window_length: int,
         guard_half_length: int,
@@ -651,17 +688,64 @@ class Processor(ProcessorBase[ProcessorResult]):
         segments to the left and to the right.
         """
 
-        threshold = np.full(abs_sweep.shape, np.nan)
-        margin = window_length + guard_half_length
-        sweep_len_without_margins = abs_sweep.shape[0] - 2 * margin
+        threshold = cls._calculate_cfar_mean(abs_sweep, window_length, guard_half_length)
+        threshold += abs_noise_std * num_stds
+        return threshold
+
+    @classmethod
+    def _calculate_cfar_mean(
+        cls,
+        abs_sweep: npt.NDArray[np.float_],
+        window_length: int,
+        guard_half_length: int,
+        cumsum: Optional[npt.NDArray[np.float_]] = None,
+        kernel: Optional[npt.NDArray[np.float_]] = None,
+        out: Optional[npt.NDArray[np.float_]] = None,
+    ) -> npt.NDArray[np.float_]:
+        """Calculate the sweep dependent part of the CFAR threshold.
 
-        filt_abs_sweep = np.convolve(abs_sweep, np.ones(window_length), "valid") / window_length
-        threshold[margin:-margin] = (
-            filt_abs_sweep[:sweep_len_without_margins]
-            + filt_abs_sweep[-sweep_len_without_margins:]
-        ) / 2
+        Short windows are summed by convolution with ``kernel``, ``window_length`` values of
+        ``1 / (2 * window_length)``. For longer windows, the sums are taken as differences of the
+        cumulative sum of the sweep, which is stored in ``cumsum``. ``cumsum`` must have room for
+        ``len(abs_sweep) + 1`` values. The threshold is written to ``out``, NaN in the margins.
+        Buffers that are not given are allocated.
+        """
 
-        threshold += abs_noise_std * num_stds
+        num_points = abs_sweep.shape[0]
+        margin = window_length + guard_half_length
+        sweep_len_without_margins = num_points - 2 * margin
+
+        threshold = np.empty(abs_sweep.shape) if out is None else out
+        threshold[:margin] = np.nan
+        threshold[-margin:] = np.nan
+        mean = threshold[margin:-margin]
+
+        if window_length < cls.CFAR_CUMSUM_MIN_WINDOW_LENGTH:
+            if kernel is None:
+                kernel = np.full(window_length, 1 / (2 * window_length))
+            window_means = np.convolve(abs_sweep, kernel, "valid")
+            np.add(
+                window_means[:sweep_len_without_margins],
+                window_means[-sweep_len_without_margins:],
+                out=mean,
+            )
+            return threshold
+
+        if cumsum is None:
+            cumsum = np.empty(num_points + 1)
+        cumsum[0] = 0.0
+        np.cumsum(abs_sweep, out=cumsum[1:])
+
+        # The left window sum, then the right one, both from differences of the cumulative sum
+        right_start = num_points - sweep_len_without_margins - window_length + 1
+        np.subtract(
+            cumsum[window_length : window_length + sweep_len_without_margins],
+            cumsum[:sweep_len_without_margins],
+            out=mean,
+        )
+        mean += cumsum[right_start + window_length :]
+        mean -= cumsum[right_start : right_start + sweep_len_without_margins]
+        mean /= 2 * window_length
         return threshold
 
     def _calculate_fixed_strength_threshold(
@@ -680,19 +764,16 @@ class Processor(ProcessorBase[ProcessorResult]):
         bpts_m = np.array(start_points) * APPROX_BASE_STEP_LENGTH_M
         profile = self.profile
 
-        threshold = []
-        for distance_m in distances_m:
-            subsweep_idx = np.sum(bpts_m < distance_m) - 1
-            sigma = bg_noise_std[subsweep_idx]
-            hwaas = subsweeps[subsweep_idx].hwaas
-
-            n_db = 20 * np.log10(sigma)
-            r_db = reflector_shape.exponent * 10 * np.log10(distance_m)
-            rlg_db = RLG_PER_HWAAS_MAP[profile] + 10 * np.log10(hwaas)
+        # Index of the subsweep of each distance, i.e. the last one starting before it
+        subsweep_idxs = np.searchsorted(bpts_m, distances_m) - 1
+        sigmas = np.array(bg_noise_std)[subsweep_idxs]
+        hwaas = np.array([subsweep.hwaas for subsweep in subsweeps])[subsweep_idxs]
 
-            threshold.append(10 ** ((processing_gain_db + n_db + rlg_db - r_db + strength) / 20))
+        n_db = 20 * np.log10(sigmas)
+        r_db = reflector_shape.exponent * 10 * np.log10(distances_m)
+        rlg_db = RLG_PER_HWAAS_MAP[profile] + 10 * np.log10(hwaas)
 
-        return np.array(threshold)
+        return 10 ** ((processing_gain_db + n_db + rlg_db - r_db + strength) / 20)  # type: ignore[no-any-return]
 
     @staticmethod
     def _detect_close_object(
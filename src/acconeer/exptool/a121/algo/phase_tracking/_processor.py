@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -11,7 +11,12 @@ import numpy.typing as npt
 
 from acconeer.exptool import a121
 from acconeer.exptool._core.class_creation.attrs import attrs_ndarray_isclose
-from acconeer.exptool.a121.algo import PERCEIVED_WAVELENGTH, AlgoProcessorConfigBase, ProcessorBase
+from acconeer.exptool.a121.algo import (
+    PERCEIVED_WAVELENGTH,
+    AlgoProcessorConfigBase,
+    ProcessorBase,
+    exponential_smoothing_scan,
+)
 
 
 @attrs.mutable(kw_only=True)
@@ -124,6 +129,35 @@ class Processor(ProcessorBase[ProcessorResult]):
 
         self.lp_abs_sweep = self.lp_abs_sweep * self.LP_COEFF + abs_sweep * (1 - self.LP_COEFF)
 
+        return self._track_phase(frame, np.angle(np.mean(frame, axis=0)))
+
+    def process_batch(self, stacked_results: a121.StackedResults) -> list[ProcessorResult]:
+        """Processes stacked results, giving the same results as processing them one by one
+
+        The low pass filtered amplitudes are computed for all frames at once.
+        """
+        frames = stacked_results.frame
+        if frames.shape[0] == 0:
+            return []
+
+        abs_sweeps = np.mean(np.abs(frames), axis=1)
+        angle_sweeps = np.angle(np.mean(frames, axis=1))
+
+        if self.sweep_index == 0:
+            self.lp_abs_sweep = abs_sweeps[0]
+
+        lp_abs_sweeps = exponential_smoothing_scan(abs_sweeps, self.LP_COEFF, self.lp_abs_sweep)
+
+        processor_results = []
+        for frame, lp_abs_sweep, angle_sweep in zip(frames, lp_abs_sweeps, angle_sweeps):
+            self.lp_abs_sweep = lp_abs_sweep
+            processor_results.append(self._track_phase(frame, angle_sweep))
+
+        return processor_results
+
+    def _track_phase(
+        self, frame: npt.NDArray[np.complex_], angle_sweep: npt.NDArray[np.float_]
+    ) -> ProcessorResult:
         self.iq_history = np.roll(self.iq_history, shift=1)
 
         if self.threshold < np.max(self.lp_abs_sweep):
@@ -189,7 +223,7 @@ class Processor(ProcessorBase[ProcessorResult]):
 
         return ProcessorResult(
             lp_abs_sweep=self.lp_abs_sweep,
-            angle_sweep=np.angle(np.mean(frame, axis=0)),
+            angle_sweep=angle_sweep,
             threshold=self.threshold,
             rel_time_stamps=rel_time_to_plot,
             distance_history=distance_to_plot,
@@ -13,7 +13,11 @@ from scipy.special import binom
 
 from acconeer.exptool import a121
 from acconeer.exptool._core.class_creation.attrs import attrs_ndarray_isclose
-from acconeer.exptool.a121.algo import AlgoProcessorConfigBase, ProcessorBase
+from acconeer.exptool.a121.algo import (
+    AlgoProcessorConfigBase,
+    ProcessorBase,
+    exponential_smoothing_scan,
+)
 from acconeer.exptool.a121.algo._utils import get_distances_m
 
 
@@ -214,6 +218,12 @@ class Processor(ProcessorBase[ProcessorResult]):
     def _dynamic_sf(static_sf: float, update_index: int) -> float:
         return min(static_sf, 1.0 - 1.0 / (1.0 + update_index))
 
+    @staticmethod
+    def _dynamic_sfs(
+        static_sf: float, update_indexes: npt.NDArray[np.int_]
+    ) -> npt.NDArray[np.float_]:
+        return np.minimum(static_sf, 1.0 - 1.0 / (1.0 + update_indexes))
+
     @staticmethod
     def _abs_dev(
         a: npt.NDArray[np.complex_],
@@ -282,6 +292,62 @@ class Processor(ProcessorBase[ProcessorResult]):
 
         return self.lp_phase_shift * norm_abs_mean_sweep  # type: ignore[no-any-return]
 
+    def _update_presence(
+        self, intra: npt.NDArray[np.float_], inter: npt.NDArray[np.float_]
+    ) -> bool:
+        """Updates the presence scores and distance given the intra- and inter-frame parts of a
+        frame, and returns whether presence is detected.
+        """
+
+        intra_presence_distance_index = int(np.argmax(intra))
+        intra_presence_distance = self.distances[intra_presence_distance_index]
+
+        self.intra_presence_score = (
+            self.intra_output_sf * self.intra_presence_score
+            + (1.0 - self.intra_output_sf) * intra[intra_presence_distance_index]
+        )
+
+        inter_presence_distance_index = int(np.argmax(inter))
+        inter_presence_distance = self.distances[inter_presence_distance_index]
+
+        sf = self._dynamic_sf(self.inter_output_sf, self.update_index)
+        self.inter_presence_score = (
+            sf * self.inter_presence_score + (1.0 - sf) * inter[inter_presence_distance_index]
+        )
+
+        # Inter-frame presence timeout
+
+        if self.inter_frame_presence_timeout:
+            delta = self.inter_presence_score - self.previous_presence_score
+
+            if delta < 0:
+                self.negative_count += 1
+            else:
+                self.negative_count = 0
+
+            self._inter_presence_score_scaling()
+            self._mean_sweep_sf_scaling()
+
+            self.previous_presence_score = self.inter_presence_score
+
+        # Presence distance - intra presence distance is prioritized due to faster reaction time
+
+        if self.intra_presence_score > self.intra_threshold and self.intra_enable:
+            presence_detected = True
+            self.presence_distance_index = intra_presence_distance_index
+            self.presence_distance = intra_presence_distance
+        elif self.inter_presence_score > self.inter_threshold and self.inter_enable:
+            presence_detected = True
+            self.presence_distance_index = inter_presence_distance_index
+            self.presence_distance = inter_presence_distance
+        else:
+            presence_detected = False
+            self.presence_distance = 0
+
+        self.update_index += 1
+
+        return presence_detected
+
     def _inter_presence_score_scaling(self) -> None:
         """
         Scaling of self.inter_presence_score for faster decline when loosing detection.
@@ -315,8 +381,7 @@ class Processor(ProcessorBase[ProcessorResult]):
         self.mean_sweep_sf = self._tc_to_sf(self.mean_sweep_tc / scaling_factor, self.f)
 
     def process(self, result: a121.Result) -> ProcessorResult:
-        range_subframes = [result.subframes[i] for i in self.subsweep_indexes]
-        frame = np.concatenate(range_subframes, axis=1)
+        frame = result.get_concatenated_subframes(self.subsweep_indexes)
 
         # Noise estimation
 
@@ -342,14 +407,6 @@ class Processor(ProcessorBase[ProcessorResult]):
             where=(self.lp_noise > 1.0),
         )
 
-        intra_presence_distance_index = int(np.argmax(intra))
-        intra_presence_distance = self.distances[intra_presence_distance_index]
-
-        self.intra_presence_score = (
-            self.intra_output_sf * self.intra_presence_score
-            + (1.0 - self.intra_output_sf) * intra[intra_presence_distance_index]
-        )
-
         # Inter-frame part
 
         mean_sweep = frame.mean(axis=0)
@@ -389,44 +446,7 @@ class Processor(ProcessorBase[ProcessorResult]):
                 sf * self.lp_mean_sweep_for_phase + (1.0 - sf) * mean_sweep
             )
 
-        inter_presence_distance_index = int(np.argmax(inter))
-        inter_presence_distance = self.distances[inter_presence_distance_index]
-
-        sf = self._dynamic_sf(self.inter_output_sf, self.update_index)
-        self.inter_presence_score = (
-            sf * self.inter_presence_score + (1.0 - sf) * inter[inter_presence_distance_index]
-        )
-
-        # Inter-frame presence timeout
-
-        if self.inter_frame_presence_timeout:
-            delta = self.inter_presence_score - self.previous_presence_score
-
-            if delta < 0:
-                self.negative_count += 1
-            else:
-                self.negative_count = 0
-
-            self._inter_presence_score_scaling()
-            self._mean_sweep_sf_scaling()
-
-            self.previous_presence_score = self.inter_presence_score
-
-        # Presence distance - intra presence distance is prioritized due to faster reaction time
-
-        if self.intra_presence_score > self.intra_threshold and self.intra_enable:
-            presence_detected = True
-            self.presence_distance_index = intra_presence_distance_index
-            self.presence_distance = intra_presence_distance
-        elif self.inter_presence_score > self.inter_threshold and self.inter_enable:
-            presence_detected = True
-            self.presence_distance_index = inter_presence_distance_index
-            self.presence_distance = inter_presence_distance
-        else:
-            presence_detected = False
-            self.presence_distance = 0
-
-        self.update_index += 1
+        presence_detected = self._update_presence(intra, inter)
 
         extra_result = ProcessorExtraResult(
             frame=frame,
@@ -446,3 +466,148 @@ class Processor(ProcessorBase[ProcessorResult]):
             presence_distance=self.presence_distance,
             extra_result=extra_result,
         )
+
+    def process_batch(self, stacked_results: a121.StackedResults) -> list[ProcessorResult]:
+        """Processes stacked results, giving the same results as processing them one by one
+
+        The per-frame parts are computed for all frames at once, and the low pass filters with
+        :func:`exponential_smoothing_scan`. Only the presence scores are updated frame by frame.
+
+        With both phase boost and presence timeout enabled, the phase filter depends on earlier
+        detections, and frames are processed one by one.
+        """
+        if self.inter_phase_boost and self.inter_frame_presence_timeout:
+            return super().process_batch(stacked_results)
+
+        frames = stacked_results.get_concatenated_subframes(self.subsweep_indexes)
+        num_frames = frames.shape[0]
+        if num_frames == 0:
+            return []
+
+        update_indexes = self.update_index + np.arange(num_frames)
+
+        # Noise estimation
+
+        noise_diff = np.diff(frames, n=self.noise_est_diff_order, axis=1)
+        noise = self._abs_dev(noise_diff, axis=1, subtract_mean=False)
+        noise /= self.noise_norm_factor
+        lp_noises = exponential_smoothing_scan(
+            noise, self._dynamic_sfs(self.noise_sf, update_indexes), self.lp_noise
+        )
+
+        # Intra-frame part
+
+        sweep_devs = self._abs_dev(frames, axis=1, ddof=1)
+        lp_intra_devs = exponential_smoothing_scan(
+            sweep_devs, self._dynamic_sfs(self.intra_sf, update_indexes), self.lp_intra_dev
+        )
+
+        intras = np.divide(
+            lp_intra_devs,
+            lp_noises,
+            out=np.zeros_like(lp_intra_devs),
+            where=(lp_noises > 1.0),
+        )
+
+        # Inter-frame part
+
+        mean_sweeps = frames.mean(axis=1)
+        abs_mean_sweeps = np.abs(mean_sweeps)
+
+        fast_lp_mean_sweeps = exponential_smoothing_scan(
+            abs_mean_sweeps,
+            self._dynamic_sfs(self.fast_sf, update_indexes),
+            self.fast_lp_mean_sweep,
+        )
+        slow_lp_mean_sweeps = exponential_smoothing_scan(
+            abs_mean_sweeps,
+            self._dynamic_sfs(self.slow_sf, update_indexes),
+            self.slow_lp_mean_sweep,
+        )
+
+        inter_devs = np.abs(fast_lp_mean_sweeps - slow_lp_mean_sweeps)
+        inter_dev_sfs = self._dynamic_sfs(self.inter_dev_sf, update_indexes)
+        lp_inter_devs = exponential_smoothing_scan(inter_devs, inter_dev_sfs, self.lp_inter_dev)
+
+        inters = np.divide(
+            lp_inter_devs,
+            lp_noises,
+            out=np.zeros_like(lp_inter_devs),
+            where=(lp_noises > 1.0),
+        )
+
+        inters *= np.sqrt(self.sweeps_per_frame)
+
+        # Phase and amplitude weighting of inter-frame part
+
+        if self.inter_phase_boost:
+            if self.update_index == 0:
+                self.lp_mean_sweep_for_phase = mean_sweeps[0]
+
+            lp_mean_sweeps_for_phase = exponential_smoothing_scan(
+                mean_sweeps,
+                self._dynamic_sfs(self.mean_sweep_sf, update_indexes),
+                self.lp_mean_sweep_for_phase,
+            )
+            # The weight of each frame uses the filtered mean sweep of the frames before it
+            phase_shifts = self._calculate_phase_shift(
+                np.concatenate(
+                    [self.lp_mean_sweep_for_phase[np.newaxis], lp_mean_sweeps_for_phase[:-1]]
+                ),
+                mean_sweeps,
+            )
+            lp_phase_shifts = exponential_smoothing_scan(
+                phase_shifts, inter_dev_sfs, self.lp_phase_shift
+            )
+            lp_mean_sweeps_for_abs = exponential_smoothing_scan(
+                mean_sweeps, inter_dev_sfs, self.lp_mean_sweep_for_abs
+            )
+
+            abs_lp_mean_sweeps = np.abs(lp_mean_sweeps_for_abs)
+            norm_abs_mean_sweeps = np.divide(
+                abs_lp_mean_sweeps,
+                lp_noises,
+                out=np.zeros_like(abs_lp_mean_sweeps),
+                where=(lp_noises > 1.0),
+            )
+            norm_abs_mean_sweeps *= np.sqrt(self.sweeps_per_frame)
+            norm_abs_mean_sweeps = np.minimum(norm_abs_mean_sweeps, self.MAX_AMPLITUDE_WEIGHT)
+
+            inters = inters * (lp_phase_shifts * norm_abs_mean_sweeps)
+
+            self.lp_mean_sweep_for_phase = lp_mean_sweeps_for_phase[-1].copy()
+            self.lp_phase_shift = lp_phase_shifts[-1].copy()
+            self.lp_mean_sweep_for_abs = lp_mean_sweeps_for_abs[-1].copy()
+
+        self.lp_noise = lp_noises[-1].copy()
+        self.lp_intra_dev = lp_intra_devs[-1].copy()
+        self.fast_lp_mean_sweep = fast_lp_mean_sweeps[-1].copy()
+        self.slow_lp_mean_sweep = slow_lp_mean_sweeps[-1].copy()
+        self.lp_inter_dev = lp_inter_devs[-1].copy()
+
+        processor_results = []
+        for i in range(num_frames):
+            presence_detected = self._update_presence(intras[i], inters[i])
+
+            extra_result = ProcessorExtraResult(
+                frame=frames[i],
+                abs_mean_sweep=abs_mean_sweeps[i],
+                fast_lp_mean_sweep=fast_lp_mean_sweeps[i],
+                slow_lp_mean_sweep=slow_lp_mean_sweeps[i],
+                lp_noise=lp_noises[i],
+                presence_distance_index=self.presence_distance_index,
+            )
+
+            processor_results.append(
+                ProcessorResult(
+                    intra_presence_score=self.intra_presence_score,
+                    intra=intras[i],
+                    inter_presence_score=self.inter_presence_score,
+                    inter=inters[i],
+                    presence_detected=presence_detected,
+                    presence_distance=self.presence_distance,
+                    extra_result=extra_result,
+                )
+            )
+
+        return processor_results
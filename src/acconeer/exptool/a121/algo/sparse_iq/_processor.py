@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -77,20 +77,7 @@ class Processor(ExtendedProcessorBase[ProcessorResult]):
         entry_result = []
 
         for subframe in result.subframes:
-            z_ft = np.fft.fftshift(np.fft.fft(subframe * hanning_window, axis=0), axes=(0,))
-            abs_z_ft = np.abs(z_ft)
-
-            amplitude_method = self.processor_config.amplitude_method
-            if amplitude_method == AmplitudeMethod.COHERENT:
-                ampls = np.abs(subframe.mean(axis=0))
-            elif amplitude_method == AmplitudeMethod.NONCOHERENT:
-                ampls = np.abs(subframe).mean(axis=0)
-            elif amplitude_method == AmplitudeMethod.FFT_MAX:
-                ampls = abs_z_ft.max(axis=0)
-            else:
-                raise RuntimeError(f"Unknown AmplitudeMethod: {amplitude_method}")
-
-            phases = np.angle(subframe.mean(axis=0))
+            (ampls, phases, abs_z_ft) = self._process_subframes(subframe, hanning_window)
 
             entry_result.append(
                 SubsweepProcessorResult(
@@ -100,11 +87,83 @@ class Processor(ExtendedProcessorBase[ProcessorResult]):
 
         return entry_result
 
+    def _process_subframes(
+        self, subframes: npt.NDArray[np.complex_], hanning_window: npt.NDArray[np.float_]
+    ) -> t.Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_], npt.NDArray[np.float_]]:
+        """Processes a subframe, or subframes stacked in the first dimension
+
+        :returns: Amplitudes, phases and distance-velocity maps
+        """
+        sweep_axis = subframes.ndim - 2
+
+        z_ft = np.fft.fftshift(
+            np.fft.fft(subframes * hanning_window, axis=sweep_axis), axes=(sweep_axis,)
+        )
+        abs_z_ft = np.abs(z_ft)
+
+        amplitude_method = self.processor_config.amplitude_method
+        if amplitude_method == AmplitudeMethod.COHERENT:
+            ampls = np.abs(subframes.mean(axis=sweep_axis))
+        elif amplitude_method == AmplitudeMethod.NONCOHERENT:
+            ampls = np.abs(subframes).mean(axis=sweep_axis)
+        elif amplitude_method == AmplitudeMethod.FFT_MAX:
+            ampls = abs_z_ft.max(axis=sweep_axis)
+        else:
+            raise RuntimeError(f"Unknown AmplitudeMethod: {amplitude_method}")
+
+        phases = np.angle(subframes.mean(axis=sweep_axis))
+
+        return ampls, phases, abs_z_ft
+
+    def _process_entry_batch(
+        self,
+        stacked_results_hanning_window: t.Tuple[a121.StackedResults, npt.NDArray[np.float_]],
+    ) -> t.List[EntryResult]:
+        (stacked_results, hanning_window) = stacked_results_hanning_window
+
+        entry_results: t.List[EntryResult] = [[] for _ in range(len(stacked_results))]
+
+        for subframes in stacked_results.subframes:
+            (ampls, phases, abs_z_ft) = self._process_subframes(subframes, hanning_window)
+
+            for i, entry_result in enumerate(entry_results):
+                entry_result.append(
+                    SubsweepProcessorResult(
+                        frame=subframes[i],
+                        amplitudes=ampls[i],
+                        phases=phases[i],
+                        distance_velocity_map=abs_z_ft[i],
+                    )
+                )
+
+        return entry_results
+
     def process(self, results: list[dict[int, a121.Result]]) -> ProcessorResult:
         return utils.map_over_extended_structure(
             self._process_entry, utils.zip_extended_structures(results, self.windows)
         )
 
+    def process_batch(
+        self, extended_stacked_results: list[dict[int, a121.StackedResults]]
+    ) -> list[ProcessorResult]:
+        """Processes stacked results, giving the same results as processing them one by one
+
+        Each subsweep is transformed for all frames at once.
+        """
+        entry_results = utils.map_over_extended_structure(
+            self._process_entry_batch,
+            utils.zip_extended_structures(extended_stacked_results, self.windows),
+        )
+        num_frames = len(next(iter(extended_stacked_results[0].values())))
+
+        return [
+            [
+                {sensor_id: entry_result[i] for sensor_id, entry_result in group.items()}
+                for group in entry_results
+            ]
+            for i in range(num_frames)
+        ]
+
 
 def get_sensor_config() -> a121.SensorConfig:
     return a121.SensorConfig(
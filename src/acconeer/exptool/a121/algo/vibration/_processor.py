@@ -21,6 +21,7 @@ from acconeer.exptool.a121.algo import (
     AlgoParamEnum,
     AlgoProcessorConfigBase,
     ProcessorBase,
+    TimeSeriesBuffer,
     double_buffering_frame_filter,
 )
 from acconeer.exptool.utils import is_power_of_2
@@ -253,47 +254,24 @@ class Processor(ProcessorBase[ProcessorResult]):
         )[1:]
 
         # Variables
-        self.time_series = np.zeros(shape=processor_config.time_series_length)
+        self.time_series = TimeSeriesBuffer(processor_config.time_series_length, unwrap=True)
         self.lp_displacements = np.zeros_like(self.freq)
 
         self.has_init = False
 
     def process(self, result: a121.Result) -> ProcessorResult:
-        # Extract loopback frame
-        if not self.low_frequency_enhancement:
-            frame = result.subframes[RANGE_SUBSWEEP]
-        else:
-            measured_frame = result.subframes[RANGE_SUBSWEEP]
-            loopback_frame = result.subframes[LOOPBACK_SUBSWEEP]
-            frame = measured_frame * np.exp(-1j * np.angle(loopback_frame))
+        frame = self._get_frame(result.subframes)
 
         # Determine if an object is in front of the sensor
         max_sweep_amplitude = float(np.max(np.abs(frame)))
 
         if max_sweep_amplitude < self.amplitude_threshold:
-            self.has_init = False
-            # No object found -> Return
-            return ProcessorResult(
-                max_sweep_amplitude=max_sweep_amplitude,
-                lp_displacements_freqs=self.freq,
-                extra_result=ProcessorExtraResult(
-                    amplitude_threshold=self.amplitude_threshold,
-                ),
-            )
+            return self._no_object_result(max_sweep_amplitude)
 
-        # Handle frame based on whether or not continuous sweep mode is used
-        if self.continuous_data_acquisition:
-            filter_output = double_buffering_frame_filter(complex_array_to_int16_complex(frame))
-            if filter_output is not None:
-                frame = filter_output
-            self.time_series = np.roll(self.time_series, -self.spf)
-            self.time_series[-self.spf :] = np.angle(frame.squeeze(axis=1))
-            self.time_series = np.unwrap(self.time_series)
-        else:
-            self.time_series = np.unwrap(np.angle(frame.squeeze(axis=1)))
+        time_series = self._update_time_series(frame)
 
         # Calculate zero mean time series
-        zm_time_series = self.time_series - np.mean(self.time_series)
+        zm_time_series = time_series - np.mean(time_series)
 
         # Estimate displacement per frequency
         z_abs = np.abs(
@@ -303,6 +281,85 @@ class Processor(ProcessorBase[ProcessorResult]):
             )
         )[1:]
 
+        return self._process_spectrum(zm_time_series, z_abs, max_sweep_amplitude)
+
+    def process_batch(self, stacked_results: a121.StackedResults) -> list[ProcessorResult]:
+        """Processes stacked results, giving the same results as processing them one by one
+
+        The frames are extracted and the spectra of the time series are computed for all frames
+        at once.
+        """
+        frames = self._get_frame(stacked_results.subframes)
+        max_sweep_amplitudes = np.max(np.abs(frames), axis=(1, 2))
+        has_object = ~(max_sweep_amplitudes < self.amplitude_threshold)
+        (object_idxs,) = np.nonzero(has_object)
+
+        # The time series are zero padded, as rfft would do for each of them
+        zm_time_series_list = []
+        padded_zm_time_series = np.zeros((object_idxs.size, self.time_series_length))
+        for zm_time_series_padded, idx in zip(padded_zm_time_series, object_idxs):
+            time_series = self._update_time_series(frames[idx])
+            zm_time_series = time_series - np.mean(time_series)
+            zm_time_series_list.append(zm_time_series)
+            n = min(zm_time_series.size, self.time_series_length)
+            zm_time_series_padded[:n] = zm_time_series[:n]
+
+        z_abs = np.abs(np.fft.rfft(padded_zm_time_series, axis=1))[:, 1:]
+
+        processor_results = []
+        object_row = 0
+        for max_sweep_amplitude, object_found in zip(max_sweep_amplitudes, has_object):
+            if not object_found:
+                processor_results.append(self._no_object_result(float(max_sweep_amplitude)))
+            else:
+                processor_results.append(
+                    self._process_spectrum(
+                        zm_time_series_list[object_row],
+                        z_abs[object_row],
+                        float(max_sweep_amplitude),
+                    )
+                )
+                object_row += 1
+
+        return processor_results
+
+    def _get_frame(self, subframes: list[npt.NDArray[np.complex_]]) -> npt.NDArray[np.complex_]:
+        """Extracts the frame, or the frames of stacked subframes, to be processed"""
+        if not self.low_frequency_enhancement:
+            return subframes[RANGE_SUBSWEEP]
+
+        measured_frame = subframes[RANGE_SUBSWEEP]
+        loopback_frame = subframes[LOOPBACK_SUBSWEEP]
+        return measured_frame * np.exp(-1j * np.angle(loopback_frame))  # type: ignore[no-any-return]
+
+    def _no_object_result(self, max_sweep_amplitude: float) -> ProcessorResult:
+        self.has_init = False
+        # No object found -> Return
+        return ProcessorResult(
+            max_sweep_amplitude=max_sweep_amplitude,
+            lp_displacements_freqs=self.freq,
+            extra_result=ProcessorExtraResult(
+                amplitude_threshold=self.amplitude_threshold,
+            ),
+        )
+
+    def _update_time_series(self, frame: npt.NDArray[np.complex_]) -> npt.NDArray[np.float_]:
+        # Handle frame based on whether or not continuous sweep mode is used
+        if self.continuous_data_acquisition:
+            filter_output = double_buffering_frame_filter(complex_array_to_int16_complex(frame))
+            if filter_output is not None:
+                frame = filter_output
+            self.time_series.extend(np.angle(frame.squeeze(axis=1)))
+            return self.time_series.data
+        else:
+            return np.unwrap(np.angle(frame.squeeze(axis=1)))
+
+    def _process_spectrum(
+        self,
+        zm_time_series: npt.NDArray[np.float_],
+        z_abs: npt.NDArray[np.float_],
+        max_sweep_amplitude: float,
+    ) -> ProcessorResult:
         if self.reported_displacement_mode is ReportedDisplacement.AMPLITUDE:
             displacements = (
                 z_abs * self.psd_to_radians_conversion_factor * self.radians_to_displacement
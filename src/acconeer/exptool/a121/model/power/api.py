@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 """
 API for generating power regions (for more info see ./domain.py).
@@ -49,8 +49,15 @@ Going deeper down into, the frame active consists of sweep active and sweep idle
 from __future__ import annotations
 
 import collections
+import functools
+import itertools
+import json
 import typing as t
 
+import attrs
+import numpy as np
+import numpy.typing as npt
+
 from acconeer.exptool import a121
 from acconeer.exptool.a121._core import utils as core_utils
 
@@ -65,6 +72,28 @@ _ms = _mA = 1e-3
 _us = _uA = 1e-6
 
 
+@attrs.frozen(eq=False)
+class _CacheKey(t.Generic[_T]):
+    """
+    Wraps an unhashable argument of a cached function.
+    Wrapped arguments are equal if their keys are equal.
+    """
+
+    value: _T
+    key: t.Hashable
+
+    @classmethod
+    def by_identity(cls, value: _T) -> _CacheKey[_T]:
+        # The cache keeps the value alive, so its id is not reused while it is cached
+        return cls(value, id(value))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _CacheKey) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+
 def configured_rate(config: a121.SessionConfig) -> t.Optional[float]:
     """
     Returns the configured rate of the session config.
@@ -296,7 +325,36 @@ def group_active(
 ) -> domain.EnergyRegion:
     """
     Describes the active part of a group.
+
+    The active part doesn't depend on the update rate of the session config. It is cached,
+    keyed on the groups of the session config. The algorithm, sensor and module are compared
+    by identity.
     """
+    groups_json = json.dumps(
+        session_config.to_dict()["groups"], cls=core_utils.EntityJSONEncoder, sort_keys=True
+    )
+    return _group_active(
+        _CacheKey(session_config, groups_json),
+        lower_idle_state,
+        _CacheKey.by_identity(algorithm),
+        _CacheKey.by_identity(sensor),
+        _CacheKey.by_identity(module),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _group_active(
+    session_config_key: _CacheKey[a121.SessionConfig],
+    lower_idle_state: t.Optional[Sensor.LowerIdleState],
+    algorithm_key: _CacheKey[algo.Algorithm],
+    sensor_key: _CacheKey[Sensor],
+    module_key: _CacheKey[Module],
+) -> domain.EnergyRegion:
+    session_config = session_config_key.value
+    algorithm = algorithm_key.value
+    sensor = sensor_key.value
+    module = module_key.value
+
     frame_actives = [
         {sid: frame_active(sensor_config, sensor, module) for sid, sensor_config in group.items()}
         for group in session_config.groups
@@ -365,6 +423,22 @@ def session_generator(
     """
     Indefinitely simulates the session, yielding region per region
     """
+    regions = _session_period(session_config, lower_idle_state, algorithm, sensor, module)
+
+    while True:
+        yield from regions
+
+
+def _session_period(
+    session_config: a121.SessionConfig,
+    lower_idle_state: t.Optional[Sensor.LowerIdleState],
+    algorithm: algo.Algorithm,
+    sensor: Sensor,
+    module: Module,
+) -> list[domain.EnergyRegion]:
+    """
+    Returns the regions that the session repeats
+    """
     active = group_active(session_config, lower_idle_state, algorithm, sensor, module)
 
     rate = configured_rate(session_config)
@@ -385,8 +459,7 @@ def session_generator(
         else:
             regions = [active]
 
-    while True:
-        yield from regions
+    return regions
 
 
 def session(
@@ -436,23 +509,24 @@ def converged_average_current(
     """
     Simulates the session until the average current has been within 'absolute_tolerance'.
     for 'convergence_window' iterations.
+
+    See `steady_state_average_current` for the value this converges to.
     """
-    gen = session_generator(
-        session_config,
-        lower_idle_state,
-        algorithm,
-        sensor,
-        module,
-    )
+    regions = _session_period(session_config, lower_idle_state, algorithm, sensor, module)
+
+    # The charge and duration of composite regions are computed from all their subregions,
+    # so they are computed once instead of once per period
+    (first, *_) = regions
+    charges_and_durations = itertools.cycle([(r.charge, r.duration) for r in regions])
+    next(charges_and_durations)
 
-    first = next(gen)
     total_duration = first.duration
     cumulative_charge = first.charge
     average_currents = collections.deque([first.average_current], maxlen=convergence_window)
 
-    for region in gen:
-        cumulative_charge += region.charge
-        total_duration += region.duration
+    for charge, duration in charges_and_durations:
+        cumulative_charge += charge
+        total_duration += duration
 
         average_currents.append(cumulative_charge / total_duration)
         if len(average_currents) == convergence_window and all(
@@ -463,6 +537,61 @@ def converged_average_current(
     return average_currents[-1]
 
 
+def steady_state_average_current(
+    session_config: a121.SessionConfig,
+    lower_idle_state: t.Optional[Sensor.LowerIdleState],
+    algorithm: algo.Algorithm = di.DEFAULT_ALGO,
+    sensor: Sensor = di.DEFAULT_SENSOR,
+    module: Module = di.DEFAULT_MODULE,
+) -> float:
+    """
+    Returns the average current of the session once it has run long enough for
+    its start not to matter.
+
+    The session repeats group active and group idle, so this is the average current of
+    one such period.
+    """
+    rate = configured_rate(session_config)
+
+    if rate is None:
+        return group_active(
+            session_config, lower_idle_state, algorithm, sensor, module
+        ).average_current
+    else:
+        (average_current,) = average_current_vs_rate(
+            session_config, lower_idle_state, [rate], algorithm, sensor, module
+        )
+        return float(average_current)
+
+
+def average_current_vs_rate(
+    session_config: a121.SessionConfig,
+    lower_idle_state: t.Optional[Sensor.LowerIdleState],
+    rates: npt.ArrayLike,
+    algorithm: algo.Algorithm = di.DEFAULT_ALGO,
+    sensor: Sensor = di.DEFAULT_SENSOR,
+    module: Module = di.DEFAULT_MODULE,
+) -> npt.NDArray[np.float64]:
+    """
+    Returns the steady state average current (see `steady_state_average_current`)
+    of the session for each update rate in 'rates'.
+
+    Rates that are too high for the session to keep are limited by the duration
+    of group active, like in `session_generator`.
+    """
+    active = group_active(session_config, lower_idle_state, algorithm, sensor, module)
+    idle_current = group_idle(
+        lower_idle_state or algo.last_inter_frame_idle_state(session_config),
+        0.0,
+        sensor=sensor,
+        module=module,
+    ).average_current
+
+    idle_durations = np.maximum(1 / np.asarray(rates, dtype=float) - active.duration, 0.0)
+    charges = active.charge + idle_current * idle_durations
+    return charges / (active.duration + idle_durations)
+
+
 def dump_region(region: domain.EnergyRegion, indent: str = "") -> None:
     if isinstance(region, domain.SimpleRegion):
         print(
@@ -32,6 +32,14 @@ class ExptoolArgumentParser(argparse.ArgumentParser):
                 + "This option can be repeated."
             ),
         )
+        self.add_argument(
+            "--latest-plot-wins",
+            action="store_true",
+            help=(
+                "Only plot the newest result when plotting falls behind, "
+                + "instead of plotting every result."
+            ),
+        )
 
         verbosity_group = self.add_mutually_exclusive_group(required=False)
         verbosity_group.add_argument(
@@ -52,7 +52,7 @@ def main() -> None:
         for plugin_module_name in args.plugin_modules:
             import_and_register_plugin_module(plugin_module_name)
 
-    backend = Backend()
+    backend = Backend(latest_plot_wins=args.latest_plot_wins)
     backend.start()
 
     model = AppModel(backend, load_plugins())
@@ -18,5 +18,6 @@ from ._message import (
     StatusMessage,
 )
 from ._model import Model
+from ._plot_transport import PlotTransport
 from ._rate_calc import _RateCalculator, _RateStats
 from ._tasks import Task, is_task
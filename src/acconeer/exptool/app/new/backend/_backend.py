@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
@@ -17,8 +17,9 @@ import psutil
 from typing_extensions import Literal
 
 from ._backend_logger import BackendLogger
-from ._message import GeneralMessage, Message
+from ._message import GeneralMessage, Message, PlotMessage
 from ._model import Model
+from ._plot_transport import PlotTransport, SharedPlotMessage
 from ._tasks import Task
 
 
@@ -37,19 +38,27 @@ ToBackendQueueItem = Union[
     Tuple[Literal["task"], Tuple[uuid.UUID, Task]],
 ]
 FromBackendQueueItem = Union[Message, ClosedTask]
+_FromBackendQueueItem = Union[FromBackendQueueItem, SharedPlotMessage]
 
 
 class Backend:
-    def __init__(self) -> None:
-        self._recv_queue: mp.Queue[FromBackendQueueItem] = mp.Queue()
+    def __init__(self, *, latest_plot_wins: bool = False) -> None:
+        """
+        :param latest_plot_wins:
+            If True, plot messages that are superseded by newer ones before they are received
+            are dropped. See :class:`PlotTransport`.
+        """
+        self._recv_queue: mp.Queue[_FromBackendQueueItem] = mp.Queue()
         self._send_queue: mp.Queue[ToBackendQueueItem] = mp.Queue()
         self._stop_event = mp.Event()
+        self._plot_transport = PlotTransport(latest_wins=latest_plot_wins)
         self._process = mp.Process(
             target=process_program,
             args=(
                 self._send_queue,
                 self._recv_queue,
                 self._stop_event,
+                self._plot_transport,
             ),
             daemon=True,
         )
@@ -75,6 +84,7 @@ class Backend:
             raise RuntimeError
 
         self._process.close()
+        self._plot_transport.close(unlink=True)
 
     def put_task(self, task: Task) -> uuid.UUID:
         key = uuid.uuid4()
@@ -85,16 +95,34 @@ class Backend:
         self._send_queue.put(item)
 
     def recv(self, timeout: Optional[float] = None) -> FromBackendQueueItem:
-        return self._recv_queue.get(timeout=timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            item = self._recv_queue.get(timeout=remaining)
+
+            if not isinstance(item, SharedPlotMessage):
+                return item
+
+            plot_message = self._plot_transport.unpack(item)
+            if plot_message is not None:
+                return plot_message
 
 
 def process_program(
     recv_queue: mp.Queue[ToBackendQueueItem],
-    send_queue: mp.Queue[FromBackendQueueItem],
+    send_queue: mp.Queue[_FromBackendQueueItem],
     stop_event: mp_EventType,
+    plot_transport: PlotTransport,
 ) -> None:
     MAX_POLL_INTERVAL = 0.5
 
+    def send_message(message: Message) -> None:
+        if isinstance(message, PlotMessage):
+            send_queue.put(plot_transport.pack(message))
+        else:
+            send_queue.put(message)
+
     process = psutil.Process()
     process.cpu_percent()
     last_cpu_msg_time = time.monotonic()
@@ -102,7 +130,7 @@ def process_program(
     try:
         BackendLogger.set_callback(send_queue.put)
         process_log = BackendLogger.getLogger(__name__)
-        model = Model(task_callback=send_queue.put)
+        model = Model(task_callback=send_message)
         model_wants_to_idle = False
 
         while not stop_event.is_set():
@@ -170,3 +198,4 @@ def process_program(
     finally:
         recv_queue.close()
         send_queue.close()
+        plot_transport.close()
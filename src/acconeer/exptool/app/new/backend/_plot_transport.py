@@ -0,0 +1,154 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import pickle
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Tuple
+
+import attrs
+
+from ._message import PlotMessage
+
+
+@attrs.frozen
+class SharedPlotMessage:
+    """A plot message whose large buffers are stored in the ring of a :class:`PlotTransport`"""
+
+    sequence_number: int = attrs.field()
+    pickled: bytes = attrs.field()
+    buffer_spans: Tuple[Tuple[int, int], ...] = attrs.field()
+    """Start and stop offsets in the ring of the out-of-band buffers"""
+    buffers: Tuple[bytearray, ...] = attrs.field()
+    """The out-of-band buffers, if they didn't fit in the ring"""
+    ring_position: int = attrs.field()
+
+
+class PlotTransport:
+    """Moves plot messages from the backend process to the GUI process
+
+    Plot messages are pickled with out-of-band buffers (pickle protocol 5). Buffers of at least
+    ``min_shared_size`` bytes, like the NumPy arrays of processor results, are copied to a ring
+    buffer in shared memory instead of being pickled and sent through the queue. If the ring is
+    full, the buffers are sent through the queue.
+
+    With ``latest_wins``, a plot message that has been superseded by a newer one when it is
+    received is dropped without being unpickled. The GUI then always draws the newest result,
+    instead of working through a backlog.
+
+    The transport is created in the GUI process and passed to the backend process.
+    :meth:`pack` is called in the backend process and :meth:`unpack` in the GUI process, in the
+    order the messages were packed.
+    """
+
+    DEFAULT_CAPACITY = 32 * 2**20
+    DEFAULT_MIN_SHARED_SIZE = 4096
+
+    def __init__(
+        self,
+        *,
+        latest_wins: bool = False,
+        capacity: int = DEFAULT_CAPACITY,
+        min_shared_size: int = DEFAULT_MIN_SHARED_SIZE,
+    ) -> None:
+        self.latest_wins = latest_wins
+        self._capacity = capacity
+        self._min_shared_size = min_shared_size
+        self._shm = shared_memory.SharedMemory(create=True, size=capacity)
+
+        # Positions only increase. The offset into the ring is the position modulo the capacity.
+        # Each value has a single writer, so they are not locked.
+        self._write_position = mp.Value("q", 0, lock=False)
+        self._read_position = mp.Value("q", 0, lock=False)
+        self._latest_sequence_number = mp.Value("q", -1, lock=False)
+
+        self._next_sequence_number = 0
+
+    def pack(self, message: PlotMessage[Any]) -> SharedPlotMessage:
+        """Moves the large buffers of a plot message to shared memory"""
+        buffers: List[memoryview] = []
+
+        def keep_in_band(buffer: pickle.PickleBuffer) -> bool:
+            raw = buffer.raw()
+            if raw.nbytes < self._min_shared_size:
+                return True
+
+            buffers.append(raw)
+            return False
+
+        pickled = pickle.dumps(message, protocol=5, buffer_callback=keep_in_band)
+        buffer_spans = self._write_to_ring(buffers)
+
+        if buffer_spans is None:
+            buffer_spans = ()
+            queued_buffers = tuple(bytearray(buffer) for buffer in buffers)
+        else:
+            queued_buffers = ()
+
+        sequence_number = self._next_sequence_number
+        self._next_sequence_number += 1
+        self._latest_sequence_number.value = sequence_number
+
+        return SharedPlotMessage(
+            sequence_number=sequence_number,
+            pickled=pickled,
+            buffer_spans=buffer_spans,
+            buffers=queued_buffers,
+            ring_position=self._write_position.value,
+        )
+
+    def unpack(self, shared_message: SharedPlotMessage) -> Optional[PlotMessage[Any]]:
+        """Restores a plot message, or returns None if it was superseded in latest wins mode"""
+        try:
+            if (
+                self.latest_wins
+                and shared_message.sequence_number < self._latest_sequence_number.value
+            ):
+                return None
+
+            buffers = [
+                bytearray(self._shm.buf[start:stop]) for start, stop in shared_message.buffer_spans
+            ]
+            buffers.extend(shared_message.buffers)
+            message: PlotMessage[Any] = pickle.loads(shared_message.pickled, buffers=buffers)
+            return message
+        finally:
+            # Messages are unpacked in order, so everything before this message has been read
+            self._read_position.value = shared_message.ring_position
+
+    def close(self, unlink: bool = False) -> None:
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+    def _write_to_ring(self, buffers: List[memoryview]) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """Copies buffers to the ring, or returns None if they don't fit
+
+        :returns: The start and stop offset of each buffer in the ring
+        """
+        position = self._write_position.value
+        read_position = self._read_position.value
+        spans = []
+
+        for buffer in buffers:
+            offset = position % self._capacity
+
+            # Buffers are stored contiguously, so a buffer that doesn't fit before the end of the
+            # ring starts over at its beginning
+            if offset + buffer.nbytes > self._capacity:
+                position += self._capacity - offset
+                offset = 0
+
+            if position + buffer.nbytes - read_position > self._capacity:
+                return None
+
+            spans.append((offset, offset + buffer.nbytes))
+            position += buffer.nbytes
+
+        for (start, stop), buffer in zip(spans, buffers):
+            self._shm.buf[start:stop] = buffer
+
+        self._write_position.value = position
+        return tuple(spans)
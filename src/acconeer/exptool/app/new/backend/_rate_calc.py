@@ -1,10 +1,11 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
 
+import bisect
 import math
-import statistics
+import sys
 import typing as t
 from collections import deque
 
@@ -18,43 +19,89 @@ class _RateStats:
     rate_warning: bool
     jitter: float
     jitter_warning: bool
+    interval_p50: float = math.nan
+    """Median time between results in seconds"""
+    interval_p99: float = math.nan
+    """99th percentile of the time between results in seconds"""
+    dropped_frames: int = 0
+    """Number of frames missing between results since the first result"""
 
     @classmethod
     def invalid(cls) -> te.Self:
         return cls(rate=math.nan, rate_warning=False, jitter=math.nan, jitter_warning=False)
 
 
+_SQRT_BIT_WIDTH = 2 * sys.float_info.mant_dig + 3
+
+
+def _isqrt_rto(numerator: int, denominator: int) -> int:
+    """Integer square root of a fraction, rounded to odd"""
+    root = math.isqrt(numerator // denominator)
+    return root | (root * root * denominator != numerator)
+
+
+def _sqrt_of_fraction(numerator: int, denominator: int) -> float:
+    """Correctly rounded square root of a non-negative fraction of integers
+
+    Same method as ``statistics.pstdev`` uses, see https://bugs.python.org/msg407078
+    """
+    q = (numerator.bit_length() - denominator.bit_length() - _SQRT_BIT_WIDTH) // 2
+    if q >= 0:
+        return float(_isqrt_rto(numerator, denominator << 2 * q) << q)
+    else:
+        return _isqrt_rto(numerator << -2 * q, denominator) / (1 << -q)
+
+
+def _percentile(sorted_values: t.Sequence[int], percent: float) -> float:
+    """Percentile of sorted values with linear interpolation, like ``numpy.percentile``"""
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
 @attrs.mutable
 class _RateCalculator:
     """Stateful class that monitors result rate and jitter.
 
+    The statistics are computed over a sliding window of the latest results, and are updated
+    in constant time (apart from keeping the window sorted for the percentiles).
+
     Since the ``_RateCalculator`` compares time differances between results, the first call
     to ``update`` will "prime" it and will not produce any meaningful statistics.
 
     >>> rc = _RateCalculator(ticks_per_second=1000, tick_period=100)
     >>> rc.update(tick=0, frame_delayed=False)
-    _RateStats(rate=nan, rate_warning=False, jitter=nan, jitter_warning=False)
+    _RateStats(rate=nan, rate_warning=False, jitter=nan, jitter_warning=False, ...)
 
     Once the ``_RateCalculator`` is passed its second result, statistics are meaningful:
 
     >>> rc.update(tick=100, frame_delayed=False)
-    _RateStats(rate=10.0, rate_warning=False, jitter=0.0, jitter_warning=False)
+    _RateStats(rate=10.0, rate_warning=False, jitter=0.0, jitter_warning=False, ...)
 
     Once the passed result aren't exactly equidistant in time, jitter will be non-zero:
 
     >>> rc.update(tick=201, frame_delayed=False)
-    _RateStats(rate=9.95..., rate_warning=False, jitter=0.0005..., jitter_warning=False)
+    _RateStats(rate=9.95..., rate_warning=False, jitter=0.0005..., jitter_warning=False, ...)
 
     If the result has the indication ``frame_delayed``, ``rate_warning`` will always be true.
 
     >>> rc.update(tick=300, frame_delayed=True)
-    _RateStats(rate=10.0, rate_warning=True, jitter=0.0008..., jitter_warning=False)
+    _RateStats(rate=10.0, rate_warning=True, jitter=0.0008..., jitter_warning=False, ...)
 
     If the measured rate or its jitter becomes too large, both warning flag will be
     set to True:
 
     >>> rc.update(tick=600, frame_delayed=False)
-    _RateStats(rate=6.66..., rate_warning=True, jitter=0.08..., jitter_warning=True)
+    _RateStats(rate=6.66..., rate_warning=True, jitter=0.08..., jitter_warning=True, ...)
+
+    The statistics also include percentiles of the time between results and the number of
+    frames that were dropped, judging from the gaps between ticks:
+
+    >>> stats = rc.update(tick=700, frame_delayed=False)
+    >>> stats.interval_p50, stats.interval_p99, stats.dropped_frames
+    (0.1, 0.292..., 2)
     """
 
     _JITTER_WARNING_LIMIT: t.ClassVar[float] = 1.0e-3  # Based on testing
@@ -64,6 +111,13 @@ class _RateCalculator:
 
     ticks: deque[int] = attrs.field(factory=lambda: deque([], maxlen=200), init=False)
 
+    # Running statistics of the tick differences in the window. Ticks are integers, so the sums
+    # are exact and give the same mean and standard deviation as the ``statistics`` module.
+    _diff_sum: int = attrs.field(default=0, init=False)
+    _diff_square_sum: int = attrs.field(default=0, init=False)
+    _sorted_diffs: list[int] = attrs.field(factory=list, init=False)
+    _dropped_frames: int = attrs.field(default=0, init=False)
+
     @property
     def tick_period_upper_bound(self) -> float:
         if self.tick_period == 0:
@@ -76,18 +130,55 @@ class _RateCalculator:
         return [rhs - lhs for lhs, rhs in zip(self.ticks, list(self.ticks)[1:])]
 
     def update(self, tick: int, frame_delayed: bool) -> _RateStats:
+        if len(self.ticks) == self.ticks.maxlen:
+            self._remove_diff(self.ticks[1] - self.ticks[0])
+
+        if len(self.ticks) > 0:
+            self._add_diff(tick - self.ticks[-1])
+
         self.ticks.append(tick)
 
-        if len(self.ticks) < 2:
+        num_diffs = len(self._sorted_diffs)
+        if num_diffs == 0:
             return _RateStats.invalid()
 
-        measured_tick_period = statistics.mean(self.tick_diffs)
+        measured_tick_period = self._diff_sum / num_diffs
         measured_rate = 1.0 / (measured_tick_period / self.ticks_per_second)
         rate_warning = frame_delayed or measured_tick_period > self.tick_period_upper_bound
+        interval_p50 = _percentile(self._sorted_diffs, 50) / self.ticks_per_second
+        interval_p99 = _percentile(self._sorted_diffs, 99) / self.ticks_per_second
 
-        if len(self.tick_diffs) < 2:
-            return _RateStats(measured_rate, rate_warning, jitter=0.0, jitter_warning=False)
+        if num_diffs < 2:
+            jitter_s = 0.0
+            jitter_warning = False
         else:
-            jitter_s = statistics.pstdev(self.tick_diffs) / self.ticks_per_second
+            jitter_s = (
+                _sqrt_of_fraction(
+                    num_diffs * self._diff_square_sum - self._diff_sum**2, num_diffs**2
+                )
+                / self.ticks_per_second
+            )
             jitter_warning = jitter_s > self._JITTER_WARNING_LIMIT
-            return _RateStats(measured_rate, rate_warning, jitter_s, jitter_warning)
+
+        return _RateStats(
+            measured_rate,
+            rate_warning,
+            jitter_s,
+            jitter_warning,
+            interval_p50=interval_p50,
+            interval_p99=interval_p99,
+            dropped_frames=self._dropped_frames,
+        )
+
+    def _add_diff(self, diff: int) -> None:
+        self._diff_sum += diff
+        self._diff_square_sum += diff * diff
+        bisect.insort(self._sorted_diffs, diff)
+
+        if self.tick_period > 0:
+            self._dropped_frames += max(0, round(diff / self.tick_period) - 1)
+
+    def _remove_diff(self, diff: int) -> None:
+        self._diff_sum -= diff
+        self._diff_square_sum -= diff * diff
+        del self._sorted_diffs[bisect.bisect_left(self._sorted_diffs, diff)]
@@ -198,10 +198,9 @@ class _EnergyRegionPlot(QWidget):
             duration=self._state.profile_duration_s,
             algorithm=self._algorithm,
         )
-        approx_avg_current = power.converged_average_current(
+        approx_avg_current = power.steady_state_average_current(
             self._state.session_config,
             lower_idle_state=self._state.lower_idle_state,
-            absolute_tolerance=0.01 * _mA,
             algorithm=self._algorithm,
         )
 
@@ -8,13 +8,18 @@ from pathlib import Path
 import pytest
 
 from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication import MockClient
 from acconeer.exptool.a121.algo.bilateration._plugin import BILATERATION_PLUGIN
+from acconeer.exptool.a121.algo.sparse_iq._plugin import BackendPlugin as SparseIqBackendPlugin
 from acconeer.exptool.a121.algo.speed._detector_plugin import SPEED_DETECTOR_PLUGIN
 from acconeer.exptool.app.new import PluginGeneration, PluginState
 from acconeer.exptool.app.new.app_model import PluginSpec
 from acconeer.exptool.app.new.backend import (
     Backend,
+    BackendLogger,
     GeneralMessage,
+    Message,
+    PlotMessage,
     PluginStateMessage,
     Task,
 )
@@ -52,6 +57,55 @@ class CaptureSaveableFile:
         return received
 
 
+def test_processor_plugin_profiler_times_processing_and_plotting(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    messages: list[Message] = []
+    monkeypatch.setattr(BackendLogger, "_callback", messages.append)
+    plugin = SparseIqBackendPlugin(
+        callback=messages.append, generation=PluginGeneration.A121, key="sparse_iq"
+    )
+    plugin.attach_client(client=MockClient(unthrottled=True))
+    profiler = a121.StageProfiler()
+    plugin.attach_profiler(profiler)
+
+    plugin.start_session(with_recorder=True)
+    for _ in range(3):
+        plugin.idle()
+    plugin.stop_session()
+
+    stats = profiler.stats
+    assert stats["process"].count == 3
+    assert stats["plot_callback"].count == 3
+    assert stats["record"].count == 3
+    assert len([m for m in messages if isinstance(m, PlotMessage)]) == 3
+
+    assert plugin.client is not None
+    assert plugin.client.profiler is None
+    assert plugin.detach_profiler() is profiler
+
+
+def test_processor_plugin_leaves_a_profiler_attached_to_the_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    messages: list[Message] = []
+    monkeypatch.setattr(BackendLogger, "_callback", messages.append)
+    plugin = SparseIqBackendPlugin(
+        callback=messages.append, generation=PluginGeneration.A121, key="sparse_iq"
+    )
+    plugin.attach_client(client=MockClient(unthrottled=True))
+    assert plugin.client is not None
+    client_profiler = a121.StageProfiler()
+    plugin.client.attach_profiler(client_profiler)
+
+    plugin.start_session(with_recorder=True)
+    plugin.idle()
+    plugin.stop_session()
+
+    assert plugin.client.profiler is client_profiler
+    assert client_profiler.stats["record"].count == 1
+
+
 def _plugin_id(p: PluginSpec) -> str:
     return p.key
 
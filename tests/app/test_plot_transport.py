@@ -0,0 +1,87 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+import pytest
+
+from acconeer.exptool.app.new.backend import PlotMessage, PlotTransport
+
+
+@pytest.fixture
+def transport() -> t.Iterator[PlotTransport]:
+    plot_transport = PlotTransport(capacity=10_000, min_shared_size=100)
+    yield plot_transport
+    plot_transport.close(unlink=True)
+
+
+def _plot_message(seed: int, size: int = 400) -> PlotMessage[t.Any]:
+    rng = np.random.default_rng(seed)
+    return PlotMessage(
+        result={
+            "frame": rng.normal(size=size) + 1j * rng.normal(size=size),
+            "small": np.arange(3),
+            "seed": seed,
+        }
+    )
+
+
+def _assert_equal(actual: t.Optional[PlotMessage[t.Any]], expected: PlotMessage[t.Any]) -> None:
+    assert actual is not None
+    assert actual.result.keys() == expected.result.keys()
+    for key, value in expected.result.items():
+        np.testing.assert_array_equal(actual.result[key], value)
+
+
+def test_large_buffers_are_moved_to_shared_memory(transport: PlotTransport) -> None:
+    message = _plot_message(0)
+
+    shared_message = transport.pack(message)
+
+    assert shared_message.buffer_spans == ((0, message.result["frame"].nbytes),)
+    assert len(shared_message.pickled) < 1000
+    _assert_equal(transport.unpack(shared_message), message)
+
+
+def test_ring_wraps_around(transport: PlotTransport) -> None:
+    # Each message takes 6400 bytes, so every other message starts over at the beginning
+    for seed in range(10):
+        message = _plot_message(seed)
+        shared_message = transport.pack(message)
+
+        assert shared_message.buffer_spans != ()
+        _assert_equal(transport.unpack(shared_message), message)
+
+
+def test_falls_back_to_pickling_when_ring_is_full(transport: PlotTransport) -> None:
+    messages = [_plot_message(seed, size=200) for seed in range(5)]
+
+    shared_messages = [transport.pack(message) for message in messages]
+
+    # 3200 bytes per message fit three times in the ring
+    assert [m.buffer_spans != () for m in shared_messages] == [True, True, True, False, False]
+    assert [len(m.buffers) for m in shared_messages] == [0, 0, 0, 1, 1]
+    for shared_message, message in zip(shared_messages, messages):
+        _assert_equal(transport.unpack(shared_message), message)
+
+    # The ring is free again when all messages are read
+    assert transport.pack(_plot_message(5, size=200)).buffer_spans != ()
+
+
+def test_latest_wins_drops_superseded_messages() -> None:
+    transport = PlotTransport(latest_wins=True, capacity=10_000, min_shared_size=100)
+    try:
+        messages = [_plot_message(seed, size=100) for seed in range(3)]
+        shared_messages = [transport.pack(message) for message in messages]
+
+        assert transport.unpack(shared_messages[0]) is None
+        assert transport.unpack(shared_messages[1]) is None
+        _assert_equal(transport.unpack(shared_messages[2]), messages[2])
+
+        message = _plot_message(3, size=100)
+        _assert_equal(transport.unpack(transport.pack(message)), message)
+    finally:
+        transport.close(unlink=True)
@@ -0,0 +1,64 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import math
+import statistics
+import sys
+
+import numpy as np
+import pytest
+
+from acconeer.exptool.app.new.backend import _RateCalculator
+
+
+def _random_ticks(num_ticks: int, tick_period: int) -> list[int]:
+    rng = np.random.default_rng(0)
+    diffs = tick_period + rng.integers(-3, 4, size=num_ticks)
+    # Drop a frame now and then
+    diffs[rng.random(num_ticks) < 0.05] += tick_period
+    return [int(tick) for tick in np.cumsum(diffs)]
+
+
+def test_matches_statistics_over_sliding_window() -> None:
+    tick_period = 1000
+    rate_calculator = _RateCalculator(ticks_per_second=100_000, tick_period=tick_period)
+
+    for tick in _random_ticks(500, tick_period):
+        stats = rate_calculator.update(tick, frame_delayed=False)
+        tick_diffs = rate_calculator.tick_diffs
+        if len(tick_diffs) < 2:
+            continue
+
+        assert stats.rate == 1.0 / (statistics.mean(tick_diffs) / 100_000)
+        expected_jitter = statistics.pstdev(tick_diffs) / 100_000
+        if sys.version_info >= (3, 11):
+            # Earlier versions don't round the standard deviation correctly
+            assert stats.jitter == expected_jitter
+        else:
+            assert stats.jitter == pytest.approx(expected_jitter, rel=1e-15)
+
+        assert stats.interval_p50 == pytest.approx(np.percentile(tick_diffs, 50) / 100_000)
+        assert stats.interval_p99 == pytest.approx(np.percentile(tick_diffs, 99) / 100_000)
+
+    assert len(rate_calculator.ticks) == 200
+
+
+def test_counts_dropped_frames() -> None:
+    rate_calculator = _RateCalculator(ticks_per_second=1000, tick_period=100)
+
+    for tick in [0, 100, 200, 401, 500, 899]:
+        stats = rate_calculator.update(tick, frame_delayed=False)
+
+    assert stats.dropped_frames == 4
+
+
+def test_does_not_count_dropped_frames_without_tick_period() -> None:
+    rate_calculator = _RateCalculator(ticks_per_second=1000, tick_period=0)
+
+    for tick in [0, 100, 500]:
+        stats = rate_calculator.update(tick, frame_delayed=False)
+
+    assert stats.dropped_frames == 0
+    assert not math.isnan(stats.interval_p50)
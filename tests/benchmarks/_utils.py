@@ -0,0 +1,101 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import time
+import typing as t
+from pathlib import Path
+
+import numpy as np
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+from acconeer.exptool.a121._core.entities import ResultContext
+
+
+def best_time(func: t.Callable[[], t.Any], repeat: int = 3) -> float:
+    """Returns the best wall clock time (in seconds) of ``repeat`` calls to ``func``"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def print_table(header: t.Sequence[str], rows: t.Iterable[t.Sequence[t.Any]]) -> None:
+    def fmt(value: t.Any) -> str:
+        return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+    str_rows = [[fmt(v) for v in row] for row in rows]
+    widths = [max(len(s) for s in column) for column in zip(header, *str_rows)]
+
+    for row in [list(header), ["-" * w for w in widths], *str_rows]:
+        print("  ".join(s.rjust(w) for s, w in zip(row, widths)))
+
+
+def synthetic_extended_results(
+    session_config: a121.SessionConfig, num_frames: int, seed: int = 0
+) -> t.Iterator[list[dict[int, a121.Result]]]:
+    """Yields ``num_frames`` extended results with random frame data"""
+    rng = np.random.default_rng(seed)
+    extended_metadata = MockClient._session_config_to_metadata(session_config)
+    contexts = [
+        {
+            sensor_id: ResultContext(
+                metadata=metadata, ticks_per_second=MockClient.TICKS_PER_SECOND
+            )
+            for sensor_id, metadata in group.items()
+        }
+        for group in extended_metadata
+    ]
+
+    for frame_no in range(num_frames):
+        extended_result = []
+        for group in contexts:
+            result_group = {}
+            for sensor_id, context in group.items():
+                frame = np.empty(context.metadata.frame_shape, dtype=INT_16_COMPLEX)
+                frame["real"] = rng.integers(-1000, 1000, size=frame.shape)
+                frame["imag"] = rng.integers(-1000, 1000, size=frame.shape)
+                result_group[sensor_id] = a121.Result(
+                    data_saturated=False,
+                    frame_delayed=False,
+                    calibration_needed=False,
+                    temperature=25,
+                    tick=frame_no * 1000,
+                    frame=frame,
+                    context=context,
+                )
+            extended_result.append(result_group)
+
+        yield extended_result
+
+
+def write_synthetic_record(
+    path: Path,
+    session_config: a121.SessionConfig,
+    num_frames: int,
+    **recorder_kwargs: t.Any,
+) -> Path:
+    """Writes an H5 record with ``num_frames`` frames of random data to ``path``"""
+    recorder = a121.H5Recorder(path, **recorder_kwargs)
+    recorder._start(
+        client_info=a121.ClientInfo._from_open(mock=True),
+        server_info=MockClient.MOCK_SERVER_INFO,
+    )
+    recorder._start_session(
+        config=session_config,
+        metadata=MockClient._session_config_to_metadata(session_config),
+        calibrations=None,
+        calibrations_provided=None,
+    )
+
+    for extended_result in synthetic_extended_results(session_config, num_frames):
+        recorder._sample(extended_result)
+
+    recorder.close()
+    return path
@@ -0,0 +1,92 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the per-frame time of MultiClientWrapper with 1 to 4 devices
+
+Each wrapped client sleeps a fixed read time per frame, like a client waiting for its link.
+Reading the clients one after another is compared with ``concurrent=True``, where each client
+is read from a thread of its own.
+
+Run with ``python -m tests.benchmarks.a111_multiwrap``
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool import a111
+from acconeer.exptool.a111._clients.base import BaseClient
+from acconeer.exptool.a111._clients.multiwrap import MultiClientWrapper
+
+from ._utils import best_time, print_table
+
+
+class _SleepingClient(BaseClient):
+    def __init__(self, read_time: float, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._read_time = read_time
+
+    def _connect(self) -> dict[str, Any]:
+        return {"mock": True}
+
+    def _setup_session(self, config: Any) -> dict[str, Any]:
+        return {}
+
+    def _start_session(self) -> None:
+        pass
+
+    def _get_next(self) -> tuple[list[dict[str, Any]], npt.NDArray[np.float64]]:
+        time.sleep(self._read_time)
+        return [{}], np.zeros((1, 1000))
+
+    def _stop_session(self) -> None:
+        pass
+
+    def _disconnect(self) -> None:
+        pass
+
+    @property
+    def description(self) -> str:
+        return "sleeping"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=50)
+    parser.add_argument("--read-time", type=float, default=0.005)
+    args = parser.parse_args()
+
+    rows = []
+    for num_devices in [1, 2, 3, 4]:
+        config = a111.EnvelopeServiceConfig()
+        config.sensor = list(range(1, num_devices + 1))
+
+        def run(concurrent: bool) -> float:
+            client = MultiClientWrapper(
+                [_SleepingClient(args.read_time) for _ in range(num_devices)],
+                concurrent=concurrent,
+            )
+            client.start_session(config)
+
+            def get_frames() -> None:
+                for _ in range(args.num_frames):
+                    client.get_next()
+
+            frame_time: float = best_time(get_frames) / args.num_frames
+            client.disconnect()
+            return frame_time
+
+        sequential_ms = run(concurrent=False) * 1e3
+        concurrent_ms = run(concurrent=True) * 1e3
+        rows.append((num_devices, sequential_ms, concurrent_ms, sequential_ms / concurrent_ms))
+
+    print_table(["devices", "sequential [ms/frame]", "concurrent [ms/frame]", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the time of recording A111 frames, per frame and for closing the recorder
+
+The previous recorder kept frames in lists, deep-copied the data info of every frame, dropped
+the oldest frame with ``list.pop(0)`` when ``max_len`` was given and built the data array when
+closed. It is compared with the ring buffers of the current recorder, and with recording to an
+HDF5 file.
+
+Run with ``python -m tests.benchmarks.a111_recorder``
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool import a111
+from acconeer.exptool.a111._clients.mock.client import MockClient
+
+from ._utils import print_table
+
+
+class _PreviousRecorder:
+    def __init__(self, max_len: Optional[int]) -> None:
+        self.max_len = max_len
+        self.data: list[npt.NDArray[Any]] = []
+        self.data_info: list[Any] = []
+        self.sample_times: list[float] = []
+
+    def sample(self, data_info: list[dict[str, Any]], data: npt.NDArray[Any]) -> None:
+        self.data.append(data.copy())
+        self.data_info.append(copy.deepcopy(data_info))
+        self.sample_times.append(time.time())
+
+        if self.max_len is not None and len(self.data) > self.max_len:
+            self.data.pop(0)
+            self.data_info.pop(0)
+            self.sample_times.pop(0)
+
+    def close(self) -> None:
+        np.array(self.data)
+        np.array(self.sample_times)
+
+
+def _time_recording(
+    recorder_factory: Callable[[], Any], frames: list[tuple[Any, npt.NDArray[Any]]]
+) -> tuple[float, float]:
+    recorder = recorder_factory()
+
+    start = time.perf_counter()
+    for data_info, data in frames:
+        recorder.sample(data_info, data)
+    sample_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    record = recorder.close()
+    close_time = time.perf_counter() - start
+
+    if record is not None:
+        record.close()
+
+    return sample_time / len(frames), close_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=20_000)
+    parser.add_argument("--max-len", type=int, default=10_000)
+    args = parser.parse_args()
+
+    config = a111.EnvelopeServiceConfig()
+    config.sensor = [1, 2]
+    mocker = MockClient()
+    mocker.squeeze = False
+    session_info = mocker.start_session(config)
+    frames = [mocker.get_next() for _ in range(args.num_frames)]
+
+    def recorder(**kwargs: Any) -> Callable[[], a111.recording.Recorder]:
+        return lambda: a111.recording.Recorder(
+            sensor_config=config, session_info=session_info, **kwargs
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rows = []
+        for name, factory in [
+            ("previous", lambda: _PreviousRecorder(None)),
+            ("ring buffer", recorder()),
+            (f"previous, max_len={args.max_len}", lambda: _PreviousRecorder(args.max_len)),
+            (f"ring buffer, max_len={args.max_len}", recorder(max_len=args.max_len)),
+            ("to file", recorder(path=Path(tmp_dir) / "record.h5")),
+        ]:
+            sample_time, close_time = _time_recording(factory, frames)
+            rows.append((name, sample_time * 1e6, close_time * 1e3))
+
+    print_table(["recorder", "sample [us/frame]", "close [ms]"], rows)
+
+
+if __name__ == "__main__":
+    main()
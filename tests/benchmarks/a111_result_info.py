@@ -0,0 +1,82 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the per-frame time of unpacking and decoding the result info of a stream packet
+
+ResultInfoDecoder is compared with unpacking the result info register by register and looking
+up each register with ``regmap.get_reg`` on every frame, which is how UARTClient used to do it.
+
+Run with ``python -m tests.benchmarks.a111_result_info``
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from acconeer.exptool.a111 import Mode
+from acconeer.exptool.a111._clients.reg import protocol, regmap
+
+from ._utils import best_time, print_table
+
+
+def _result_info_segment(mode: Mode) -> bytes:
+    """Returns a stream data segment with only the result info part"""
+    result_info = bytearray()
+    for reg in regmap.get_data_info_regs(mode):
+        result_info.append(reg.addr)
+        result_info.extend(b"\x00\x00\x00\x00")
+
+    segment = bytearray([protocol.STREAM_RESULT_INFO])
+    segment.extend(len(result_info).to_bytes(2, "little"))
+    segment.extend(result_info)
+    return bytes(segment)
+
+
+def _previous_unpack_result_info(part_data: bytes) -> list[protocol.RegVal]:
+    s = protocol.ADDR_SIZE + protocol.REG_SIZE
+    return [
+        protocol.RegVal(part_data[s * i], part_data[s * i + 1 : s * (i + 1)])
+        for i in range(len(part_data) // s)
+    ]
+
+
+def _previous_decode(result_info: list[protocol.RegVal], mode: Mode) -> dict[str, Any]:
+    info = {}
+    for addr, enc_val in result_info:
+        reg = regmap.get_reg(addr, mode)
+        val = reg.decode(enc_val)
+        k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, reg.stripped_name)
+        if k is not None:
+            info[k] = val
+
+    return info
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = []
+    for mode in [Mode.ENVELOPE, Mode.IQ, Mode.SPARSE]:
+        segment = _result_info_segment(mode)
+        decoder = regmap.ResultInfoDecoder(mode)
+
+        def previous() -> None:
+            for _ in range(args.num_frames):
+                _previous_decode(_previous_unpack_result_info(segment[3:]), mode)
+
+        def decoded() -> None:
+            for _ in range(args.num_frames):
+                decoder.decode(protocol.unpack_stream_data_segment(segment).result_info)
+
+        previous_us = best_time(previous) / args.num_frames * 1e6
+        decoder_us = best_time(decoded) / args.num_frames * 1e6
+        rows.append((mode.name, previous_us, decoder_us, previous_us / decoder_us))
+
+    print_table(["mode", "get_reg [us/frame]", "ResultInfoDecoder [us/frame]", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
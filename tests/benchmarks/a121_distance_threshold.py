@@ -0,0 +1,199 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the threshold computations of the distance Processor
+
+The cumulative sum based CFAR threshold is compared with the convolution based one it replaced,
+and the array-based fixed strength threshold with the point-by-point one.
+
+Run with ``python -m tests.benchmarks.a121_distance_threshold``
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+from acconeer.exptool.a121.algo import (
+    APPROX_BASE_STEP_LENGTH_M,
+    RLG_PER_HWAAS_MAP,
+    ReflectorShape,
+    calc_processing_gain,
+    distance,
+)
+
+from ._utils import best_time, print_table
+
+
+def _convolution_cfar_threshold(
+    abs_sweep: npt.NDArray[np.float_],
+    window_length: int,
+    guard_half_length: int,
+    num_stds: float,
+    abs_noise_std: npt.NDArray[np.float_],
+) -> npt.NDArray[np.float_]:
+    threshold = np.full(abs_sweep.shape, np.nan)
+    margin = window_length + guard_half_length
+    length = abs_sweep.shape[0]
+    sweep_len_without_margins = length - 2 * margin
+    filt_abs_sweep = np.convolve(abs_sweep, np.ones(window_length), "valid") / window_length
+    threshold[margin:-margin] = (
+        filt_abs_sweep[:sweep_len_without_margins] + filt_abs_sweep[-sweep_len_without_margins:]
+    ) / 2
+    threshold += abs_noise_std * num_stds
+    return threshold
+
+
+def _point_by_point_fixed_strength_threshold(
+    processor: distance.Processor,
+    subsweeps: list[a121.SubsweepConfig],
+    bg_noise_std: list[float],
+    reflector_shape: ReflectorShape,
+    strength: float,
+) -> npt.NDArray[np.float_]:
+    distances_m = (
+        processor.start_point_cropped
+        + np.arange(processor.num_points_cropped) * processor.step_length
+    ) * APPROX_BASE_STEP_LENGTH_M
+    processing_gain_db = 10 * np.log10(
+        calc_processing_gain(processor.profile, processor.step_length)
+    )
+    bpts_m = np.array([subsweep.start_point for subsweep in subsweeps]) * APPROX_BASE_STEP_LENGTH_M
+
+    threshold = []
+    for distance_m in distances_m:
+        subsweep_idx = np.sum(bpts_m < distance_m) - 1
+        sigma = bg_noise_std[subsweep_idx]
+        hwaas = subsweeps[subsweep_idx].hwaas
+
+        n_db = 20 * np.log10(sigma)
+        r_db = reflector_shape.exponent * 10 * np.log10(distance_m)
+        rlg_db = RLG_PER_HWAAS_MAP[processor.profile] + 10 * np.log10(hwaas)
+
+        threshold.append(10 ** ((processing_gain_db + n_db + rlg_db - r_db + strength) / 20))
+
+    return np.array(threshold)
+
+
+def _processor(
+    profile: a121.Profile, num_points: int, threshold_method: distance.ThresholdMethod
+) -> distance.Processor:
+    num_subsweeps = 4
+    subsweeps = [
+        a121.SubsweepConfig(
+            start_point=100 + i * num_points // num_subsweeps,
+            num_points=num_points // num_subsweeps,
+            step_length=1,
+            profile=profile,
+            phase_enhancement=True,
+        )
+        for i in range(num_subsweeps)
+    ]
+    sensor_config = a121.SensorConfig(subsweeps=subsweeps)
+    metadata = MockClient._session_config_to_metadata(a121.SessionConfig(sensor_config))[0][1]
+    return distance.Processor(
+        sensor_config=sensor_config,
+        metadata=metadata,
+        processor_config=distance.ProcessorConfig(threshold_method=threshold_method),
+        context=distance.ProcessorContext(bg_noise_std=[10.0] * num_subsweeps),
+    )
+
+
+def _benchmark_cfar(num_sweeps: int) -> None:
+    rng = np.random.default_rng(0)
+    rows = []
+    for profile in [a121.Profile.PROFILE_1, a121.Profile.PROFILE_3, a121.Profile.PROFILE_5]:
+        for num_points in [960, 3840]:
+            processor = _processor(profile, num_points, distance.ThresholdMethod.CFAR)
+            abs_sweeps = rng.uniform(0, 1000, size=(num_sweeps, processor.num_points_cropped))
+
+            def convolution() -> None:
+                for abs_sweep in abs_sweeps:
+                    _convolution_cfar_threshold(
+                        abs_sweep,
+                        processor.window_length,
+                        processor.guard_half_length,
+                        processor.num_stds_in_threshold,
+                        processor.cfar_abs_noise,
+                    )
+
+            def update_threshold() -> None:
+                for abs_sweep in abs_sweeps:
+                    processor._update_threshold(abs_sweep, temperature=25)
+
+            convolution_us = best_time(convolution) / num_sweeps * 1e6
+            update_us = best_time(update_threshold) / num_sweeps * 1e6
+            rows.append(
+                (
+                    profile.name,
+                    processor.window_length,
+                    processor.num_points_cropped,
+                    convolution_us,
+                    update_us,
+                    convolution_us / update_us,
+                )
+            )
+
+    print_table(
+        ["profile", "window", "points", "previous [us]", "CFAR [us]", "speedup"],
+        rows,
+    )
+
+
+def _benchmark_fixed_strength() -> None:
+    rows = []
+    for num_points in [240, 960, 3840]:
+        processor = _processor(
+            a121.Profile.PROFILE_1, num_points, distance.ThresholdMethod.FIXED_STRENGTH
+        )
+        config = processor.processor_config
+        bg_noise_std = processor.context.bg_noise_std
+        assert bg_noise_std is not None
+
+        def point_by_point() -> None:
+            _point_by_point_fixed_strength_threshold(
+                processor,
+                processor.range_subsweep_configs,
+                bg_noise_std,
+                config.reflector_shape,
+                config.fixed_strength_threshold_value,
+            )
+
+        def array_based() -> None:
+            processor._calculate_fixed_strength_threshold(
+                processor.range_subsweep_configs,
+                bg_noise_std,
+                config.reflector_shape,
+                config.fixed_strength_threshold_value,
+            )
+
+        point_by_point_us = best_time(point_by_point) * 1e6
+        array_based_us = best_time(array_based) * 1e6
+        rows.append(
+            (
+                processor.num_points_cropped,
+                point_by_point_us,
+                array_based_us,
+                point_by_point_us / array_based_us,
+            )
+        )
+
+    print_table(["points", "previous [us]", "fixed strength [us]", "speedup"], rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-sweeps", type=int, default=2000)
+    args = parser.parse_args()
+
+    _benchmark_cfar(args.num_sweeps)
+    print()
+    _benchmark_fixed_strength()
+
+
+if __name__ == "__main__":
+    main()
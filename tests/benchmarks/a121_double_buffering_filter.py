@@ -0,0 +1,133 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures double_buffering_frame_filter on frames of different sizes
+
+The array-based filter is compared with the column-by-column filter it replaced.
+
+Run with ``python -m tests.benchmarks.a121_double_buffering_filter``
+"""
+
+from __future__ import annotations
+
+import argparse
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
+from acconeer.exptool.a121.algo import double_buffering_frame_filter
+from acconeer.exptool.a121.algo._utils import MEAN_ABS_DEV_OUTLIER_TH
+
+from ._utils import best_time, print_table
+
+
+def _column_by_column_filter(_frame: npt.NDArray[t.Any]) -> npt.NDArray[np.complex_]:
+    (n_s, n_d) = _frame.shape
+
+    frame_real = _frame["real"]
+    frame_imag = _frame["imag"]
+
+    frame_diff_real = np.zeros((n_s, n_d), dtype=np.int16)
+    frame_diff_imag = np.zeros((n_s, n_d), dtype=np.int16)
+    frame_diff_real[1:-1, :] = np.diff(frame_real, axis=0, n=2)
+    frame_diff_imag[1:-1, :] = np.diff(frame_imag, axis=0, n=2)
+    frame_diff_abs = np.abs(frame_diff_real) + np.abs(frame_diff_imag)
+    frame_diff_mad = np.sum(frame_diff_abs, axis=0) // (n_s - 2)
+    threshold = MEAN_ABS_DEV_OUTLIER_TH * frame_diff_mad
+    outliers = frame_diff_abs > threshold
+
+    filtered_frame_real = frame_real.copy()
+    filtered_frame_imag = frame_imag.copy()
+    for d in range(n_d):
+        if np.any(outliers[:, d]):
+            args = np.where(outliers[:, d])[0]
+            for idx in args:
+                if idx <= 1:
+                    filtered_frame_real[idx, d] = np.median(filtered_frame_real[idx : idx + 4, d])
+                    filtered_frame_imag[idx, d] = np.median(filtered_frame_imag[idx : idx + 4, d])
+                elif idx >= n_s - 2:
+                    filtered_frame_real[idx, d] = np.median(filtered_frame_real[idx - 3 : idx, d])
+                    filtered_frame_imag[idx, d] = np.median(filtered_frame_imag[idx - 3 : idx, d])
+                else:
+                    filtered_frame_real[idx, d] = int(
+                        (
+                            2 * filtered_frame_real[max(idx - 1, 0), d]
+                            + filtered_frame_real[min(idx + 2, n_s - 1), d]
+                        )
+                        / 3
+                    )
+                    filtered_frame_imag[idx, d] = int(
+                        (
+                            2 * filtered_frame_imag[max(idx - 1, 0), d]
+                            + filtered_frame_imag[min(idx + 2, n_s - 1), d]
+                        )
+                        / 3
+                    )
+
+    filtered_frame = np.empty((n_s, n_d), dtype=np.complex_)
+    filtered_frame.real = filtered_frame_real
+    filtered_frame.imag = filtered_frame_imag
+
+    return filtered_frame
+
+
+def _frame(num_sweeps: int, num_points: int, seed: int = 0) -> npt.NDArray[t.Any]:
+    """Slowly varying frame, disturbed in about one sweep out of 16, like double buffering"""
+    rng = np.random.default_rng(seed)
+    phase = np.linspace(0, 4 * np.pi, num_sweeps)[:, None] + rng.uniform(0, 2 * np.pi, num_points)
+    frame = np.empty((num_sweeps, num_points), dtype=INT_16_COMPLEX)
+    frame["real"] = 1000 * np.cos(phase) + rng.normal(0, 10, frame.shape)
+    frame["imag"] = 1000 * np.sin(phase) + rng.normal(0, 10, frame.shape)
+
+    disturbed = rng.choice(num_sweeps, size=max(1, num_sweeps // 16), replace=False)
+    frame["real"][disturbed] += rng.integers(200, 400, size=(len(disturbed), num_points))
+    return frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rows = []
+    for num_sweeps in [32, 128, 512, 2048]:
+        for num_points in [1, 20, 200]:
+            frame = _frame(num_sweeps, num_points)
+            num_outliers = np.count_nonzero(
+                double_buffering_frame_filter(frame) != frame["real"] + 1j * frame["imag"]
+            )
+
+            # Keep the slow filter from running for too long on the largest frames
+            single_run = best_time(lambda: _column_by_column_filter(frame), repeat=1)
+            num_runs = max(1, min(100, int(args.max_duration / single_run)))
+
+            def column_by_column() -> None:
+                for _ in range(num_runs):
+                    _column_by_column_filter(frame)
+
+            def array_based() -> None:
+                for _ in range(num_runs):
+                    double_buffering_frame_filter(frame)
+
+            column_us = best_time(column_by_column) / num_runs * 1e6
+            array_us = best_time(array_based) / num_runs * 1e6
+            rows.append(
+                (
+                    f"{num_sweeps} x {num_points}",
+                    num_outliers,
+                    column_us,
+                    array_us,
+                    column_us / array_us,
+                )
+            )
+
+    print_table(
+        ["sweeps x points", "outliers", "column by column [us]", "array based [us]", "speedup"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
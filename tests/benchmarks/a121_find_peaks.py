@@ -0,0 +1,146 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the peak search and interpolation of the distance processor on long sweeps
+
+The vectorized find_peaks and interpolate_peaks are compared with the point-by-point search and
+per-peak interpolation they replaced, and find_peaks_mask is also run on many sweeps at once.
+
+Run with ``python -m tests.benchmarks.a121_find_peaks``
+"""
+
+from __future__ import annotations
+
+import argparse
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool.a121.algo import (
+    find_peaks,
+    find_peaks_mask,
+    interpolate_peaks,
+    interpolate_peaks_array,
+)
+
+from ._utils import best_time, print_table
+
+
+def _find_peaks_loop(
+    abs_sweep: npt.NDArray[np.float_], threshold: npt.NDArray[np.float_]
+) -> list[int]:
+    found_peaks = []
+    d = 1
+    N = len(abs_sweep)
+    while d < (N - 1):
+        if np.isnan(threshold[d - 1]):
+            d += 1
+            continue
+        if np.isnan(threshold[d + 1]):
+            break
+        if abs_sweep[d] <= threshold[d]:
+            d += 2
+            continue
+        if abs_sweep[d - 1] <= threshold[d - 1]:
+            d += 1
+            continue
+        if abs_sweep[d - 1] >= abs_sweep[d]:
+            d += 1
+            continue
+        d_upper = d + 1
+        while True:
+            if (d_upper) >= (N - 1):
+                break
+            if np.isnan(threshold[d_upper]):
+                break
+            if abs_sweep[d_upper] <= threshold[d_upper]:
+                break
+            if abs_sweep[d_upper] > abs_sweep[d]:
+                break
+            elif abs_sweep[d_upper] < abs_sweep[d]:
+                found_peaks.append(int(np.argmax(abs_sweep[d:d_upper]) + d))
+                break
+            else:
+                d_upper += 1
+        d = d_upper
+    return found_peaks
+
+
+def _interpolate_peaks_loop(abs_sweep: npt.NDArray[np.float_], peak_idxs: list[int]) -> None:
+    for peak_idx in peak_idxs:
+        x = np.arange(peak_idx - 1, peak_idx + 2, 1)
+        y = abs_sweep[peak_idx - 1 : peak_idx + 2]
+        a = (x[0] * (y[2] - y[1]) + x[1] * (y[0] - y[2]) + x[2] * (y[1] - y[0])) / (
+            (x[0] - x[1]) * (x[0] - x[2]) * (x[1] - x[2])
+        )
+        b = (y[1] - y[0]) / (x[1] - x[0]) - a * (x[0] + x[1])
+        c = y[0] - a * x[0] ** 2 - b * x[0]
+        peak_loc = -b / (2 * a)
+        _ = a * peak_loc**2 + b * peak_loc + c
+
+
+def _sweeps(
+    num_sweeps: int, num_points: int, seed: int = 0
+) -> t.Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]:
+    """Smoothed noise with a NaN threshold at the edges, like a CFAR threshold"""
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(size=(num_sweeps, num_points + 10))
+    abs_sweeps = np.abs(np.apply_along_axis(np.convolve, 1, noise, np.hanning(11), "valid"))
+    threshold = np.full(num_points, np.median(abs_sweeps))
+    threshold[:20] = np.nan
+    threshold[-20:] = np.nan
+    return abs_sweeps, threshold
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-sweeps", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for num_points in [100, 1000, 5000]:
+        abs_sweeps, threshold = _sweeps(args.num_sweeps, num_points)
+        num_peaks = np.count_nonzero(find_peaks_mask(abs_sweeps, threshold))
+
+        def loop() -> None:
+            for abs_sweep in abs_sweeps:
+                _interpolate_peaks_loop(abs_sweep, _find_peaks_loop(abs_sweep, threshold))
+
+        def vectorized() -> None:
+            for abs_sweep in abs_sweeps:
+                interpolate_peaks(abs_sweep, find_peaks(abs_sweep, threshold), 0, 1, 2.5e-3)
+
+        def batched() -> None:
+            peak_idxs = np.nonzero(find_peaks_mask(abs_sweeps, threshold))
+            interpolate_peaks_array(abs_sweeps, peak_idxs, 0, 1, 2.5e-3)
+
+        loop_us = best_time(loop) / args.num_sweeps * 1e6
+        vectorized_us = best_time(vectorized) / args.num_sweeps * 1e6
+        batched_us = best_time(batched) / args.num_sweeps * 1e6
+        rows.append(
+            (
+                num_points,
+                num_peaks / args.num_sweeps,
+                loop_us,
+                vectorized_us,
+                loop_us / vectorized_us,
+                batched_us,
+            )
+        )
+
+    print_table(
+        [
+            "points",
+            "peaks",
+            "loop [us/sweep]",
+            "vectorized [us/sweep]",
+            "speedup",
+            "batched [us/sweep]",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
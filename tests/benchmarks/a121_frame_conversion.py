@@ -0,0 +1,94 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the conversion of int16 complex frames to complex floats
+
+Compares the previous conversion (two float64 temporaries), the fused conversion to complex128
+and complex64, and repeated access to the cached ``Result.frame``.
+
+Run with ``python -m tests.benchmarks.a121_frame_conversion``
+"""
+
+from __future__ import annotations
+
+import argparse
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX, int16_complex_array_to_complex
+from acconeer.exptool.a121._core.communication import MockClient
+
+from ._utils import best_time, print_table
+
+
+def _previous_conversion(array: npt.NDArray[t.Any]) -> npt.NDArray[np.complex_]:
+    real = array["real"].astype("float")
+    imaginary = array["imag"].astype("float")
+    return real + 1.0j * imaginary  # type: ignore[no-any-return]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--reads-per-frame", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for shape in [(1, 160), (32, 100), (64, 500)]:
+        frame = np.empty(shape, dtype=INT_16_COMPLEX)
+        frame["real"] = rng.integers(-1000, 1000, size=shape)
+        frame["imag"] = rng.integers(-1000, 1000, size=shape)
+
+        def previous() -> None:
+            for _ in range(args.repeat):
+                _previous_conversion(frame)
+
+        def fused() -> None:
+            for _ in range(args.repeat):
+                int16_complex_array_to_complex(frame)
+
+        def fused_complex64() -> None:
+            for _ in range(args.repeat):
+                int16_complex_array_to_complex(frame, dtype=np.complex64)
+
+        previous_us = best_time(previous) / args.repeat * 1e6
+        fused_us = best_time(fused) / args.repeat * 1e6
+        complex64_us = best_time(fused_complex64) / args.repeat * 1e6
+        rows.append((f"{shape[0]}x{shape[1]}", previous_us, fused_us, complex64_us))
+
+    print_table(["frame", "previous [us]", "fused [us]", "fused complex64 [us]"], rows)
+    print()
+
+    client = MockClient(unthrottled=True)
+    client.setup_session(a121.SensorConfig(num_points=100, sweeps_per_frame=32))
+    client.start_session()
+    results = [client.get_next() for _ in range(args.repeat)]
+    client.close()
+
+    def read_frames() -> None:
+        for result in results:
+            assert isinstance(result, a121.Result)
+            for _ in range(args.reads_per_frame):
+                result.frame
+
+    def read_frames_uncached() -> None:
+        for result in results:
+            assert isinstance(result, a121.Result)
+            for _ in range(args.reads_per_frame):
+                _previous_conversion(result._frame)
+
+    print_table(
+        [f"{args.reads_per_frame} reads of a 32x100 frame", "us/frame"],
+        [
+            ("converted on every read", best_time(read_frames_uncached) / args.repeat * 1e6),
+            ("Result.frame (cached)", best_time(read_frames, repeat=1) / args.repeat * 1e6),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
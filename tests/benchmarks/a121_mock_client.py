@@ -0,0 +1,68 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures how fast an unthrottled MockClient produces frames
+
+Run with ``python -m tests.benchmarks.a121_mock_client``
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication import MockClient
+
+from ._utils import best_time, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    session_configs = {
+        "1x160 points, 1 spf": a121.SessionConfig(a121.SensorConfig(num_points=160)),
+        "1x100 points, 32 spf": a121.SessionConfig(
+            a121.SensorConfig(num_points=100, sweeps_per_frame=32)
+        ),
+        "4 subsweeps, 8 spf": a121.SessionConfig(
+            a121.SensorConfig(
+                sweeps_per_frame=8,
+                subsweeps=[a121.SubsweepConfig(num_points=100) for _ in range(4)],
+            )
+        ),
+        "4 sensors, 16 spf": a121.SessionConfig(
+            {
+                sensor_id: a121.SensorConfig(num_points=80, sweeps_per_frame=16)
+                for sensor_id in range(1, 5)
+            }
+        ),
+    }
+
+    rows = []
+    for name, session_config in session_configs.items():
+        client = MockClient(unthrottled=True)
+        client.setup_session(session_config)
+        client.start_session()
+
+        def get_frames() -> None:
+            for _ in range(args.num_frames):
+                client.get_next()
+
+        def get_batches() -> None:
+            for _ in range(args.num_frames // args.batch_size):
+                client.get_next_batch(args.batch_size)
+
+        duration = best_time(get_frames)
+        batch_duration = best_time(get_batches)
+        client.close()
+
+        rows.append((name, args.num_frames / duration, args.num_frames / batch_duration))
+
+    print_table(["session", "get_next frames/s", "get_next_batch frames/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
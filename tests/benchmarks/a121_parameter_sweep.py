@@ -0,0 +1,93 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures how long it takes to evaluate a grid of presence processor configs on a recording
+
+run_parameter_sweep is compared with replaying the recording through _ReplayingClient once per
+config and processing it frame by frame, which is how configs used to be tuned offline.
+
+Run with ``python -m tests.benchmarks.a121_parameter_sweep``
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import typing as t
+from pathlib import Path
+
+import attrs
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121.algo import presence, run_parameter_sweep
+from acconeer.exptool.a121.algo.presence._configs import get_medium_range_config
+
+from ._utils import best_time, print_table, write_synthetic_record
+
+
+def _summarize(processor_results: list[presence.ProcessorResult]) -> dict[str, t.Any]:
+    return {"num_detections": sum(bool(r.presence_detected) for r in processor_results)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=2000)
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    base_processor_config = presence.Detector._get_processor_config(get_medium_range_config())
+    sensor_config = presence.Detector._get_sensor_config(get_medium_range_config())
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_synthetic_record(
+            Path(tmp_dir) / "record.h5", a121.SessionConfig(sensor_config), args.num_frames
+        )
+
+        for num_thresholds in [2, 8, 32]:
+            grid = {
+                "inter_detection_threshold": [0.5 + 0.1 * i for i in range(num_thresholds)],
+                "inter_phase_boost": [False, True],
+            }
+            num_configs = 2 * num_thresholds
+
+            def replay() -> None:
+                with a121.open_record(path) as record:
+                    for threshold in grid["inter_detection_threshold"]:
+                        for phase_boost in grid["inter_phase_boost"]:
+                            client = a121._ReplayingClient(record, realtime_replay=False)
+                            client.start_session()
+                            processor = presence.Processor(
+                                sensor_config=sensor_config,
+                                metadata=record.metadata,
+                                processor_config=attrs.evolve(
+                                    base_processor_config,
+                                    inter_detection_threshold=threshold,
+                                    inter_phase_boost=phase_boost,
+                                ),
+                            )
+                            processor_results = []
+                            for _ in range(record.num_frames):
+                                processor_results.append(processor.process(client.get_next()))
+                            client.stop_session()
+                            _summarize(processor_results)
+
+            def sweep() -> None:
+                run_parameter_sweep(
+                    path,
+                    presence.Processor,
+                    base_processor_config,
+                    grid,
+                    _summarize,
+                    max_workers=args.max_workers,
+                )
+
+            replay_s = best_time(replay, repeat=1)
+            sweep_s = best_time(sweep, repeat=1)
+            rows.append((num_configs, replay_s, sweep_s, replay_s / sweep_s))
+
+    print_table(["configs", "replay per config [s]", "run_parameter_sweep [s]", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures how long it takes to compute the current vs rate curves of the resource tab
+
+average_current_vs_rate is compared with calling converged_average_current once per rate,
+which is how the curves used to be computed. The cache of group_active is cleared before
+each of those calls, like when the regions were recomputed on every call.
+
+Run with ``python -m tests.benchmarks.a121_power_model``
+"""
+
+from __future__ import annotations
+
+import copy
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121.model import power
+from acconeer.exptool.a121.model.power import api
+
+from ._utils import best_time, print_table
+
+
+def _session_config(num_groups: int) -> a121.SessionConfig:
+    return a121.SessionConfig(
+        [
+            {
+                1: a121.SensorConfig(
+                    sweeps_per_frame=8, inter_frame_idle_state=a121.IdleState.SLEEP
+                ),
+                2: a121.SensorConfig(profile=a121.Profile.PROFILE_3),
+            }
+            for _ in range(num_groups)
+        ],
+        update_rate=10.0,
+    )
+
+
+def main() -> None:
+    rates = [i / 10 for i in range(1, 150)]
+    lower_idle_states = [None, power.Sensor.IdleState.HIBERNATE, power.Sensor.IdleState.OFF]
+
+    rows = []
+    for num_groups in [1, 4]:
+        config = _session_config(num_groups)
+
+        def per_rate() -> None:
+            for lower_idle_state in lower_idle_states:
+                for rate in rates:
+                    evolved_config = copy.deepcopy(config)
+                    evolved_config.update_rate = rate
+                    api._group_active.cache_clear()
+                    power.converged_average_current(
+                        evolved_config, lower_idle_state, absolute_tolerance=1e-3
+                    )
+
+        def vectorized() -> None:
+            api._group_active.cache_clear()
+            for lower_idle_state in lower_idle_states:
+                power.average_current_vs_rate(config, lower_idle_state, rates)
+
+        per_rate_s = best_time(per_rate)
+        vectorized_s = best_time(vectorized)
+        rows.append((num_groups, per_rate_s * 1e3, vectorized_s * 1e3, per_rate_s / vectorized_s))
+
+    print_table(
+        ["groups", "converged per rate [ms]", "average_current_vs_rate [ms]", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the per-frame cost of processing stacked results in batches
+
+``Processor.process_batch`` is compared with calling ``Processor.process`` once per frame,
+for the processors that compute their per-frame stages for many frames at once.
+
+Run with ``python -m tests.benchmarks.a121_process_batch``
+"""
+
+from __future__ import annotations
+
+import argparse
+import typing as t
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+from acconeer.exptool.a121.algo import distance, phase_tracking, presence, sparse_iq, vibration
+from acconeer.exptool.a121.algo.presence._configs import get_medium_range_config
+from acconeer.exptool.a121.algo.vibration._example_app import ExampleApp, ExampleAppConfig
+
+from ._utils import best_time, print_table, synthetic_extended_results
+
+
+ProcessorFactory = t.Callable[[a121.SessionConfig, a121.Metadata], t.Any]
+
+
+def _presence(phase_boost: bool) -> t.Tuple[a121.SensorConfig, ProcessorFactory]:
+    detector_config = get_medium_range_config()
+    detector_config.inter_phase_boost = phase_boost
+    detector_config.inter_frame_presence_timeout = 0
+
+    def factory(session_config: a121.SessionConfig, metadata: a121.Metadata) -> t.Any:
+        return presence.Processor(
+            sensor_config=session_config.sensor_config,
+            metadata=metadata,
+            processor_config=presence.Detector._get_processor_config(detector_config),
+        )
+
+    return presence.Detector._get_sensor_config(detector_config), factory
+
+
+def _distance() -> t.Tuple[a121.SensorConfig, ProcessorFactory]:
+    def factory(session_config: a121.SessionConfig, metadata: a121.Metadata) -> t.Any:
+        return distance.Processor(
+            sensor_config=session_config.sensor_config,
+            metadata=metadata,
+            processor_config=distance.ProcessorConfig(),
+        )
+
+    return (
+        a121.SensorConfig(num_points=200, sweeps_per_frame=8, phase_enhancement=True),
+        factory,
+    )
+
+
+def _phase_tracking() -> t.Tuple[a121.SensorConfig, ProcessorFactory]:
+    def factory(session_config: a121.SessionConfig, metadata: a121.Metadata) -> t.Any:
+        return phase_tracking.Processor(
+            sensor_config=session_config.sensor_config,
+            metadata=metadata,
+            processor_config=phase_tracking.ProcessorConfig(),
+        )
+
+    return phase_tracking.get_sensor_config(), factory
+
+
+def _sparse_iq() -> t.Tuple[a121.SensorConfig, ProcessorFactory]:
+    def factory(session_config: a121.SessionConfig, metadata: a121.Metadata) -> t.Any:
+        return sparse_iq.Processor(
+            session_config=session_config, processor_config=sparse_iq.ProcessorConfig()
+        )
+
+    return sparse_iq.get_sensor_config(), factory
+
+
+def _vibration() -> t.Tuple[a121.SensorConfig, ProcessorFactory]:
+    app_config = ExampleAppConfig()
+
+    def factory(session_config: a121.SessionConfig, metadata: a121.Metadata) -> t.Any:
+        return vibration.Processor(
+            sensor_config=session_config.sensor_config,
+            metadata=metadata,
+            processor_config=ExampleApp._get_processor_config(app_config),
+        )
+
+    return ExampleApp._get_sensor_config(app_config), factory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    rows = []
+    for name, (sensor_config, factory) in [
+        ("presence", _presence(phase_boost=False)),
+        ("presence, phase boost", _presence(phase_boost=True)),
+        ("distance", _distance()),
+        ("phase tracking", _phase_tracking()),
+        ("sparse iq", _sparse_iq()),
+        ("vibration", _vibration()),
+    ]:
+        session_config = a121.SessionConfig(sensor_config)
+        extended_results = list(synthetic_extended_results(session_config, args.num_frames))
+        results = [extended_result[0][1] for extended_result in extended_results]
+        stacked_results = a121.StackedResults.from_results(results)
+        metadata = MockClient._session_config_to_metadata(session_config)[0][1]
+        extended = name == "sparse iq"
+
+        def process() -> None:
+            processor = factory(session_config, metadata)
+            for extended_result, result in zip(extended_results, results):
+                processor.process(extended_result if extended else result)
+
+        def process_batch() -> None:
+            processor = factory(session_config, metadata)
+            for start in range(0, args.num_frames, args.batch_size):
+                batch = stacked_results[start : start + args.batch_size]
+                processor.process_batch([{1: batch}] if extended else batch)
+
+        process_us = best_time(process) / args.num_frames * 1e6
+        batch_us = best_time(process_batch) / args.num_frames * 1e6
+        rows.append((name, process_us, batch_us, process_us / batch_us))
+
+    print_table(
+        [
+            "processor",
+            "process [us/frame]",
+            f"process_batch({args.batch_size}) [us/frame]",
+            "speedup",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the throughput, latency and memory use of the algorithms on recorded data
+
+Every algorithm factory and recording of ``test_input_output`` in
+``tests/processing/test_processing.py`` is run frame by frame. For each of them, the frames per
+second, percentiles of the per-frame latency and the peak memory allocated while processing are
+measured. The real-time factor is the frames per second divided by the frame rate of the
+recording, and tells how much headroom the algorithm has at the rate it was recorded at.
+
+The results can be saved as a baseline and compared with later runs. A run fails if the frames
+per second, the 99th percentile latency or the peak memory is worse than the baseline by more
+than the tolerance. Baselines depend on the machine, so only compare with baselines saved on
+the same machine.
+
+Run with ``python -m tests.benchmarks.a121_processing``
+
+Save a baseline with ``--save-baseline baseline.json`` and compare with it with
+``--baseline baseline.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.resources
+import json
+import sys
+import time
+import tracemalloc
+import typing as t
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core import utils as core_utils
+
+from tests.processing.a121 import data_files
+from tests.processing.test_processing import (
+    INPUT_OUTPUT_CASES,
+    AlgorithmFactory,
+    process_record,
+)
+
+from ._utils import print_table
+
+
+# Metrics that are compared with the baseline and whether a higher value is better
+_COMPARED_METRICS = {
+    "fps": True,
+    "latency_p99_ms": False,
+    "peak_memory_mb": False,
+}
+
+
+def _case_name(algorithm_factory: AlgorithmFactory, resource_name: str) -> str:
+    return f"{algorithm_factory.__name__}/{resource_name}"
+
+
+def _recorded_frame_rate(r: a121.H5Record) -> float:
+    (first_stacked_results, *_) = core_utils.iterate_extended_structure_values(
+        r.session(0).extended_stacked_results
+    )
+    tick_period = np.median(np.diff(first_stacked_results.tick))
+    return float(r.server_info.ticks_per_second / tick_period)
+
+
+def _measure_latencies(algorithm_factory: AlgorithmFactory, path: Path) -> t.List[float]:
+    """Returns the time it takes to process each frame of the record in seconds"""
+    with h5py.File(path) as f:
+        r = a121.H5Record(f)
+        results = process_record(algorithm_factory(r), r)
+
+        latencies = []
+        while True:
+            start = time.perf_counter()
+            try:
+                next(results)
+            except StopIteration:
+                break
+            latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def _measure_peak_memory(algorithm_factory: AlgorithmFactory, path: Path) -> int:
+    """Returns the peak memory allocated while processing the record in bytes"""
+    with h5py.File(path) as f:
+        r = a121.H5Record(f)
+        algorithm = algorithm_factory(r)
+
+        tracemalloc.start()
+        try:
+            for _ in process_record(algorithm, r):
+                pass
+            (_, peak) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return peak
+
+
+def _benchmark_case(
+    algorithm_factory: AlgorithmFactory, path: Path, repeat: int
+) -> t.Dict[str, float]:
+    runs = [np.array(_measure_latencies(algorithm_factory, path)) for _ in range(repeat)]
+    fastest_run = min(runs, key=np.sum)
+    latencies = np.concatenate(runs)
+
+    with h5py.File(path) as f:
+        recorded_frame_rate = _recorded_frame_rate(a121.H5Record(f))
+
+    fps = len(fastest_run) / float(np.sum(fastest_run))
+    return {
+        "frames": len(fastest_run),
+        "fps": fps,
+        "latency_p50_ms": float(np.percentile(latencies, 50)) * 1e3,
+        "latency_p99_ms": float(np.percentile(latencies, 99)) * 1e3,
+        "latency_max_ms": float(np.max(latencies)) * 1e3,
+        "peak_memory_mb": _measure_peak_memory(algorithm_factory, path) / 2**20,
+        "recorded_frame_rate": recorded_frame_rate,
+        "realtime_factor": fps / recorded_frame_rate,
+    }
+
+
+def run_benchmarks(name_filter: str = "", repeat: int = 1) -> t.Dict[str, t.Dict[str, float]]:
+    """Returns the metrics of each algorithm and recording, keyed on their names"""
+    all_metrics = {}
+    for algorithm_factory, _, resource_name in INPUT_OUTPUT_CASES:
+        name = _case_name(algorithm_factory, resource_name)
+        if name_filter not in name:
+            continue
+
+        with importlib.resources.path(data_files.recorded_data, resource_name) as path:
+            all_metrics[name] = _benchmark_case(algorithm_factory, path, repeat)
+
+    return all_metrics
+
+
+def find_regressions(
+    all_metrics: t.Mapping[str, t.Mapping[str, float]],
+    baseline: t.Mapping[str, t.Mapping[str, float]],
+    tolerance: float,
+) -> t.List[t.Tuple[str, str, float, float, str]]:
+    """Returns the metrics that are worse than the baseline by more than the relative tolerance
+
+    :returns: The name, metric, baseline value, measured value and relative change of each
+        regression
+    """
+    regressions = []
+    for name, metrics in all_metrics.items():
+        if name not in baseline:
+            continue
+
+        for metric, higher_is_better in _COMPARED_METRICS.items():
+            baseline_value = baseline[name][metric]
+            value = metrics[metric]
+            change = value / baseline_value - 1
+
+            if (higher_is_better and change < -tolerance) or (
+                not higher_is_better and change > tolerance
+            ):
+                regressions.append((name, metric, baseline_value, value, f"{change:+.1%}"))
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative change from the baseline that is reported as a regression",
+    )
+    args = parser.parse_args()
+
+    all_metrics = run_benchmarks(args.filter, args.repeat)
+
+    print_table(
+        ["case", "fps", "p50 [ms]", "p99 [ms]", "max [ms]", "peak [MB]", "real-time factor"],
+        [
+            (
+                name,
+                m["fps"],
+                m["latency_p50_ms"],
+                m["latency_p99_ms"],
+                m["latency_max_ms"],
+                m["peak_memory_mb"],
+                m["realtime_factor"],
+            )
+            for name, m in all_metrics.items()
+        ],
+    )
+
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(all_metrics, indent=2, sort_keys=True))
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+
+        missing = sorted(set(all_metrics) - set(baseline))
+        if missing:
+            print("\nNot in the baseline:\n" + "\n".join(f"  {name}" for name in missing))
+
+        regressions = find_regressions(all_metrics, baseline, args.tolerance)
+        if regressions:
+            print(
+                f"\n{len(regressions)} regression(s) over the tolerance of {args.tolerance:.0%}:"
+            )
+            print_table(["case", "metric", "baseline", "measured", "change"], regressions)
+            sys.exit(1)
+        else:
+            print(f"\nNo regressions over the tolerance of {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
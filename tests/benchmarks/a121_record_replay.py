@@ -0,0 +1,97 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Compares per-frame and block-wise replay of H5 records
+
+Run with ``python -m tests.benchmarks.a121_record_replay``
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import typing as t
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.recording.h5_record.record import H5SessionRecord
+
+from ._utils import best_time, print_table, write_synthetic_record
+
+
+def _per_frame_extended_results(
+    session: H5SessionRecord,
+) -> t.Iterator[list[dict[int, a121.Result]]]:
+    """The replay strategy used before block-wise reading, kept as reference"""
+
+    for frame_no in range(session.num_frames):
+
+        def entry_group_to_result(entry_group: h5py.Group) -> a121.Result:
+            return a121.Result(
+                data_saturated=entry_group["result/data_saturated"][frame_no],
+                frame_delayed=entry_group["result/frame_delayed"][frame_no],
+                calibration_needed=entry_group["result/calibration_needed"][frame_no],
+                temperature=entry_group["result/temperature"][frame_no],
+                tick=entry_group["result/tick"][frame_no],
+                frame=np.array(entry_group["result/frame"][frame_no]),
+                context=session._get_result_context_for_entry_group(entry_group),
+            )
+
+        yield session._map_over_entries(entry_group_to_result)
+
+
+def _consume(it: t.Iterator[t.Any]) -> None:
+    for _ in it:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=2000)
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[1, 16, 256, 1024])
+    args = parser.parse_args()
+
+    session_configs = {
+        "1 entry": a121.SessionConfig(a121.SensorConfig(num_points=160, sweeps_per_frame=8)),
+        "4 entries": a121.SessionConfig(
+            [
+                {1: a121.SensorConfig(num_points=160), 2: a121.SensorConfig(num_points=160)},
+                {1: a121.SensorConfig(num_points=40), 2: a121.SensorConfig(num_points=40)},
+            ]
+        ),
+    }
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, session_config in session_configs.items():
+            path = write_synthetic_record(
+                Path(tmp_dir) / f"{name}.h5", session_config, args.num_frames
+            )
+
+            with a121.open_record(path) as record:
+                session = record.session(0)
+
+                per_frame = best_time(lambda: _consume(_per_frame_extended_results(session)))
+                rows.append((name, "per frame", args.num_frames / per_frame, 1.0))
+
+                for block_size in args.block_sizes:
+                    blocked = best_time(
+                        lambda: _consume(session.iter_extended_results(block_size=block_size))
+                    )
+                    rows.append(
+                        (
+                            name,
+                            f"block_size={block_size}",
+                            args.num_frames / blocked,
+                            per_frame / blocked,
+                        )
+                    )
+
+    print_table(["session", "strategy", "frames/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the per-frame overhead of turning result messages into extended results
+
+The ResultAssembler used by ExplorationClient is compared with building the results through
+``ResultMessage.get_extended_results`` followed by ``TickUnwrapper.unwrap_ticks``, which is how
+ExplorationClient used to do it.
+
+Run with ``python -m tests.benchmarks.a121_result_assembly``
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication.exploration_client import (
+    ResultAssembler,
+    TickUnwrapper,
+)
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages import (
+    FrameBlobLayout,
+    ResultMessage,
+)
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages.result_message import (
+    ResultInfoDict,
+)
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+
+from ._utils import best_time, print_table
+
+
+def _session_config(num_groups: int, num_sensors: int) -> a121.SessionConfig:
+    return a121.SessionConfig(
+        [
+            {
+                sensor_id: a121.SensorConfig(num_points=40)
+                for sensor_id in range(1, num_sensors + 1)
+            }
+            for _ in range(num_groups)
+        ],
+        extended=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = []
+    for num_groups, num_sensors in [(1, 1), (1, 4), (4, 4)]:
+        session_config = _session_config(num_groups, num_sensors)
+        extended_metadata = MockClient._session_config_to_metadata(session_config)
+        layout = FrameBlobLayout.from_metadata(extended_metadata)
+
+        messages = [
+            ResultMessage(
+                [
+                    [
+                        ResultInfoDict(
+                            tick=(i * 1000) % 2**32,
+                            data_saturated=False,
+                            frame_delayed=False,
+                            calibration_needed=False,
+                            temperature=25,
+                        )
+                        for _ in range(num_sensors)
+                    ]
+                    for _ in range(num_groups)
+                ],
+                bytearray(4 * layout.num_elements),
+            )
+            for i in range(args.num_messages)
+        ]
+
+        def previous() -> None:
+            tick_unwrapper = TickUnwrapper()
+            for message in messages:
+                tick_unwrapper.unwrap_ticks(
+                    message.get_extended_results(
+                        tps=MockClient.TICKS_PER_SECOND,
+                        metadata=extended_metadata,
+                        config_groups=session_config.groups,
+                        frame_blob_layout=layout,
+                    )
+                )
+
+        def assembler() -> None:
+            result_assembler = ResultAssembler(
+                extended_metadata, MockClient.TICKS_PER_SECOND, TickUnwrapper()
+            )
+            for message in messages:
+                result_assembler.assemble(message)
+
+        def batch_assembler() -> None:
+            result_assembler = ResultAssembler(
+                extended_metadata, MockClient.TICKS_PER_SECOND, TickUnwrapper()
+            )
+            for i in range(0, len(messages), 100):
+                result_assembler.assemble_batch(messages[i : i + 100])
+
+        previous_us = best_time(previous) / args.num_messages * 1e6
+        assembler_us = best_time(assembler) / args.num_messages * 1e6
+        batch_us = best_time(batch_assembler) / args.num_messages * 1e6
+        rows.append((num_groups * num_sensors, previous_us, assembler_us, batch_us))
+
+    print_table(
+        [
+            "entries",
+            "previous [us/frame]",
+            "assemble [us/frame]",
+            "assemble_batch(100) [us/frame]",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
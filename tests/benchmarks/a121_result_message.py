@@ -0,0 +1,125 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures how fast frames are extracted from the payload of result messages
+
+The per-session FrameBlobLayout is compared with slicing, converting and resizing the payload
+per sensor, which is how frames used to be extracted.
+
+Run with ``python -m tests.benchmarks.a121_result_message``
+"""
+
+from __future__ import annotations
+
+import argparse
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages import (
+    FrameBlobLayout,
+    ResultMessage,
+)
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+
+from ._utils import best_time, print_table
+
+
+def _divide_by_slicing(
+    frame_blob: bytes, extended_metadata: list[dict[int, a121.Metadata]]
+) -> list[dict[int, npt.NDArray[t.Any]]]:
+    start = 0
+    result = []
+    for metadata_group in extended_metadata:
+        result_group = {}
+        for sensor_id, metadata in metadata_group.items():
+            end = start + metadata.frame_data_length * 4
+            np_frame = np.frombuffer(frame_blob[start:end], dtype=INT_16_COMPLEX)
+            result_group[sensor_id] = np.resize(np_frame, metadata.frame_shape)
+            start = end
+        result.append(result_group)
+
+    return result
+
+
+def _session_config(num_groups: int, num_sensors: int) -> a121.SessionConfig:
+    return a121.SessionConfig(
+        [
+            {
+                sensor_id: a121.SensorConfig(num_points=80, sweeps_per_frame=16)
+                for sensor_id in range(1, num_sensors + 1)
+            }
+            for _ in range(num_groups)
+        ],
+        extended=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = []
+    for num_groups, num_sensors in [(1, 1), (1, 4), (4, 1), (4, 4)]:
+        session_config = _session_config(num_groups, num_sensors)
+        extended_metadata = MockClient._session_config_to_metadata(session_config)
+        layout = FrameBlobLayout.from_metadata(extended_metadata)
+        frame_blob = bytearray(4 * layout.num_elements)
+        result_infos = [
+            [
+                dict(
+                    tick=0,
+                    data_saturated=False,
+                    frame_delayed=False,
+                    calibration_needed=False,
+                    temperature=25,
+                )
+                for _ in range(num_sensors)
+            ]
+            for _ in range(num_groups)
+        ]
+        message = ResultMessage(result_infos, frame_blob)  # type: ignore[arg-type]
+
+        def slicing() -> None:
+            for _ in range(args.num_messages):
+                _divide_by_slicing(frame_blob, extended_metadata)
+
+        def divide() -> None:
+            for _ in range(args.num_messages):
+                layout.divide(frame_blob)
+
+        def get_extended_results() -> None:
+            for _ in range(args.num_messages):
+                message.get_extended_results(
+                    tps=MockClient.TICKS_PER_SECOND,
+                    metadata=extended_metadata,
+                    config_groups=session_config.groups,
+                    frame_blob_layout=layout,
+                )
+
+        slicing_us = best_time(slicing) / args.num_messages * 1e6
+        divide_us = best_time(divide) / args.num_messages * 1e6
+        results_us = best_time(get_extended_results) / args.num_messages * 1e6
+
+        rows.append(
+            (
+                f"{num_groups} groups x {num_sensors} sensors",
+                slicing_us,
+                divide_us,
+                slicing_us / divide_us,
+                results_us,
+            )
+        )
+
+    print_table(
+        ["session", "slicing [us]", "layout [us]", "speedup", "get_extended_results [us]"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
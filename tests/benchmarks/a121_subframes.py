@@ -0,0 +1,127 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the per-frame cost of picking out the range subsweeps of a distance frame
+
+``Result.get_concatenated_subframes`` is compared with concatenating a list of
+``result.subframes[i]``, where every access used to convert the whole frame again. The time
+spent in the distance ``Processor.process`` is listed for reference.
+
+Run with ``python -m tests.benchmarks.a121_subframes``
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import typing as t
+
+import attrs
+import numpy as np
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.int_16_complex import int16_complex_array_to_complex
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+from acconeer.exptool.a121._core.entities.containers.utils import get_subsweeps_from_frame
+from acconeer.exptool.a121.algo.distance._processors import (
+    Processor,
+    ProcessorConfig,
+    ProcessorContext,
+)
+
+from ._utils import print_table, synthetic_extended_results
+
+
+def _sensor_config(num_points: int) -> a121.SensorConfig:
+    return a121.SensorConfig(
+        sweeps_per_frame=8,
+        subsweeps=[
+            a121.SubsweepConfig(
+                start_point=i * num_points * 2,
+                num_points=num_points,
+                step_length=2,
+                profile=a121.Profile.PROFILE_3,
+                phase_enhancement=True,
+            )
+            for i in range(4)
+        ],
+    )
+
+
+def _previous(result: a121.Result, subsweep_indexes: list[int]) -> None:
+    metadata = result._context.metadata
+    range_subframes = [
+        get_subsweeps_from_frame(int16_complex_array_to_complex(result._frame), metadata)[i]
+        for i in subsweep_indexes
+    ]
+    np.concatenate(range_subframes, axis=1)
+
+
+def _best_time_per_frame(
+    results: list[a121.Result], func: t.Callable[[a121.Result], t.Any], repeat: int = 3
+) -> float:
+    times = []
+    for _ in range(repeat):
+        # Fresh results, so that nothing is cached from the previous round
+        fresh = [attrs.evolve(result) for result in results]
+        start = time.perf_counter()
+        for result in fresh:
+            func(result)
+        times.append(time.perf_counter() - start)
+
+    return min(times) / len(results) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = []
+    for num_points in [20, 50, 100]:
+        sensor_config = _sensor_config(num_points)
+        session_config = a121.SessionConfig(sensor_config)
+        metadata = MockClient._session_config_to_metadata(session_config)[0][1]
+        results = [
+            extended_result[0][1]
+            for extended_result in synthetic_extended_results(session_config, args.num_frames)
+        ]
+        subsweep_indexes = list(range(4))
+
+        previous_us = _best_time_per_frame(results, lambda r: _previous(r, subsweep_indexes))
+        helper_us = _best_time_per_frame(
+            results, lambda r: r.get_concatenated_subframes(subsweep_indexes)
+        )
+
+        processor = Processor(
+            sensor_config=sensor_config,
+            metadata=metadata,
+            processor_config=ProcessorConfig(),
+            context=ProcessorContext(bg_noise_std=[100.0] * 4, reference_temperature=25),
+        )
+        process_us = _best_time_per_frame(results, processor.process)
+
+        rows.append(
+            (
+                f"4 x {num_points}",
+                previous_us,
+                helper_us,
+                previous_us - helper_us,
+                process_us,
+            )
+        )
+
+    print_table(
+        [
+            "subsweeps x points",
+            "list + concatenate [us]",
+            "get_concatenated_subframes [us]",
+            "saving [us]",
+            "Processor.process [us]",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
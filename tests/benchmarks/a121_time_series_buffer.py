@@ -0,0 +1,76 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the per-frame cost of keeping a sliding time series
+
+TimeSeriesBuffer is compared with rolling the whole time series and, for phase, unwrapping it
+again, which is how the vibration, breathing and surface velocity processors used to do it.
+
+Run with ``python -m tests.benchmarks.a121_time_series_buffer``
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from acconeer.exptool.a121.algo import TimeSeriesBuffer
+
+from ._utils import best_time, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for description, length, num_points, unwrap in [
+        ("vibration", 1024, 1, True),
+        ("vibration", 8192, 1, True),
+        ("surface velocity", 512, 20, False),
+        ("surface velocity", 2048, 20, False),
+    ]:
+        sweeps_per_frame = 32
+        sample_shape = () if num_points == 1 else (num_points,)
+        frames = rng.uniform(
+            -np.pi, np.pi, size=(args.num_frames, sweeps_per_frame, *sample_shape)
+        )
+
+        def rolling() -> None:
+            time_series = np.zeros((length, *sample_shape))
+            for frame in frames:
+                time_series = np.roll(time_series, -sweeps_per_frame, axis=0)
+                time_series[-sweeps_per_frame:] = frame
+                if unwrap:
+                    time_series = np.unwrap(time_series, axis=0)
+
+        def buffer() -> None:
+            time_series = TimeSeriesBuffer(length, sample_shape, unwrap=unwrap)
+            for frame in frames:
+                time_series.extend(frame)
+                time_series.data
+
+        rolling_us = best_time(rolling) / args.num_frames * 1e6
+        buffer_us = best_time(buffer) / args.num_frames * 1e6
+        rows.append(
+            (
+                description,
+                length,
+                num_points,
+                rolling_us,
+                buffer_us,
+                rolling_us / buffer_us,
+            )
+        )
+
+    print_table(
+        ["time series", "length", "points", "previous [us]", "buffer [us]", "speedup"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
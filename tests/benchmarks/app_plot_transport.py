@@ -0,0 +1,94 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures how fast plot messages move from a backend process to the GUI process
+
+PlotTransport is compared with putting the plot messages on the multiprocessing queue as they
+are, which is how the backend used to send them. The backend sends the messages at a fixed frame
+rate, like it does when it processes frames from a sensor, and the CPU time it takes the GUI
+process to receive them is measured.
+
+Run with ``python -m tests.benchmarks.app_plot_transport``
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import time
+import typing as t
+
+import numpy as np
+
+from acconeer.exptool.app.new.backend import PlotMessage, PlotTransport
+
+from ._utils import print_table
+
+
+def _produce(
+    queue: mp.Queue[t.Any],
+    plot_transport: t.Optional[PlotTransport],
+    frame_shape: t.Tuple[int, int],
+    num_messages: int,
+    frame_rate: float,
+) -> None:
+    frame = np.zeros(frame_shape, dtype=complex)
+    start = time.perf_counter()
+    for i in range(num_messages):
+        time.sleep(max(0.0, start + i / frame_rate - time.perf_counter()))
+        message = PlotMessage(result={"frame": frame, "abs_sweep": np.abs(frame[0]), "index": i})
+        queue.put(message if plot_transport is None else plot_transport.pack(message))
+    queue.put(None)
+
+
+def _consume(
+    frame_shape: t.Tuple[int, int], num_messages: int, frame_rate: float, shared: bool
+) -> float:
+    """Returns the CPU time it takes the GUI process to receive all messages"""
+    queue: mp.Queue[t.Any] = mp.Queue()
+    plot_transport = PlotTransport() if shared else None
+    process = mp.Process(
+        target=_produce,
+        args=(queue, plot_transport, frame_shape, num_messages, frame_rate),
+    )
+
+    process.start()
+    start = time.process_time()
+    while (item := queue.get()) is not None:
+        if plot_transport is not None:
+            item = plot_transport.unpack(item)
+    duration = time.process_time() - start
+
+    process.join()
+    if plot_transport is not None:
+        plot_transport.close(unlink=True)
+
+    return duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-messages", type=int, default=1000)
+    parser.add_argument("--frame-rate", type=float, default=200.0)
+    args = parser.parse_args()
+
+    rows = []
+    for frame_shape in [(16, 40), (32, 200), (64, 500)]:
+        queue_s, shared_s = (
+            _consume(frame_shape, args.num_messages, args.frame_rate, shared)
+            for shared in [False, True]
+        )
+        rows.append(
+            (
+                f"{frame_shape[0]}x{frame_shape[1]}",
+                queue_s / args.num_messages * 1e6,
+                shared_s / args.num_messages * 1e6,
+                queue_s / shared_s,
+            )
+        )
+
+    print_table(["frame", "queue [us/msg]", "PlotTransport [us/msg]", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures how long it takes to update the rate statistics of a result
+
+_RateCalculator is compared with computing the mean and standard deviation of the tick
+differences in the window with the statistics module on every result, which is how the
+statistics used to be computed.
+
+Run with ``python -m tests.benchmarks.app_rate_calc``
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from collections import deque
+
+from acconeer.exptool.app.new.backend import _RateCalculator
+
+from ._utils import best_time, print_table
+
+
+def _update_from_window(ticks: deque[int], tick: int) -> tuple[float, float]:
+    ticks.append(tick)
+    tick_diffs = [rhs - lhs for lhs, rhs in zip(ticks, list(ticks)[1:])]
+    if len(tick_diffs) < 2:
+        return float("nan"), float("nan")
+
+    return statistics.mean(tick_diffs), statistics.pstdev(tick_diffs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-results", type=int, default=10_000)
+    args = parser.parse_args()
+
+    ticks = [1000 * i + (i * 7919) % 13 for i in range(args.num_results)]
+
+    def window() -> None:
+        window_ticks: deque[int] = deque([], maxlen=200)
+        for tick in ticks:
+            _update_from_window(window_ticks, tick)
+
+    def running() -> None:
+        rate_calculator = _RateCalculator(ticks_per_second=1_000_000, tick_period=1000)
+        for tick in ticks:
+            rate_calculator.update(tick, frame_delayed=False)
+
+    window_s = best_time(window)
+    running_s = best_time(running)
+    rows = [
+        (
+            args.num_results,
+            window_s / args.num_results * 1e6,
+            running_s / args.num_results * 1e6,
+            window_s / running_s,
+        )
+    ]
+
+    print_table(
+        ["results", "statistics [us/result]", "_RateCalculator [us/result]", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures receive throughput of SocketLink against a stand-in device on a local socket
+
+The stand-in device streams messages the way the exploration server does: a JSON header
+terminated by a newline, followed by the payload. The current SocketLink is compared with a link
+that slices its receive buffer after every read, which is how the links used to work.
+
+Run with ``python -m tests.benchmarks.core_link_throughput``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+from acconeer.exptool._core.communication.links import SocketLink
+
+from ._utils import print_table
+
+
+class _SlicingSocketLink(SocketLink):
+    """SocketLink with the previous, bytearray-slicing, receive path"""
+
+    _CHUNK_SIZE = 4096
+
+    def connect(self) -> None:
+        super().connect()
+        self._slicing_buf = bytearray()
+
+    def recv(self, num_bytes: int) -> bytes:
+        assert self._sock is not None
+        while len(self._slicing_buf) < num_bytes:
+            self._slicing_buf.extend(self._sock.recv(self._CHUNK_SIZE))
+
+        data = self._slicing_buf[:num_bytes]
+        self._slicing_buf = self._slicing_buf[num_bytes:]
+        return data
+
+    def recv_into(self, buffer: memoryview) -> None:
+        buffer[:] = self.recv(len(buffer))
+
+    def recv_until(self, bs: bytes) -> bytes:
+        assert self._sock is not None
+        while True:
+            try:
+                i = self._slicing_buf.index(bs)
+            except ValueError:
+                self._slicing_buf.extend(self._sock.recv(self._CHUNK_SIZE))
+            else:
+                break
+
+        i += 1
+        data = self._slicing_buf[:i]
+        self._slicing_buf = self._slicing_buf[i:]
+        return data
+
+
+def _serve(server: socket.socket, message: bytes, num_messages: int) -> None:
+    conn, _ = server.accept()
+    with conn:
+        # Send several messages per call, so that the link has to split them up
+        batch = message * 16
+        for _ in range(num_messages // 16):
+            conn.sendall(batch)
+
+
+def _measure(link_type: type[SocketLink], payload_size: int, num_messages: int) -> float:
+    header = json.dumps({"status": "ok", "payload_size": payload_size}).encode() + b"\n"
+    message = header + bytes(payload_size)
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    host, port = server.getsockname()
+
+    device = threading.Thread(target=_serve, args=(server, message, num_messages))
+    device.start()
+
+    link = link_type(host, port)
+    link.connect()
+
+    start = time.perf_counter()
+    for _ in range(num_messages // 16 * 16):
+        link.recv_until(b"\n")
+        payload = bytearray(payload_size)
+        link.recv_into(memoryview(payload))
+    duration = time.perf_counter() - start
+
+    device.join()
+    link.disconnect()
+    server.close()
+
+    return num_messages * len(message) / duration / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for payload_size in [1_000, 10_000, 100_000, 1_000_000]:
+        num_messages = max(16, args.num_messages * 1000 // payload_size)
+        slicing = max(
+            _measure(_SlicingSocketLink, payload_size, num_messages) for _ in range(args.repeat)
+        )
+        receive_buffer = max(
+            _measure(SocketLink, payload_size, num_messages) for _ in range(args.repeat)
+        )
+        rows.append((payload_size, slicing, receive_buffer, receive_buffer / slicing))
+
+    print_table(["payload size", "slicing MB/s", "ReceiveBuffer MB/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures the overhead of timing stages with a StageProfiler
+
+The time of timing an empty stage the way clients do is measured without a profiler, which is
+how clients run unless a profiler is attached, and with a profiler. The per-frame time of
+ResultAssembler.assemble, which times two stages, is measured the same way.
+
+Run with ``python -m tests.benchmarks.core_stage_profiling``
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import typing as t
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.profiling import StageProfiler
+from acconeer.exptool.a121._core.communication.exploration_client import (
+    ResultAssembler,
+    TickUnwrapper,
+)
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages import (
+    FrameBlobLayout,
+    ResultMessage,
+)
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages.result_message import (
+    ResultInfoDict,
+)
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+
+from ._utils import best_time, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.num_iterations
+
+    def stages(profiler: t.Optional[StageProfiler]) -> t.Callable[[], None]:
+        def f() -> None:
+            for _ in range(n):
+                if profiler is not None:
+                    timestamp = time.perf_counter_ns()
+
+                if profiler is not None:
+                    profiler.lap("stage", timestamp)
+
+        return f
+
+    extended_metadata = MockClient._session_config_to_metadata(
+        a121.SessionConfig(a121.SensorConfig(num_points=40), extended=True)
+    )
+    layout = FrameBlobLayout.from_metadata(extended_metadata)
+    messages = [
+        ResultMessage(
+            [
+                [
+                    ResultInfoDict(
+                        tick=i * 1000,
+                        data_saturated=False,
+                        frame_delayed=False,
+                        calibration_needed=False,
+                        temperature=25,
+                    )
+                ]
+            ],
+            bytearray(4 * layout.num_elements),
+        )
+        for i in range(n // 10)
+    ]
+
+    def assemble(profiler: t.Optional[StageProfiler]) -> t.Callable[[], None]:
+        def f() -> None:
+            result_assembler = ResultAssembler(
+                extended_metadata, MockClient.TICKS_PER_SECOND, TickUnwrapper(), profiler=profiler
+            )
+            for message in messages:
+                result_assembler.assemble(message)
+
+        return f
+
+    print_table(
+        ["", "without profiler [us]", "with profiler [us]"],
+        [
+            (
+                "empty stage",
+                best_time(stages(None)) / n * 1e6,
+                best_time(stages(StageProfiler())) / n * 1e6,
+            ),
+            (
+                "assemble",
+                best_time(assemble(None)) / len(messages) * 1e6,
+                best_time(assemble(StageProfiler())) / len(messages) * 1e6,
+            ),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
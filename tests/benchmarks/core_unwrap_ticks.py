@@ -0,0 +1,62 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+"""Measures unwrapping of 10^6 ticks, one extended result at a time and all at once
+
+Run with ``python -m tests.benchmarks.core_unwrap_ticks``
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from acconeer.exptool._core.communication.unwrap_ticks import unwrap_ticks, unwrap_ticks_array
+
+from ._utils import best_time, print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-ticks", type=int, default=10**6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    limit = 2**32
+
+    rows = []
+    for num_entries in [1, 4, 16]:
+        num_results = args.num_ticks // num_entries
+        # A 1 kHz update rate at 1 MHz ticks wraps a couple of times over 10^6 results
+        base = np.cumsum(rng.integers(900, 1100, size=num_results)) * 10
+        jitter = rng.integers(0, 50, size=(num_results, num_entries))
+        ticks = (base[:, np.newaxis] + jitter) % limit
+        tick_lists = ticks.tolist()
+
+        def sequential() -> None:
+            minimum_tick = None
+            for row in tick_lists:
+                _, minimum_tick = unwrap_ticks(row, minimum_tick, limit)
+
+        def vectorized() -> None:
+            unwrap_ticks_array(ticks, None, limit)
+
+        sequential_s = best_time(sequential, repeat=1)
+        vectorized_s = best_time(vectorized)
+        rows.append(
+            (
+                f"{num_results} x {num_entries}",
+                sequential_s * 1e3,
+                vectorized_s * 1e3,
+                sequential_s / vectorized_s,
+            )
+        )
+
+    print_table(
+        ["results x entries", "unwrap_ticks [ms]", "unwrap_ticks_array [ms]", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
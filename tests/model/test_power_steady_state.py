@@ -0,0 +1,93 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import copy
+import typing as t
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121.model import power
+
+
+def _session_config(update_rate: t.Optional[float] = 10.0) -> a121.SessionConfig:
+    return a121.SessionConfig(
+        [
+            {
+                1: a121.SensorConfig(
+                    sweeps_per_frame=8, inter_frame_idle_state=a121.IdleState.SLEEP
+                ),
+                2: a121.SensorConfig(),
+            },
+            {1: a121.SensorConfig(profile=a121.Profile.PROFILE_3)},
+        ],
+        update_rate=update_rate,
+    )
+
+
+LOWER_IDLE_STATES = [None, power.Sensor.IdleState.HIBERNATE, power.Sensor.IdleState.OFF]
+ALGORITHMS = [power.algo.SparseIq(), power.algo.Distance()]
+
+
+@pytest.mark.parametrize("lower_idle_state", LOWER_IDLE_STATES)
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_steady_state_is_average_of_long_session(
+    lower_idle_state: t.Optional[power.Sensor.LowerIdleState], algorithm: power.algo.Algorithm
+) -> None:
+    config = _session_config()
+    steady_state = power.steady_state_average_current(config, lower_idle_state, algorithm)
+
+    long_session = power.session(config, lower_idle_state, duration=2.0, algorithm=algorithm)
+    assert long_session.average_current == pytest.approx(steady_state, rel=1e-9)
+
+    converged = power.converged_average_current(
+        config, lower_idle_state, absolute_tolerance=1e-7, algorithm=algorithm
+    )
+    assert converged == pytest.approx(steady_state, abs=1e-6)
+
+
+def test_steady_state_without_rate_is_group_active() -> None:
+    config = _session_config(update_rate=None)
+
+    assert power.steady_state_average_current(config, None) == pytest.approx(
+        power.group_active(config, None).average_current
+    )
+
+
+@pytest.mark.parametrize("lower_idle_state", LOWER_IDLE_STATES)
+def test_average_current_vs_rate(
+    lower_idle_state: t.Optional[power.Sensor.LowerIdleState],
+) -> None:
+    config = _session_config()
+    # The highest rates are too high for the session to keep
+    rates = [0.1, 1.0, 10.0, 50.0, 1000.0, 5000.0]
+
+    average_currents = power.average_current_vs_rate(config, lower_idle_state, rates)
+
+    active_duration = power.group_active(config, lower_idle_state).duration
+    expected = []
+    for rate in rates:
+        evolved_config = copy.deepcopy(config)
+        evolved_config.update_rate = rate
+        period = max(1 / rate, active_duration)
+        expected.append(
+            power.session(evolved_config, lower_idle_state, duration=20 * period).average_current
+        )
+
+    np.testing.assert_allclose(average_currents, expected, rtol=1e-9)
+
+
+def test_group_active_is_cached_on_groups() -> None:
+    config = _session_config()
+    active = power.group_active(config, None)
+
+    assert power.group_active(_session_config(), None) is active
+    assert power.group_active(_session_config(update_rate=5.0), None) is active
+    assert power.group_active(config, power.Sensor.IdleState.OFF) is not active
+    assert power.group_active(config, None, algorithm=power.algo.Distance()) is not active
+
+    config.groups[0][1].sweeps_per_frame = 4
+    assert power.group_active(config, None) is not active
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 from __future__ import annotations
 
@@ -61,6 +61,12 @@ class ProcessorWrapper:
     def process(self, result: a121.Result) -> ResultSlice:
         return ResultSlice.from_processor_result(self.processor.process(result))
 
+    def process_batch(self, stacked_results: a121.StackedResults) -> t.List[ResultSlice]:
+        return [
+            ResultSlice.from_processor_result(processor_result)
+            for processor_result in self.processor.process_batch(stacked_results)
+        ]
+
 
 @attrs.mutable
 class DetectorWrapper:
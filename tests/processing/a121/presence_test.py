@@ -1,6 +1,8 @@
 # Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
+from __future__ import annotations
+
 import typing as t
 
 import attrs
@@ -51,6 +53,12 @@ class ProcessorWrapper:
     def process(self, result: a121.Result) -> ProcessorResultSlice:
         return ProcessorResultSlice.from_processor_result(self.processor.process(result))
 
+    def process_batch(self, stacked_results: a121.StackedResults) -> t.List[ProcessorResultSlice]:
+        return [
+            ProcessorResultSlice.from_processor_result(processor_result)
+            for processor_result in self.processor.process_batch(stacked_results)
+        ]
+
 
 def presence_default(record: a121.H5Record) -> ProcessorWrapper:
     return ProcessorWrapper(
@@ -77,6 +77,12 @@ class ProcessorWrapper:
     def process(self, result: a121.Result) -> ResultSlice:
         return ResultSlice.from_processor_result(self.processor.process(result))
 
+    def process_batch(self, stacked_results: a121.StackedResults) -> list[ResultSlice]:
+        return [
+            ResultSlice.from_processor_result(processor_result)
+            for processor_result in self.processor.process_batch(stacked_results)
+        ]
+
 
 def vibration_controller(record: a121.H5Record) -> ProcessorWrapper:
     algo_group = record.get_algo_group("vibration")
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 import numpy as np
@@ -6,7 +6,12 @@ import numpy.testing as npt
 import pytest
 
 from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
 from acconeer.exptool.a121.algo import (
+    APPROX_BASE_STEP_LENGTH_M,
+    RLG_PER_HWAAS_MAP,
+    ReflectorShape,
+    calc_processing_gain,
     distance,
     find_peaks,
     get_distance_filter_coeffs,
@@ -255,3 +260,101 @@ def test_calc_cfar_window_length() -> None:
         profile=profile, step_length=step_length
     )
     assert actual_margin == 7
+
+
+@pytest.mark.parametrize("window_length", [1, 3, 8, 32])
+@pytest.mark.parametrize("guard_half_length", [0, 2, 28])
+def test_calculate_cfar_mean_matches_convolution(
+    window_length: int, guard_half_length: int
+) -> None:
+    rng = np.random.default_rng(window_length + guard_half_length)
+    abs_sweeps = rng.uniform(0, 1e4, size=(3, 200))
+    cumsum = np.empty(201)
+    kernel = np.full(window_length, 1 / (2 * window_length))
+    out = np.empty(200)
+
+    margin = window_length + guard_half_length
+    sweep_len_without_margins = 200 - 2 * margin
+
+    thresholds = []
+    for abs_sweep in abs_sweeps:
+        expected = np.full(abs_sweep.shape, np.nan)
+        filt_abs_sweep = np.convolve(abs_sweep, np.ones(window_length), "valid") / window_length
+        expected[margin:-margin] = (
+            filt_abs_sweep[:sweep_len_without_margins]
+            + filt_abs_sweep[-sweep_len_without_margins:]
+        ) / 2
+
+        actual = distance.Processor._calculate_cfar_mean(
+            abs_sweep, window_length, guard_half_length, cumsum=cumsum
+        )
+        npt.assert_allclose(actual, expected, rtol=1e-9)
+        thresholds.append(actual)
+
+        buffered = distance.Processor._calculate_cfar_mean(
+            abs_sweep, window_length, guard_half_length, cumsum=cumsum, kernel=kernel, out=out
+        )
+        assert buffered is out
+        npt.assert_allclose(buffered, expected, rtol=1e-9)
+
+    # Reusing the buffers must not change thresholds returned earlier
+    assert not np.shares_memory(thresholds[0], thresholds[1])
+
+
+@pytest.mark.parametrize("reflector_shape", list(ReflectorShape))
+def test_calculate_fixed_strength_threshold(reflector_shape: ReflectorShape) -> None:
+    sensor_config = a121.SensorConfig(
+        subsweeps=[
+            a121.SubsweepConfig(
+                start_point=80, num_points=40, step_length=2, hwaas=8, phase_enhancement=True
+            ),
+            a121.SubsweepConfig(
+                start_point=160, num_points=60, step_length=2, hwaas=16, phase_enhancement=True
+            ),
+            a121.SubsweepConfig(
+                start_point=280, num_points=50, step_length=2, hwaas=32, phase_enhancement=True
+            ),
+        ],
+    )
+    metadata = MockClient._session_config_to_metadata(a121.SessionConfig(sensor_config))[0][1]
+    bg_noise_std = [10.0, 12.0, 15.0]
+    processor = distance.Processor(
+        sensor_config=sensor_config,
+        metadata=metadata,
+        processor_config=distance.ProcessorConfig(
+            threshold_method=distance.ThresholdMethod.FIXED_STRENGTH,
+            reflector_shape=reflector_shape,
+        ),
+        context=distance.ProcessorContext(bg_noise_std=bg_noise_std),
+    )
+
+    processing_gain_db = 10 * np.log10(
+        calc_processing_gain(processor.profile, processor.step_length)
+    )
+    bpts_m = np.array([80, 160, 280]) * APPROX_BASE_STEP_LENGTH_M
+    expected = []
+    for point in range(processor.num_points_cropped):
+        distance_m = (
+            processor.start_point_cropped + point * processor.step_length
+        ) * APPROX_BASE_STEP_LENGTH_M
+        subsweep_idx = np.sum(bpts_m < distance_m) - 1
+        n_db = 20 * np.log10(bg_noise_std[subsweep_idx])
+        r_db = reflector_shape.exponent * 10 * np.log10(distance_m)
+        rlg_db = RLG_PER_HWAAS_MAP[processor.profile] + 10 * np.log10(
+            sensor_config.subsweeps[subsweep_idx].hwaas
+        )
+        expected.append(
+            10
+            ** (
+                (
+                    processing_gain_db
+                    + n_db
+                    + rlg_db
+                    - r_db
+                    + processor.processor_config.fixed_strength_threshold_value
+                )
+                / 20
+            )
+        )
+
+    npt.assert_allclose(processor.threshold, expected, rtol=1e-12)
@@ -0,0 +1,114 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
+from acconeer.exptool.a121.algo import double_buffering_frame_filter
+from acconeer.exptool.a121.algo._utils import MEAN_ABS_DEV_OUTLIER_TH
+
+
+def _reference_filter(_frame: npt.NDArray[t.Any]) -> npt.NDArray[np.complex_]:
+    """The column-by-column filter that double_buffering_frame_filter replaces"""
+    (n_s, n_d) = _frame.shape
+
+    frame_real = _frame["real"]
+    frame_imag = _frame["imag"]
+
+    frame_diff_real = np.zeros((n_s, n_d), dtype=np.int16)
+    frame_diff_imag = np.zeros((n_s, n_d), dtype=np.int16)
+    frame_diff_real[1:-1, :] = np.diff(frame_real, axis=0, n=2)
+    frame_diff_imag[1:-1, :] = np.diff(frame_imag, axis=0, n=2)
+    frame_diff_abs = np.abs(frame_diff_real) + np.abs(frame_diff_imag)
+    frame_diff_mad = np.sum(frame_diff_abs, axis=0) // (n_s - 2)
+    threshold = MEAN_ABS_DEV_OUTLIER_TH * frame_diff_mad
+    outliers = frame_diff_abs > threshold
+
+    filtered_frame_real = frame_real.copy()
+    filtered_frame_imag = frame_imag.copy()
+    for d in range(n_d):
+        if np.any(outliers[:, d]):
+            args = np.where(outliers[:, d])[0]
+            for idx in args:
+                if idx <= 1:
+                    filtered_frame_real[idx, d] = np.median(filtered_frame_real[idx : idx + 4, d])
+                    filtered_frame_imag[idx, d] = np.median(filtered_frame_imag[idx : idx + 4, d])
+                elif idx >= n_s - 2:
+                    filtered_frame_real[idx, d] = np.median(filtered_frame_real[idx - 3 : idx, d])
+                    filtered_frame_imag[idx, d] = np.median(filtered_frame_imag[idx - 3 : idx, d])
+                else:
+                    filtered_frame_real[idx, d] = int(
+                        (
+                            2 * filtered_frame_real[max(idx - 1, 0), d]
+                            + filtered_frame_real[min(idx + 2, n_s - 1), d]
+                        )
+                        / 3
+                    )
+                    filtered_frame_imag[idx, d] = int(
+                        (
+                            2 * filtered_frame_imag[max(idx - 1, 0), d]
+                            + filtered_frame_imag[min(idx + 2, n_s - 1), d]
+                        )
+                        / 3
+                    )
+
+    filtered_frame = np.empty((n_s, n_d), dtype=np.complex_)
+    filtered_frame.real = filtered_frame_real
+    filtered_frame.imag = filtered_frame_imag
+
+    return filtered_frame
+
+
+def _frame_with_outliers(
+    num_sweeps: int, num_points: int, amplitude: int, seed: int
+) -> npt.NDArray[t.Any]:
+    """Random frame with short runs of disturbed sweeps"""
+    rng = np.random.default_rng(seed)
+    frame = np.empty((num_sweeps, num_points), dtype=INT_16_COMPLEX)
+    frame["real"] = rng.integers(-amplitude, amplitude, size=frame.shape)
+    frame["imag"] = rng.integers(-amplitude, amplitude, size=frame.shape)
+
+    for _ in range(rng.integers(0, 3 * num_points + 1)):
+        sweep = rng.integers(0, num_sweeps)
+        point = rng.integers(0, num_points)
+        run_length = rng.integers(1, 5)
+        frame["real"][sweep : sweep + run_length, point] = rng.integers(-32768, 32768)
+        frame["imag"][sweep : sweep + run_length, point] = rng.integers(-32768, 32768)
+
+    return frame
+
+
+@pytest.mark.filterwarnings("ignore:overflow encountered")
+@pytest.mark.parametrize("amplitude", [10, 1000, 32767])
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference(amplitude: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    frame = _frame_with_outliers(
+        int(rng.integers(32, 100)), int(rng.integers(1, 10)), amplitude, seed
+    )
+
+    actual = double_buffering_frame_filter(frame)
+
+    assert actual is not None
+    np.testing.assert_array_equal(actual, _reference_filter(frame))
+
+
+def test_repairs_a_disturbed_sweep() -> None:
+    frame = np.zeros((32, 2), dtype=INT_16_COMPLEX)
+    frame["real"] = np.arange(32)[:, None] * 10
+    frame["real"][10, 1] = 1000
+
+    actual = double_buffering_frame_filter(frame)
+
+    assert actual is not None
+    np.testing.assert_array_equal(actual.real, frame["real"][:, [0, 0]])
+
+
+def test_requires_32_sweeps() -> None:
+    assert double_buffering_frame_filter(np.zeros((31, 10), dtype=INT_16_COMPLEX)) is None
@@ -0,0 +1,62 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from acconeer.exptool.a121.algo import exponential_smoothing_scan
+
+
+def _reference_scan(
+    samples: npt.NDArray[t.Any], smoothing_factors: npt.NDArray[np.float_], initial: t.Any
+) -> list[npt.NDArray[t.Any]]:
+    """The sample-by-sample update that exponential_smoothing_scan replaces"""
+    state = initial
+    states = []
+    for sf, sample in zip(smoothing_factors, samples):
+        state = sf * state + (1.0 - sf) * sample
+        states.append(state)
+    return states
+
+
+@pytest.mark.parametrize("dtype", [float, complex])
+@pytest.mark.parametrize("num_samples", [1, 2, 10, 100])
+def test_matches_reference_with_constant_smoothing_factor(dtype: type, num_samples: int) -> None:
+    rng = np.random.default_rng(num_samples)
+    samples: npt.NDArray[t.Any] = rng.normal(size=(num_samples, 7)).astype(dtype)
+    initial: npt.NDArray[t.Any] = rng.normal(size=7).astype(dtype)
+
+    states = exponential_smoothing_scan(samples, 0.8, initial)
+
+    expected = _reference_scan(samples, np.full(num_samples, 0.8), initial)
+    np.testing.assert_array_equal(states, expected)
+
+
+@pytest.mark.parametrize("start_index", [0, 1, 5, 50])
+def test_matches_reference_with_dynamic_smoothing_factors(start_index: int) -> None:
+    rng = np.random.default_rng(start_index)
+    samples = rng.normal(size=(30, 4, 3))
+    update_indexes = start_index + np.arange(30)
+    smoothing_factors = np.minimum(0.9, 1.0 - 1.0 / (1.0 + update_indexes))
+
+    states = exponential_smoothing_scan(samples, smoothing_factors, np.zeros((4, 3)))
+
+    expected = _reference_scan(samples, smoothing_factors, np.zeros((4, 3)))
+    np.testing.assert_array_equal(states, expected)
+
+
+def test_broadcasts_scalar_initial_state() -> None:
+    samples = np.ones((3, 2))
+
+    states = exponential_smoothing_scan(samples, 0.5, 0.0)
+
+    np.testing.assert_array_equal(states, [[0.5, 0.5], [0.75, 0.75], [0.875, 0.875]])
+
+
+def test_no_samples() -> None:
+    assert exponential_smoothing_scan(np.empty((0, 5)), 0.5, np.zeros(5)).shape == (0, 5)
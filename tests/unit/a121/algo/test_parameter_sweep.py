@@ -0,0 +1,147 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import csv
+import multiprocessing
+import subprocess
+import sys
+import textwrap
+import typing as t
+from pathlib import Path
+
+import attrs
+import pytest
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication import MockClient
+from acconeer.exptool.a121.algo import presence, run_parameter_sweep, write_summary_table
+from acconeer.exptool.a121.algo.presence._configs import get_medium_range_config
+
+
+def _summarize(processor_results: list[presence.ProcessorResult]) -> dict[str, t.Any]:
+    return {
+        "num_frames": len(processor_results),
+        "num_detections": sum(bool(r.presence_detected) for r in processor_results),
+        "last_inter_presence_score": float(processor_results[-1].inter_presence_score),
+    }
+
+
+@pytest.fixture
+def record_path(tmp_path: Path) -> Path:
+    path = tmp_path / "record.h5"
+    sensor_config = presence.Detector._get_sensor_config(get_medium_range_config())
+    with MockClient(unthrottled=True) as client:
+        with a121.H5Recorder(path) as recorder:
+            client.attach_recorder(recorder)
+            client.setup_session(sensor_config)
+            client.start_session()
+            for _ in range(25):
+                client.get_next()
+            client.stop_session()
+            client.detach_recorder()
+
+    return path
+
+
+def _mp_context(start_method: str) -> multiprocessing.context.BaseContext:
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"The {start_method!r} start method is not available")
+
+    return multiprocessing.get_context(start_method)
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_matches_processing_each_config(record_path: Path, start_method: str) -> None:
+    base_processor_config = presence.Detector._get_processor_config(get_medium_range_config())
+    grid: dict[str, list[t.Any]] = {
+        "inter_detection_threshold": [0.5, 2.0],
+        "inter_phase_boost": [False, True],
+        "inter_frame_presence_timeout": [None, 3],
+    }
+
+    rows = run_parameter_sweep(
+        record_path,
+        presence.Processor,
+        base_processor_config,
+        grid,
+        _summarize,
+        max_workers=2,
+        batch_size=10,
+        mp_context=_mp_context(start_method),
+    )
+
+    assert len(rows) == 8
+    with a121.open_record(record_path) as record:
+        for row in rows:
+            parameters = {name: row[name] for name in grid}
+            processor = presence.Processor(
+                sensor_config=record.session_config.sensor_config,
+                metadata=record.metadata,
+                processor_config=attrs.evolve(base_processor_config, **parameters),
+            )
+            expected = _summarize([processor.process(result) for result in record.results])
+
+            assert row == {**parameters, **expected}
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn", "forkserver"])
+def test_workers_do_not_track_the_shared_memory(record_path: Path, start_method: str) -> None:
+    _mp_context(start_method)
+    script = textwrap.dedent(
+        f"""
+        import multiprocessing
+
+        from acconeer.exptool.a121.algo import presence, run_parameter_sweep
+        from test_parameter_sweep import _summarize
+
+        if __name__ == "__main__":
+            run_parameter_sweep(
+                {str(record_path)!r},
+                presence.Processor,
+                presence.ProcessorConfig(),
+                {{"inter_phase_boost": [False, True]}},
+                _summarize,
+                max_workers=2,
+                mp_context=multiprocessing.get_context({start_method!r}),
+            )
+        """
+    )
+
+    # Anything the resource tracker or the worker finalizers complain about ends up in stderr
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stderr == ""
+
+
+def test_requires_sensor_id_for_groups_with_several_sensors(tmp_path: Path) -> None:
+    path = tmp_path / "record.h5"
+    with MockClient(unthrottled=True) as client:
+        with a121.H5Recorder(path) as recorder:
+            client.attach_recorder(recorder)
+            client.setup_session(
+                a121.SessionConfig({1: a121.SensorConfig(), 2: a121.SensorConfig()})
+            )
+            client.start_session()
+            client.get_next()
+            client.stop_session()
+            client.detach_recorder()
+
+    with pytest.raises(ValueError):
+        run_parameter_sweep(
+            path, presence.Processor, presence.ProcessorConfig(), {}, _summarize, max_workers=1
+        )
+
+
+def test_write_summary_table(tmp_path: Path) -> None:
+    path = tmp_path / "summary.csv"
+    write_summary_table([{"a": 1, "b": 2.5}, {"a": 2, "c": "x"}], path)
+
+    with open(path, newline="") as f:
+        assert list(csv.reader(f)) == [["a", "b", "c"], ["1", "2.5", ""], ["2", "", "x"]]
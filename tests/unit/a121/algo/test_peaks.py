@@ -0,0 +1,197 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from acconeer.exptool.a121.algo import (
+    find_peaks,
+    find_peaks_mask,
+    interpolate_peaks,
+    interpolate_peaks_array,
+)
+
+
+def _reference_find_peaks(
+    abs_sweep: npt.NDArray[np.float_], threshold: npt.NDArray[np.float_]
+) -> list[int]:
+    """The scalar peak search that find_peaks_mask replaces"""
+    found_peaks = []
+    d = 1
+    N = len(abs_sweep)
+    while d < (N - 1):
+        if np.isnan(threshold[d - 1]):
+            d += 1
+            continue
+        if np.isnan(threshold[d + 1]):
+            break
+        if abs_sweep[d] <= threshold[d]:
+            d += 2
+            continue
+        if abs_sweep[d - 1] <= threshold[d - 1]:
+            d += 1
+            continue
+        if abs_sweep[d - 1] >= abs_sweep[d]:
+            d += 1
+            continue
+        d_upper = d + 1
+        while True:
+            if (d_upper) >= (N - 1):
+                break
+            if np.isnan(threshold[d_upper]):
+                break
+            if abs_sweep[d_upper] <= threshold[d_upper]:
+                break
+            if abs_sweep[d_upper] > abs_sweep[d]:
+                break
+            elif abs_sweep[d_upper] < abs_sweep[d]:
+                found_peaks.append(int(np.argmax(abs_sweep[d:d_upper]) + d))
+                break
+            else:
+                d_upper += 1
+        d = d_upper
+    return found_peaks
+
+
+def _reference_interpolate_peaks(
+    abs_sweep: npt.NDArray[np.float_],
+    peak_idxs: list[int],
+    start_point: int,
+    step_length: int,
+    step_length_m: float,
+) -> t.Tuple[list[float], list[float]]:
+    """The per-peak interpolation that interpolate_peaks_array replaces"""
+    estimated_distances = []
+    estimated_amplitudes = []
+    for peak_idx in peak_idxs:
+        x = np.arange(peak_idx - 1, peak_idx + 2, 1)
+        y = abs_sweep[peak_idx - 1 : peak_idx + 2]
+        a = (x[0] * (y[2] - y[1]) + x[1] * (y[0] - y[2]) + x[2] * (y[1] - y[0])) / (
+            (x[0] - x[1]) * (x[0] - x[2]) * (x[1] - x[2])
+        )
+        b = (y[1] - y[0]) / (x[1] - x[0]) - a * (x[0] + x[1])
+        c = y[0] - a * x[0] ** 2 - b * x[0]
+        peak_loc = -b / (2 * a)
+        estimated_distances.append((start_point + peak_loc * step_length) * step_length_m)
+        estimated_amplitudes.append(a * peak_loc**2 + b * peak_loc + c)
+    return estimated_distances, estimated_amplitudes
+
+
+@st.composite
+def sweeps_and_thresholds(
+    draw: st.DrawFn, num_sweeps: t.Optional[int] = None
+) -> t.Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]:
+    """Small integer-valued sweeps, so that plateaus and values equal to the threshold are
+    common, with NaN thresholds at the edges and sometimes in the middle.
+    """
+    N = draw(st.integers(0, 40))
+    shape = (N,) if num_sweeps is None else (num_sweeps, N)
+    size = int(np.prod(shape))
+
+    abs_sweep = np.array(draw(st.lists(st.integers(0, 4), min_size=size, max_size=size)))
+    threshold = np.array(
+        draw(st.lists(st.integers(0, 3), min_size=size, max_size=size)), dtype=float
+    )
+    abs_sweep = abs_sweep.reshape(shape).astype(float)
+    threshold = threshold.reshape(shape)
+
+    nan_mask = np.array(draw(st.lists(st.booleans(), min_size=size, max_size=size)), dtype=bool)
+    nan_mask = nan_mask.reshape(shape) & draw(st.booleans())
+    num_nan_start = draw(st.integers(0, N))
+    num_nan_end = draw(st.integers(0, N))
+    nan_mask[..., :num_nan_start] = True
+    nan_mask[..., N - num_nan_end :] = True
+    threshold[nan_mask] = np.nan
+
+    return abs_sweep, threshold
+
+
+@settings(max_examples=500)
+@given(sweeps_and_thresholds())
+def test_find_peaks_matches_reference(
+    sweep_and_threshold: t.Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]
+) -> None:
+    abs_sweep, threshold = sweep_and_threshold
+    assert find_peaks(abs_sweep, threshold) == _reference_find_peaks(abs_sweep, threshold)
+
+
+@settings(max_examples=200)
+@given(st.integers(1, 4).flatmap(lambda n: sweeps_and_thresholds(num_sweeps=n)))
+def test_find_peaks_mask_on_many_sweeps(
+    sweeps_and_thresholds: t.Tuple[npt.NDArray[np.float_], npt.NDArray[np.float_]]
+) -> None:
+    abs_sweeps, thresholds = sweeps_and_thresholds
+    mask = find_peaks_mask(abs_sweeps, thresholds)
+
+    assert mask.shape == abs_sweeps.shape
+    for sweep_mask, abs_sweep, threshold in zip(mask, abs_sweeps, thresholds):
+        assert np.flatnonzero(sweep_mask).tolist() == _reference_find_peaks(abs_sweep, threshold)
+
+
+def test_find_peaks_mask_broadcasts_threshold() -> None:
+    abs_sweeps = np.array([[1, 2, 3, 2, 1], [1, 3, 1, 2, 1]], dtype=float)
+    threshold = np.array([0, 0, 0, 0, np.nan])
+
+    np.testing.assert_array_equal(
+        find_peaks_mask(abs_sweeps, threshold),
+        [[False, False, True, False, False], [False, True, False, False, False]],
+    )
+
+
+@pytest.mark.parametrize(
+    ("abs_sweep", "threshold", "expected"),
+    [
+        ([1, 2, 2, 2, 1, 0], [0, 0, 0, 0, 0, 0], [1]),  # plateau
+        ([1, 2, 2, 3, 1, 0], [0, 0, 0, 0, 0, 0], [3]),  # rising plateau
+        ([1, 2, 2, 2, 2], [0, 0, 0, 0, 0], []),  # plateau until the end
+        ([1, 2, 2, 1, 1], [0, 0, np.nan, 0, 0], []),  # plateau into a NaN threshold
+        ([1, 2, 1, 2, 1], [0, 0, 0, 0, np.nan], [1]),  # stops before a NaN threshold
+        # Below the threshold, every other point is skipped. Whether the point before a NaN
+        # threshold is skipped decides if the search stops there.
+        ([0, 0, 0, 0, 0, 0, 1, 2, 1, 0], [0, 0, 0, 0, np.nan, 0, 0, 0, 0, 0], []),
+        ([0, 0, 0, 0, 0, 0, 0, 1, 2, 1, 0], [0, 0, 0, 0, 0, np.nan, 0, 0, 0, 0, 0], [8]),
+    ],
+)
+def test_find_peaks_edge_cases(
+    abs_sweep: list[float], threshold: list[float], expected: list[int]
+) -> None:
+    abs_sweep_array = np.array(abs_sweep, dtype=float)
+    threshold_array = np.array(threshold, dtype=float)
+
+    assert _reference_find_peaks(abs_sweep_array, threshold_array) == expected
+    assert find_peaks(abs_sweep_array, threshold_array) == expected
+
+
+def test_find_peaks_requires_a_threshold() -> None:
+    with pytest.raises(ValueError):
+        find_peaks(np.ones(5), None)  # type: ignore[arg-type]
+
+
+@settings(max_examples=500)
+@given(st.lists(st.floats(0, 1e4), min_size=3, max_size=50), st.data())
+def test_interpolate_peaks_matches_reference(values: list[float], data: st.DataObject) -> None:
+    abs_sweep = np.array(values)
+    peak_idxs = data.draw(st.lists(st.integers(1, len(values) - 2), max_size=5))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = _reference_interpolate_peaks(abs_sweep, peak_idxs, 100, 2, 2.5e-3)
+        actual = interpolate_peaks(abs_sweep, peak_idxs, 100, 2, 2.5e-3)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_interpolate_peaks_array_on_many_sweeps() -> None:
+    abs_sweeps = np.array([[1, 2, 3, 2, 1], [1, 3, 3, 1, 0]], dtype=float)
+    peak_idxs = np.nonzero(find_peaks_mask(abs_sweeps, np.zeros(5)))
+
+    distances, amplitudes = interpolate_peaks_array(abs_sweeps, peak_idxs, 0, 1, 0.0025)
+
+    np.testing.assert_allclose(distances, [0.005, 0.00375])
+    np.testing.assert_allclose(amplitudes, [3, 3.25])
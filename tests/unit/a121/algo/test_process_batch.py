@@ -0,0 +1,113 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+from acconeer.exptool.a121._core.entities.containers.result import ResultContext
+from acconeer.exptool.a121.algo import phase_tracking, sparse_iq
+
+
+def _results(metadata: a121.Metadata, amplitudes: list[int], seed: int) -> list[a121.Result]:
+    rng = np.random.default_rng(seed)
+    results = []
+    for tick, amplitude in enumerate(amplitudes):
+        frame = np.empty(metadata.frame_shape, dtype=INT_16_COMPLEX)
+        frame["real"] = rng.integers(-amplitude, amplitude, size=metadata.frame_shape)
+        frame["imag"] = rng.integers(-amplitude, amplitude, size=metadata.frame_shape)
+        results.append(
+            a121.Result(
+                data_saturated=False,
+                frame_delayed=False,
+                calibration_needed=False,
+                temperature=25,
+                tick=tick,
+                frame=frame,
+                context=ResultContext(metadata=metadata, ticks_per_second=1000000),
+            )
+        )
+    return results
+
+
+@pytest.mark.parametrize("amplitude_method", list(sparse_iq.AmplitudeMethod))
+def test_sparse_iq(amplitude_method: sparse_iq.AmplitudeMethod) -> None:
+    session_config = a121.SessionConfig(
+        [
+            {
+                1: a121.SensorConfig(
+                    subsweeps=[
+                        a121.SubsweepConfig(num_points=10),
+                        a121.SubsweepConfig(num_points=5),
+                    ],
+                    sweeps_per_frame=8,
+                ),
+                2: a121.SensorConfig(num_points=7, sweeps_per_frame=4),
+            },
+            {1: a121.SensorConfig(num_points=3)},
+        ],
+        extended=True,
+    )
+    extended_metadata = MockClient._session_config_to_metadata(session_config)
+    extended_results = [
+        {
+            sensor_id: _results(metadata, [1000] * 6, sensor_id)
+            for sensor_id, metadata in group.items()
+        }
+        for group in extended_metadata
+    ]
+    processor = sparse_iq.Processor(
+        session_config=session_config,
+        processor_config=sparse_iq.ProcessorConfig(amplitude_method=amplitude_method),
+    )
+
+    expected = [
+        processor.process(
+            [
+                {sensor_id: results[i] for sensor_id, results in group.items()}
+                for group in extended_results
+            ]
+        )
+        for i in range(6)
+    ]
+    actual = processor.process_batch(
+        [
+            {
+                sensor_id: a121.StackedResults.from_results(results)
+                for sensor_id, results in group.items()
+            }
+            for group in extended_results
+        ]
+    )
+
+    assert actual == expected
+
+
+def test_phase_tracking() -> None:
+    sensor_config = phase_tracking.get_sensor_config()
+    metadata = MockClient._session_config_to_metadata(a121.SessionConfig(sensor_config))[0][1]
+
+    # Switch between frames below and above the threshold
+    results = _results(metadata, [5] * 10 + [50] * 10 + [5] * 5 + [50] * 15, seed=1)
+    stacked_results = a121.StackedResults.from_results(results)
+
+    def processor() -> phase_tracking.Processor:
+        return phase_tracking.Processor(
+            sensor_config=sensor_config,
+            metadata=metadata,
+            processor_config=phase_tracking.ProcessorConfig(),
+        )
+
+    reference_processor = processor()
+    expected = [reference_processor.process(result) for result in results]
+
+    batch_processor = processor()
+    actual = batch_processor.process_batch(stacked_results[:13])
+    actual += batch_processor.process_batch(stacked_results[13:])
+
+    assert actual == expected
+    assert any(result.peak_loc_m is not None for result in actual)
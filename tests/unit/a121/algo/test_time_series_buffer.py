@@ -0,0 +1,73 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from acconeer.exptool.a121.algo import TimeSeriesBuffer
+
+
+@given(st.integers(1, 20), st.lists(st.integers(0, 20), max_size=20), st.booleans())
+def test_extend_matches_rolling(length: int, num_samples: list[int], unwrap: bool) -> None:
+    rng = np.random.default_rng(length)
+    buffer = TimeSeriesBuffer(length, (2,), unwrap=unwrap)
+    expected = np.zeros((length, 2))
+
+    # Replacing the whole time series at once made np.unwrap start over
+    for n in [min(n, length - 1) for n in num_samples]:
+        samples = rng.uniform(-np.pi, np.pi, size=(n, 2))
+        buffer.extend(samples)
+
+        # How time series used to be kept
+        expected = np.roll(expected, -n, axis=0)
+        if n > 0:
+            expected[-n:] = samples
+        if unwrap:
+            expected = np.unwrap(expected, axis=0)
+
+        assert buffer.data.flags.c_contiguous
+        np.testing.assert_array_equal(buffer.data, expected)
+
+
+def test_append() -> None:
+    buffer = TimeSeriesBuffer(3, dtype=np.complex_)
+
+    for value in [1j, 2j, 3j, 4j]:
+        buffer.append(value)
+
+    np.testing.assert_array_equal(buffer.data, [2j, 3j, 4j])
+    assert buffer.latest == 4j
+    assert len(buffer) == 3
+
+
+def test_unwrap_continues_from_latest_sample() -> None:
+    buffer = TimeSeriesBuffer(4, unwrap=True)
+
+    buffer.extend([3.0, -3.0])
+    buffer.extend([3.0])
+
+    np.testing.assert_allclose(buffer.data, [0.0, 3.0, 2 * np.pi - 3.0, 3.0])
+
+
+def test_extend_with_more_samples_than_length() -> None:
+    buffer = TimeSeriesBuffer(3, unwrap=True)
+
+    buffer.extend([1.0, 2.0, 3.0, -3.0, -2.0])
+
+    np.testing.assert_allclose(buffer.data, [3.0, 2 * np.pi - 3.0, 2 * np.pi - 2.0])
+
+
+def test_data_is_read_only() -> None:
+    buffer = TimeSeriesBuffer(4)
+
+    with pytest.raises(ValueError):
+        buffer.data[0] = 1.0
+
+
+def test_requires_positive_length() -> None:
+    with pytest.raises(ValueError):
+        TimeSeriesBuffer(0)
@@ -1,18 +1,22 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 from __future__ import annotations
 
 import typing as t
 
+import numpy as np
 import pytest
 
+from acconeer.exptool import a121
 from acconeer.exptool._core.communication.communication_protocol import messages
+from acconeer.exptool._core.int_16_complex import INT_16_COMPLEX
 from acconeer.exptool.a121._core.communication.exploration_protocol import (
     ExplorationProtocol,
 )
 from acconeer.exptool.a121._core.communication.exploration_protocol import (
     messages as a121_messages,
 )
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
 
 
 class TestResultMessage:
@@ -59,3 +63,58 @@ class TestResultMessage:
 
     def test_apply(self) -> None:
         pytest.skip("Hard to unit test. Relies on system tests for correctness.")
+
+
+class TestFrameBlobLayout:
+    @pytest.fixture
+    def session_config(self) -> a121.SessionConfig:
+        return a121.SessionConfig(
+            [
+                {
+                    1: a121.SensorConfig(num_points=10, sweeps_per_frame=3),
+                    2: a121.SensorConfig(num_points=5),
+                },
+                {
+                    1: a121.SensorConfig(
+                        sweeps_per_frame=2,
+                        subsweeps=[a121.SubsweepConfig(num_points=4) for _ in range(2)],
+                    ),
+                },
+            ],
+            extended=True,
+        )
+
+    def test_divide(self, session_config: a121.SessionConfig) -> None:
+        extended_metadata = MockClient._session_config_to_metadata(session_config)
+        layout = a121_messages.FrameBlobLayout.from_metadata(extended_metadata)
+
+        assert layout.num_elements == 30 + 5 + 16
+        assert [[(sensor_id, offset) for sensor_id, offset, _ in g] for g in layout.groups] == [
+            [(1, 0), (2, 30)],
+            [(1, 35)],
+        ]
+
+        data = np.zeros(layout.num_elements, dtype=INT_16_COMPLEX)
+        data["real"] = np.arange(layout.num_elements)
+        data["imag"] = -np.arange(layout.num_elements)
+        frame_blob = bytearray(data.tobytes())
+
+        extended_frames = layout.divide(frame_blob)
+
+        assert extended_frames[0][1].shape == (3, 10)
+        assert extended_frames[0][2].shape == (1, 5)
+        assert extended_frames[1][1].shape == (2, 8)
+        np.testing.assert_array_equal(extended_frames[0][2]["real"], [[30, 31, 32, 33, 34]])
+        np.testing.assert_array_equal(extended_frames[1][1]["imag"].flat, -np.arange(35, 51))
+
+        blob_array = np.frombuffer(frame_blob, dtype=np.uint8)
+        for group in extended_frames:
+            for frame in group.values():
+                assert np.shares_memory(frame, blob_array)
+
+    def test_divide_raises_on_too_short_blob(self, session_config: a121.SessionConfig) -> None:
+        extended_metadata = MockClient._session_config_to_metadata(session_config)
+        layout = a121_messages.FrameBlobLayout.from_metadata(extended_metadata)
+
+        with pytest.raises(ValueError):
+            layout.divide(bytes(4 * (layout.num_elements - 1)))
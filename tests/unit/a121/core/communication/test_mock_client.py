@@ -0,0 +1,185 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication import MockClient
+
+
+@pytest.fixture
+def session_config() -> a121.SessionConfig:
+    return a121.SessionConfig(
+        [
+            {
+                1: a121.SensorConfig(
+                    sweeps_per_frame=4,
+                    subsweeps=[
+                        a121.SubsweepConfig(start_point=0, num_points=20),
+                        a121.SubsweepConfig(start_point=100, num_points=30, step_length=2),
+                        a121.SubsweepConfig(num_points=5, enable_loopback=True),
+                        a121.SubsweepConfig(num_points=5, enable_tx=False),
+                    ],
+                ),
+            },
+            {2: a121.SensorConfig(num_points=40), 3: a121.SensorConfig(num_points=10)},
+        ],
+        extended=True,
+    )
+
+
+def _get_frames(client: MockClient, num_frames: int) -> list[list[dict[int, Any]]]:
+    return [client.get_next() for _ in range(num_frames)]  # type: ignore[misc]
+
+
+def test_results_match_metadata(session_config: a121.SessionConfig) -> None:
+    client = MockClient(unthrottled=True)
+    client.setup_session(session_config)
+    client.start_session()
+
+    (extended_result,) = _get_frames(client, 1)
+    for group, metadata_group in zip(extended_result, client.extended_metadata):
+        assert group.keys() == metadata_group.keys()
+        for sensor_id, result in group.items():
+            assert result.frame.shape == metadata_group[sensor_id].frame_shape
+
+    client.close()
+
+
+def test_frames_are_the_mock_profile_with_noise(session_config: a121.SessionConfig) -> None:
+    client = MockClient(unthrottled=True)
+    client.setup_session(session_config)
+    client.start_session()
+
+    frames = np.array([r[0][1].frame for r in _get_frames(client, 500)])
+    sensor_config = session_config.groups[0][1]
+    expected_profile = np.concatenate(
+        [MockClient._get_mock_profile(1, subsweep) for subsweep in sensor_config.subsweeps]
+    )
+
+    noise = frames - expected_profile
+    # Casting to int16 truncates, which gives a slight bias towards zero
+    assert np.abs(noise.mean(axis=(0, 1))).max() < 5
+    assert noise.real.std() == pytest.approx(MockClient.NOISE_AMPLITUDE, rel=0.1)
+    assert noise.imag.std() == pytest.approx(MockClient.NOISE_AMPLITUDE, rel=0.1)
+
+    client.close()
+
+
+def test_unthrottled_ignores_max_update_rate(session_config: a121.SessionConfig) -> None:
+    client = MockClient(unthrottled=True)
+    client.setup_session(session_config)
+    client.start_session()
+
+    num_frames = 200
+    start = time.perf_counter()
+    _get_frames(client, num_frames)
+    duration = time.perf_counter() - start
+
+    assert duration < num_frames / MockClient.MAX_MOCK_UPDATE_RATE_HZ
+
+    client.close()
+
+
+def test_open_can_create_an_unthrottled_mock_client() -> None:
+    client = a121.Client.open(mock=True, unthrottled=True)
+
+    assert isinstance(client, MockClient)
+    assert client._unthrottled
+    client.close()
+
+
+def test_open_rejects_unthrottled_without_mock() -> None:
+    with pytest.raises(ValueError):
+        a121.Client.open(ip_address="localhost", unthrottled=True)
+
+
+def test_get_next_batch(session_config: a121.SessionConfig) -> None:
+    client = MockClient(unthrottled=True)
+    client.setup_session(session_config)
+    client.start_session()
+
+    extended_stacked_results = client.get_next_batch(10)
+    assert isinstance(extended_stacked_results, list)
+
+    for group, metadata_group in zip(extended_stacked_results, client.extended_metadata):
+        assert group.keys() == metadata_group.keys()
+        for sensor_id, stacked_results in group.items():
+            assert len(stacked_results) == 10
+            assert stacked_results.frame.shape == (10, *metadata_group[sensor_id].frame_shape)
+            assert stacked_results.tick.shape == (10,)
+
+    with pytest.raises(ValueError):
+        client.get_next_batch(0)
+
+    client.close()
+
+
+def test_get_next_batch_not_extended() -> None:
+    client = MockClient(unthrottled=True)
+    client.setup_session(a121.SensorConfig(num_points=10))
+
+    with pytest.raises(a121.ClientError):
+        client.get_next_batch(2)
+
+    client.start_session()
+    stacked_results = client.get_next_batch(5)
+
+    assert isinstance(stacked_results, a121.StackedResults)
+    assert stacked_results.frame.shape == (5, 1, 10)
+
+    client.close()
+
+
+def test_throttled_get_next_batch_follows_update_rate() -> None:
+    client = MockClient()
+    client.setup_session(a121.SensorConfig(num_points=10, frame_rate=50.0))
+    client.start_session()
+
+    start = time.perf_counter()
+    stacked_results = client.get_next_batch(10)
+    duration = time.perf_counter() - start
+    assert isinstance(stacked_results, a121.StackedResults)
+
+    assert duration == pytest.approx(9 / 50, abs=0.05)
+    np.testing.assert_allclose(np.diff(stacked_results.tick_time), 1 / 50, atol=1e-5)
+
+    stacked_results = client.get_next_batch(100, timeout=0.1)
+    assert isinstance(stacked_results, a121.StackedResults)
+    assert 1 <= len(stacked_results) < 100
+
+    client.close()
+
+
+def test_profiler_times_recording(session_config: a121.SessionConfig, tmp_path: Path) -> None:
+    client = MockClient(unthrottled=True)
+    profiler = a121.StageProfiler()
+    client.attach_profiler(profiler)
+    with pytest.raises(a121.ClientError):
+        client.attach_profiler(a121.StageProfiler())
+
+    client.setup_session(session_config)
+    client.start_session()
+    _get_frames(client, 2)
+    assert profiler.stats == {}
+    client.stop_session()
+
+    client.attach_recorder(a121.H5Recorder(tmp_path / "record.h5"))
+    client.start_session()
+    _get_frames(client, 3)
+    client.get_next_batch(4)
+    client.stop_session()
+    client.detach_recorder().close()  # type: ignore[union-attr]
+
+    assert client.detach_profiler() is profiler
+    assert client.profiler is None
+    assert profiler.stats["record"].count == 7
+
+    client.close()
@@ -0,0 +1,73 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication import MockClient
+
+
+def test_get_next_batch_replays_whole_record(tmp_path: Path) -> None:
+    path = tmp_path / "record.h5"
+    with MockClient(unthrottled=True) as client:
+        with a121.H5Recorder(path) as recorder:
+            client.attach_recorder(recorder)
+            client.setup_session(a121.SensorConfig(num_points=10, sweeps_per_frame=2))
+            client.start_session()
+            for _ in range(10):
+                client.get_next()
+            client.stop_session()
+            client.detach_recorder()
+
+    with a121.open_record(path) as record:
+        client = a121._ReplayingClient(record, realtime_replay=False)
+        client.setup_session(record.session_config)
+        client.start_session()
+
+        batches = []
+        while True:
+            try:
+                batch = client.get_next_batch(4)
+            except a121._StopReplay:
+                break
+
+            assert isinstance(batch, a121.StackedResults)
+            batches.append(batch)
+
+        client.stop_session()
+
+        assert [len(b) for b in batches] == [4, 4, 2]
+        np.testing.assert_array_equal(
+            np.concatenate([b.frame for b in batches]), record.stacked_results.frame
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([b.tick for b in batches]), record.stacked_results.tick
+        )
+
+
+def test_get_next_batch_mixed_with_get_next(tmp_path: Path) -> None:
+    path = tmp_path / "record.h5"
+    with MockClient(unthrottled=True) as client:
+        with a121.H5Recorder(path) as recorder:
+            client.attach_recorder(recorder)
+            client.setup_session(a121.SensorConfig(num_points=10))
+            client.start_session()
+            for _ in range(3):
+                client.get_next()
+            client.stop_session()
+            client.detach_recorder()
+
+    with a121.open_record(path) as record:
+        client = a121._ReplayingClient(record, realtime_replay=False)
+        client.start_session()
+
+        client.get_next()
+        assert len(client.get_next_batch(5)) == 2
+
+        with pytest.raises(a121._StopReplay):
+            client.get_next_batch(5)
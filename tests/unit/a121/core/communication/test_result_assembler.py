@@ -0,0 +1,141 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import a121
+from acconeer.exptool._core.profiling import StageProfiler
+from acconeer.exptool.a121._core.communication.exploration_client import (
+    ResultAssembler,
+    TickUnwrapper,
+)
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages import (
+    FrameBlobLayout,
+    ResultMessage,
+)
+from acconeer.exptool.a121._core.communication.exploration_protocol.messages.result_message import (
+    ResultInfoDict,
+)
+from acconeer.exptool.a121._core.communication.mock_client import MockClient
+
+
+TICKS_PER_SECOND = 1000000
+
+
+@pytest.fixture
+def session_config() -> a121.SessionConfig:
+    return a121.SessionConfig(
+        [
+            {
+                2: a121.SensorConfig(num_points=10, sweeps_per_frame=3),
+                1: a121.SensorConfig(num_points=5),
+            },
+            {3: a121.SensorConfig(num_points=4)},
+        ],
+        extended=True,
+    )
+
+
+def _result_message(ticks: list[list[int]], num_elements: int, seed: int) -> ResultMessage:
+    rng = np.random.default_rng(seed)
+    grouped_result_infos = [
+        [
+            ResultInfoDict(
+                tick=tick,
+                data_saturated=bool(rng.integers(2)),
+                frame_delayed=False,
+                calibration_needed=False,
+                temperature=int(rng.integers(-40, 85)),
+            )
+            for tick in group_ticks
+        ]
+        for group_ticks in ticks
+    ]
+    frame_blob = bytearray(rng.integers(0, 256, size=4 * num_elements, dtype=np.uint8))
+    return ResultMessage(grouped_result_infos, frame_blob)
+
+
+def test_assemble_matches_get_extended_results(session_config: a121.SessionConfig) -> None:
+    extended_metadata = MockClient._session_config_to_metadata(session_config)
+    num_elements = FrameBlobLayout.from_metadata(extended_metadata).num_elements
+    assembler = ResultAssembler(extended_metadata, TICKS_PER_SECOND, TickUnwrapper())
+    reference_unwrapper = TickUnwrapper()
+
+    ticks = [
+        [[10, 20], [30]],
+        [[2**32 - 10, 2**32 - 5], [1]],  # wraps within an extended result
+        [[5, 15], [25]],
+    ]
+
+    for seed, message_ticks in enumerate(ticks):
+        message = _result_message(message_ticks, num_elements, seed)
+
+        expected = reference_unwrapper.unwrap_ticks(
+            message.get_extended_results(
+                tps=TICKS_PER_SECOND,
+                metadata=extended_metadata,
+                config_groups=session_config.groups,
+            )
+        )
+
+        assert assembler.assemble(message) == expected
+
+
+def test_ticks_keep_increasing_over_wraps(session_config: a121.SessionConfig) -> None:
+    extended_metadata = MockClient._session_config_to_metadata(session_config)
+    num_elements = FrameBlobLayout.from_metadata(extended_metadata).num_elements
+    assembler = ResultAssembler(extended_metadata, TICKS_PER_SECOND, TickUnwrapper())
+
+    first = assembler.assemble(_result_message([[2**32 - 2, 2**32 - 1], [0]], num_elements, 0))
+    second = assembler.assemble(_result_message([[1, 2], [3]], num_elements, 1))
+
+    assert [r.tick for r in first[0].values()] == [2**32 - 2, 2**32 - 1]
+    assert first[1][3].tick == 2**32
+    assert [r.tick for r in second[0].values()] == [2**32 + 1, 2**32 + 2]
+    assert list(second[0].keys()) == [2, 1]
+
+
+def test_assemble_batch_matches_assemble(session_config: a121.SessionConfig) -> None:
+    extended_metadata = MockClient._session_config_to_metadata(session_config)
+    num_elements = FrameBlobLayout.from_metadata(extended_metadata).num_elements
+    assembler = ResultAssembler(extended_metadata, TICKS_PER_SECOND, TickUnwrapper())
+    batch_assembler = ResultAssembler(extended_metadata, TICKS_PER_SECOND, TickUnwrapper())
+
+    messages = [
+        _result_message(
+            [[tick % 2**32, (tick + 1) % 2**32], [(tick + 2) % 2**32]], num_elements, i
+        )
+        for i, tick in enumerate(range(2**32 - 20, 2**32 + 10, 5))
+    ]
+
+    expected = [assembler.assemble(message) for message in messages]
+    extended_stacked_results = batch_assembler.assemble_batch(messages)
+
+    for group_idx, group in enumerate(extended_stacked_results):
+        for sensor_id, stacked_results in group.items():
+            assert stacked_results.frame.flags.c_contiguous
+            assert stacked_results == a121.StackedResults.from_results(
+                [extended_results[group_idx][sensor_id] for extended_results in expected]
+            )
+
+
+def test_profiler_times_unwrapping_and_assembling(session_config: a121.SessionConfig) -> None:
+    extended_metadata = MockClient._session_config_to_metadata(session_config)
+    num_elements = FrameBlobLayout.from_metadata(extended_metadata).num_elements
+    profiler = StageProfiler()
+    assembler = ResultAssembler(
+        extended_metadata, TICKS_PER_SECOND, TickUnwrapper(), profiler=profiler
+    )
+    messages = [_result_message([[i, i + 1], [i + 2]], num_elements, i) for i in range(3)]
+
+    for message in messages:
+        assembler.assemble(message)
+    assembler.assemble_batch(messages)
+
+    assert {stage: s.count for stage, s in profiler.stats.items()} == {
+        "unwrap_ticks": 4,
+        "assemble_results": 4,
+    }
@@ -1,7 +1,8 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 from __future__ import annotations
 
+import pickle
 import typing as t
 
 import numpy as np
@@ -102,5 +103,73 @@ def test_subframes(good_result: a121.Result) -> None:
         assert np.array_equal(actual, expected)
 
 
+def test_frame_is_converted_once_and_read_only(good_result: a121.Result) -> None:
+    frame = good_result.frame
+
+    assert good_result.frame is frame
+    assert not frame.flags.writeable
+
+    with pytest.raises(ValueError):
+        frame[0, 0] = 0
+
+
+def test_complex64_frame(good_result: a121.Result) -> None:
+    frame = good_result.get_frame(np.complex64)
+
+    assert frame.dtype == np.complex64
+    np.testing.assert_array_equal(frame, good_result.frame)
+    assert good_result.get_frame(np.complex64) is frame
+
+    for subframe, expected in zip(good_result.get_subframes(np.complex64), good_result.subframes):
+        assert subframe.dtype == np.complex64
+        np.testing.assert_array_equal(subframe, expected)
+
+
+def test_subframes_are_split_once(good_result: a121.Result) -> None:
+    subframes = good_result.subframes
+
+    assert good_result.subframes is not subframes
+    for actual, cached in zip(good_result.subframes, subframes):
+        assert actual is cached
+
+
+@pytest.mark.parametrize("subsweep_indexes", [[0], [1], [0, 1], [1, 0]])
+def test_concatenated_subframes(good_result: a121.Result, subsweep_indexes: list[int]) -> None:
+    expected = np.concatenate([good_result.subframes[i] for i in subsweep_indexes], axis=1)
+
+    np.testing.assert_array_equal(
+        good_result.get_concatenated_subframes(subsweep_indexes), expected
+    )
+    np.testing.assert_array_equal(
+        good_result.get_concatenated_subframes(subsweep_indexes, np.complex64), expected
+    )
+
+
+def test_concatenated_adjacent_subframes_is_a_view(good_result: a121.Result) -> None:
+    frame = good_result.get_concatenated_subframes([0, 1])
+
+    assert np.shares_memory(frame, good_result.frame)
+    assert not frame.flags.writeable
+
+
+def test_concatenated_subframes_requires_an_index(good_result: a121.Result) -> None:
+    with pytest.raises(ValueError):
+        good_result.get_concatenated_subframes([])
+
+
+def test_cached_frames_are_not_pickled(good_result: a121.Result) -> None:
+    num_bytes = len(pickle.dumps(good_result))
+    _ = good_result.frame
+    _ = good_result.get_subframes(np.complex64)
+
+    assert len(pickle.dumps(good_result)) == num_bytes
+
+    unpickled = pickle.loads(pickle.dumps(good_result))
+    assert unpickled == good_result
+    assert unpickled._complex_frames == {}
+    assert unpickled._subframes == {}
+    np.testing.assert_array_equal(unpickled.frame, good_result.frame)
+
+
 def test_tick_time(good_result: a121.Result) -> None:
     assert np.isclose(good_result.tick_time, 1.5)
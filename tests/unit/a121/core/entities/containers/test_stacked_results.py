@@ -1,6 +1,8 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
+import pickle
+
 import numpy as np
 import pytest
 
@@ -240,6 +242,32 @@ class TestStackedResultWithMultipleFrames:
         np.testing.assert_array_equal(expected_subframe1, subframe1)
         np.testing.assert_array_equal(expected_subframe2, subframe2)
 
+    def test_concatenates_subframes(self, stacked_results: StackedResults) -> None:
+        np.testing.assert_array_equal(
+            stacked_results.get_concatenated_subframes([1, 0]),
+            np.array(
+                [
+                    [[2 + 2j, 1 + 1j]],
+                    [[4 + 4j, 3 + 3j]],
+                ]
+            ),
+        )
+        np.testing.assert_array_equal(
+            stacked_results.get_concatenated_subframes([0, 1]), stacked_results.frame
+        )
+
+    def test_cached_frames_are_not_pickled(self, stacked_results: StackedResults) -> None:
+        num_bytes = len(pickle.dumps(stacked_results))
+        _ = stacked_results.frame
+        _ = stacked_results.subframes
+
+        assert len(pickle.dumps(stacked_results)) == num_bytes
+
+        unpickled = pickle.loads(pickle.dumps(stacked_results))
+        assert unpickled == stacked_results
+        assert unpickled._complex_frames == {}
+        np.testing.assert_array_equal(unpickled.frame, stacked_results.frame)
+
     def test_is_indexable_and_returns_correct_result(
         self, stacked_results: StackedResults, result1: Result, result2: Result
     ) -> None:
@@ -248,3 +276,17 @@ class TestStackedResultWithMultipleFrames:
 
     def test_reports_the_number_of_results_in_len(self, stacked_results: StackedResults) -> None:
         assert len(stacked_results) == 2
+
+    def test_can_be_created_from_results(
+        self, stacked_results: StackedResults, result1: Result, result2: Result
+    ) -> None:
+        assert StackedResults.from_results([result1, result2]) == stacked_results
+
+    def test_is_sliceable_and_returns_stacked_results(
+        self, stacked_results: StackedResults, result2: Result
+    ) -> None:
+        sliced = stacked_results[1:]
+
+        assert isinstance(sliced, StackedResults)
+        assert len(sliced) == 1
+        assert sliced[0] == result2
@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 """
@@ -73,6 +73,27 @@ def test_extended_results(
                     np.testing.assert_array_equal(result.frame, ref_frame)
 
 
+@pytest.mark.parametrize("block_size", [1, 2, 1000])
+def test_iter_extended_results_in_blocks(ref_record: a121.H5Record, block_size: int) -> None:
+    # ref_record is setup to have multiple identical sessions
+    for i in range(ref_record.num_sessions):
+        session = ref_record.session(i)
+        block_results = list(session.iter_extended_results(block_size=block_size))
+
+        assert len(block_results) == session.num_frames
+
+        for frame_no, extended_result in enumerate(block_results):
+            for group, stacked_group in zip(extended_result, session.extended_stacked_results):
+                assert group.keys() == stacked_group.keys()
+                for sensor_id, result in group.items():
+                    assert result == stacked_group[sensor_id][frame_no]
+
+
+def test_iter_extended_results_rejects_bad_block_size(ref_record: a121.H5Record) -> None:
+    with pytest.raises(ValueError):
+        next(ref_record.session(0).iter_extended_results(block_size=0))
+
+
 def test_num_frames(ref_record: a121.Record, ref_num_frames: int) -> None:
     # ref_record is setup to have multiple identical sessions
     for i in range(ref_record.num_sessions):
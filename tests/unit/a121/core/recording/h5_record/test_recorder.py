@@ -1,16 +1,22 @@
-# Copyright (c) Acconeer AB, 2022-2023
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 from __future__ import annotations
 
+import subprocess
+import sys
+import textwrap
 from pathlib import Path
 from typing import Optional
 
 import h5py
+import numpy as np
 import pytest
 
 import acconeer.exptool
 from acconeer.exptool import a121
+from acconeer.exptool.a121._core.communication import MockClient
+from acconeer.exptool.a121._core.recording.h5_record.record import H5SessionRecord
 from acconeer.exptool.utils import get_module_version
 
 
@@ -81,13 +87,15 @@ def test_start_can_only_be_called_once(
         r._start(client_info=ref_client_info, server_info=ref_server_info)
 
 
+@pytest.mark.parametrize("contiguous", [False, True])
 @pytest.mark.parametrize("chunk_size", [None, 1, 512])
 def test_sample_whole_record(
-    tmp_path: Path, ref_record: a121.Record, chunk_size: Optional[int]
+    tmp_path: Path, ref_record: a121.Record, chunk_size: Optional[int], contiguous: bool
 ) -> None:
     filename = tmp_path / "empty.h5"
     with a121.H5Recorder(
         filename,
+        contiguous=contiguous,
         _lib_version=ref_record.lib_version,
         _timestamp=ref_record.timestamp,
         _uuid=ref_record.uuid,
@@ -118,3 +126,145 @@ def test_sample_whole_record(
 
     record = a121.load_record(filename)
     assert_record_equals(record, ref_record)
+
+
+def test_contiguous_record_is_memory_mapped(tmp_path: Path, ref_record: a121.Record) -> None:
+    filename = tmp_path / "contiguous.h5"
+    with a121.H5Recorder(filename, contiguous=True) as recorder:
+        recorder._start(
+            client_info=ref_record.client_info,
+            server_info=ref_record.server_info,
+        )
+        session = ref_record.session(0)
+        recorder._start_session(
+            config=session.session_config,
+            metadata=session.extended_metadata,
+        )
+        for extended_results in session.extended_results:
+            recorder._sample(extended_results)
+
+    with a121.open_record(filename) as record:
+        for group in record.session(0).extended_stacked_results:
+            for stacked_results in group.values():
+                assert isinstance(stacked_results._frame.base, np.memmap)
+                assert isinstance(stacked_results.tick.base, np.memmap)
+
+
+def test_contiguous_record_has_no_unused_space(tmp_path: Path) -> None:
+    client = MockClient(unthrottled=True)
+    client.setup_session(a121.SensorConfig(num_points=100, sweeps_per_frame=32))
+    client.attach_recorder(a121.H5Recorder(tmp_path / "contiguous.h5", contiguous=True))
+    client.start_session()
+    client.get_next_batch(300)
+    client.stop_session()
+    client.detach_recorder().close()  # type: ignore[union-attr]
+    client.close()
+
+    frame_nbytes = 300 * 100 * 32 * 4
+    assert (tmp_path / "contiguous.h5").stat().st_size < 1.1 * frame_nbytes
+    assert list(tmp_path.iterdir()) == [tmp_path / "contiguous.h5"]
+
+
+def test_killed_contiguous_recording_leaves_its_results(tmp_path: Path) -> None:
+    record_path = tmp_path / "contiguous.h5"
+    script = textwrap.dedent(
+        f"""
+        import os
+        from acconeer.exptool import a121
+        from acconeer.exptool.a121._core.communication import MockClient
+
+        client = MockClient(unthrottled=True)
+        client.setup_session(a121.SensorConfig(num_points=10))
+        recorder = a121.H5Recorder({str(record_path)!r}, contiguous=True, _chunk_size=10)
+        client.attach_recorder(recorder)
+        client.start_session()
+        client.get_next_batch(50)
+        os._exit(0)
+        """
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    (scratch_path,) = tmp_path.glob("contiguous.h5.*.results")
+    with h5py.File(scratch_path, "r") as f:
+        frames = f["sessions/session_0/group_0/entry_0/result/frame"]
+        assert frames.shape == (50, 1, 10)
+
+
+def test_memory_maps_are_created_once(tmp_path: Path, ref_record: a121.Record) -> None:
+    filename = tmp_path / "contiguous.h5"
+    with a121.H5Recorder(filename, contiguous=True) as recorder:
+        recorder._start(
+            client_info=ref_record.client_info,
+            server_info=ref_record.server_info,
+        )
+        session = ref_record.session(0)
+        recorder._start_session(
+            config=session.session_config,
+            metadata=session.extended_metadata,
+        )
+        for extended_results in session.extended_results:
+            recorder._sample(extended_results)
+
+    with a121.open_record(filename) as record:
+        session_record = record.session(0)
+        assert isinstance(session_record, H5SessionRecord)
+
+        list(session_record.iter_extended_results(block_size=1))
+        memmaps = dict(session_record._memmaps)
+        list(session_record.iter_extended_results(block_size=1))
+
+        assert any(memmap is not None for memmap in memmaps.values())
+        assert session_record._memmaps == memmaps
+
+
+def test_compressed_record_is_not_memory_mapped(tmp_path: Path, ref_record: a121.Record) -> None:
+    filename = tmp_path / "compressed.h5"
+    a121.save_record(filename, ref_record)
+
+    with a121.open_record(filename) as record:
+        for group in record.session(0).extended_stacked_results:
+            for stacked_results in group.values():
+                assert not isinstance(stacked_results._frame.base, np.memmap)
+
+
+def test_threaded_recorder_writes_whole_record(tmp_path: Path, ref_record: a121.Record) -> None:
+    filename = tmp_path / "threaded.h5"
+    with a121.H5Recorder(
+        filename,
+        threaded=True,
+        queue_size=1,
+        _lib_version=ref_record.lib_version,
+        _timestamp=ref_record.timestamp,
+        _uuid=ref_record.uuid,
+    ) as recorder:
+        recorder._start(
+            client_info=ref_record.client_info,
+            server_info=ref_record.server_info,
+        )
+
+        for i in range(ref_record.num_sessions):
+            session = ref_record.session(i)
+            recorder._start_session(
+                config=session.session_config,
+                metadata=session.extended_metadata,
+                calibrations=session.calibrations,
+                calibrations_provided=session.calibrations_provided,
+            )
+
+            for extended_results in session.extended_results:
+                recorder._sample(extended_results)
+
+            recorder._stop_session()
+
+        stats = recorder.writer_stats
+        assert stats is not None
+        assert stats.queue_depth == 0
+        assert stats.num_written == ref_record.num_sessions * ref_record.session(0).num_frames
+
+    with a121.open_record(filename) as record:
+        assert_record_equals(record, ref_record)
+
+
+def test_writer_stats_is_none_when_not_threaded(tmp_path: Path) -> None:
+    with a121.H5Recorder(tmp_path / "not_threaded.h5") as recorder:
+        assert recorder.writer_stats is None
@@ -0,0 +1,81 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+import attrs
+
+from acconeer.exptool._core.communication.communication_protocol import Message
+from acconeer.exptool._core.communication.message_stream import MessageStream
+from acconeer.exptool._core.profiling import StageProfiler
+
+
+class _FakeLink:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    def recv_until(self, bs: bytes) -> bytes:
+        (received, _, self._data) = self._data.partition(bs)
+        return received
+
+    def recv_into(self, buffer: memoryview) -> None:
+        buffer[:] = self._data[: len(buffer)]
+        self._data = self._data[len(buffer) :]
+
+
+@attrs.frozen
+class _FakeMessage(Message):
+    header: dict[str, t.Any]
+    payload: bytes
+
+    @classmethod
+    def parse(cls, header: dict[str, t.Any], payload: bytes) -> _FakeMessage:
+        return cls(header, bytes(payload))
+
+
+class _FakeProtocol:
+    end_sequence = b"\n"
+
+    @classmethod
+    def parse_message(cls, header: dict[str, t.Any], payload: bytes) -> Message:
+        return _FakeMessage.parse(header, payload)
+
+
+def _raise(exception: Exception) -> t.NoReturn:
+    raise exception
+
+
+def _message_stream(messages: list[tuple[dict[str, t.Any], bytes]]) -> MessageStream:
+    data = b"".join(json.dumps(header).encode() + b"\n" + payload for header, payload in messages)
+    return MessageStream(
+        _FakeLink(data),  # type: ignore[arg-type]
+        _FakeProtocol,  # type: ignore[arg-type]
+        message_handler=lambda _: None,
+        link_error_callback=_raise,
+    )
+
+
+def test_profiler_times_each_stage_of_a_message() -> None:
+    stream = _message_stream([({"payload_size": 3}, b"abc"), ({"status": "ok"}, b"")])
+    profiler = StageProfiler()
+    stream.profiler = profiler
+
+    assert stream.wait_for_message(_FakeMessage) == _FakeMessage({"payload_size": 3}, b"abc")
+    assert stream.wait_for_message(_FakeMessage) == _FakeMessage({"status": "ok"}, b"")
+
+    assert {stage: s.count for stage, s in profiler.stats.items()} == {
+        "read_header": 2,
+        "parse_header": 2,
+        "read_payload": 1,
+        "parse_message": 2,
+    }
+
+
+def test_messages_are_parsed_without_profiler() -> None:
+    stream = _message_stream([({"payload_size": 3}, b"abc")])
+
+    assert stream.wait_for_message(_FakeMessage) == _FakeMessage({"payload_size": 3}, b"abc")
+    assert stream.profiler is None
@@ -0,0 +1,139 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+import socket
+import threading
+
+import pytest
+
+from acconeer.exptool._core.communication.links import LinkError, ReceiveBuffer, SocketLink
+
+
+def test_read_consumes_from_the_front() -> None:
+    buf = ReceiveBuffer(capacity=8)
+    buf.extend(b"abcdef")
+
+    assert buf.read(2) == b"ab"
+    assert len(buf) == 4
+    assert buf.read(4) == b"cdef"
+    assert len(buf) == 0
+
+
+def test_read_returns_bytearray() -> None:
+    buf = ReceiveBuffer()
+    buf.extend(b"abc")
+
+    assert type(buf.read(3)) is bytearray
+
+
+def test_read_more_than_buffered_raises() -> None:
+    buf = ReceiveBuffer()
+    buf.extend(b"abc")
+
+    with pytest.raises(ValueError):
+        buf.read(4)
+
+
+def test_extend_compacts_and_grows() -> None:
+    buf = ReceiveBuffer(capacity=4)
+    buf.extend(b"abc")
+    assert buf.read(2) == b"ab"
+
+    buf.extend(b"def")  # fits only after compacting
+    buf.extend(b"ghijklmnop")  # needs to grow
+
+    assert buf.read(len(buf)) == b"cdefghijklmnop"
+
+
+def test_fill() -> None:
+    buf = ReceiveBuffer(capacity=4)
+    buf.extend(b"ab")
+
+    def readinto(view: memoryview) -> int:
+        view[:3] = b"cde"
+        return 3
+
+    assert buf.fill(readinto, 16) == 3
+    assert buf.read(5) == b"abcde"
+
+
+def test_find() -> None:
+    buf = ReceiveBuffer()
+    buf.extend(b"xx")
+    assert buf.find(b"\n") == -1
+
+    buf.extend(b"x\nyy")
+    assert buf.find(b"\n") == 4
+    assert buf.read(4) == b"xxx\n"
+    assert buf.find(b"\n") == -1
+
+
+def test_find_multi_byte_sequence_split_between_extends() -> None:
+    buf = ReceiveBuffer()
+    buf.extend(b"abc\r")
+    assert buf.find(b"\r\n") == -1
+
+    buf.extend(b"\ndef")
+    assert buf.find(b"\r\n") == 5
+
+
+def test_read_into() -> None:
+    buf = ReceiveBuffer()
+    buf.extend(b"abc")
+
+    out = bytearray(5)
+    assert buf.read_into(memoryview(out)) == 3
+    assert out == b"abc\x00\x00"
+    assert len(buf) == 0
+
+
+@pytest.fixture
+def connected_socket_link():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    host, port = server.getsockname()
+
+    accepted = []
+    acceptor = threading.Thread(target=lambda: accepted.append(server.accept()[0]))
+    acceptor.start()
+
+    link = SocketLink(host, port)
+    link.connect()
+    acceptor.join()
+
+    yield link, accepted[0]
+
+    link.disconnect()
+    accepted[0].close()
+    server.close()
+
+
+def test_socket_link_recv_and_recv_until(connected_socket_link) -> None:
+    link, peer = connected_socket_link
+    peer.sendall(b'{"payload_size": 5}\nhello{"a": 1}\n')
+
+    assert link.recv_until(b"\n") == b'{"payload_size": 5}\n'
+    assert link.recv(5) == b"hello"
+    assert link.recv_until(b"\n") == b'{"a": 1}\n'
+
+
+def test_socket_link_recv_into(connected_socket_link) -> None:
+    link, peer = connected_socket_link
+    payload = bytes(range(256)) * 1000
+    peer.sendall(b"header\n" + payload)
+
+    assert link.recv_until(b"\n") == b"header\n"
+
+    out = bytearray(len(payload))
+    link.recv_into(memoryview(out))
+    assert out == payload
+
+
+def test_socket_link_raises_when_peer_closes(connected_socket_link) -> None:
+    link, peer = connected_socket_link
+    peer.sendall(b"abc")
+    peer.shutdown(socket.SHUT_RDWR)
+
+    with pytest.raises(LinkError):
+        link.recv(4)
@@ -1,9 +1,12 @@
-# Copyright (c) Acconeer AB, 2023
+# Copyright (c) Acconeer AB, 2023-2024
 # All rights reserved
 
+import numpy as np
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
-from acconeer.exptool._core.communication.unwrap_ticks import unwrap_ticks
+from acconeer.exptool._core.communication.unwrap_ticks import unwrap_ticks, unwrap_ticks_array
 
 
 @pytest.mark.parametrize(
@@ -35,3 +38,73 @@ def test_unwrap_ticks_special_cases():
 
     with pytest.raises(Exception):
         unwrap_ticks([100], None, limit=100)
+
+
+def _unwrap_ticks_sequentially(rows, minimum_tick, limit):
+    unwrapped_rows = []
+    for row in rows:
+        unwrapped_row, minimum_tick = unwrap_ticks(row, minimum_tick, limit=limit)
+        unwrapped_rows.append(unwrapped_row)
+    return unwrapped_rows, minimum_tick
+
+
+@st.composite
+def _tick_rows(draw, limit):
+    """Rows of ticks that move forward a bit between rows, possibly wrapping"""
+    num_entries = draw(st.integers(1, 5))
+    num_rows = draw(st.integers(1, 20))
+    tick = draw(st.integers(0, limit - 1))
+
+    rows = []
+    for _ in range(num_rows):
+        tick += draw(st.integers(0, limit // 4))
+        jitter = draw(
+            st.lists(st.integers(0, limit // 8), min_size=num_entries, max_size=num_entries)
+        )
+        rows.append([(tick + j) % limit for j in jitter])
+    return rows
+
+
+@pytest.mark.parametrize("limit", [100, 2**32])
+@given(data=st.data())
+def test_unwrap_ticks_array_is_equivalent_to_unwrap_ticks(limit, data):
+    rows = data.draw(_tick_rows(limit))
+    minimum_tick = data.draw(st.none() | st.integers(0, 5 * limit))
+
+    expected_rows, expected_minimum_tick = _unwrap_ticks_sequentially(rows, minimum_tick, limit)
+    unwrapped, new_minimum_tick = unwrap_ticks_array(rows, minimum_tick, limit=limit)
+
+    assert unwrapped.tolist() == expected_rows
+    assert new_minimum_tick == expected_minimum_tick
+
+
+@given(
+    rows=st.lists(
+        st.lists(st.integers(0, 99), min_size=3, max_size=3),
+        min_size=1,
+        max_size=20,
+    ),
+    minimum_tick=st.none() | st.integers(0, 1000),
+)
+def test_unwrap_ticks_array_is_equivalent_for_arbitrary_ticks(rows, minimum_tick):
+    expected_rows, expected_minimum_tick = _unwrap_ticks_sequentially(rows, minimum_tick, 100)
+    unwrapped, new_minimum_tick = unwrap_ticks_array(rows, minimum_tick, limit=100)
+
+    assert unwrapped.tolist() == expected_rows
+    assert new_minimum_tick == expected_minimum_tick
+
+
+def test_unwrap_ticks_array_special_cases():
+    unwrapped, minimum_tick = unwrap_ticks_array([10, 90, 30], None, limit=100)
+    assert unwrapped.tolist() == [10, 90, 130]
+    assert minimum_tick == 130
+
+    unwrapped, minimum_tick = unwrap_ticks_array(np.empty((0, 2)), 42, limit=100)
+    assert unwrapped.shape == (0, 2)
+    assert minimum_tick == 42
+
+    with pytest.raises(ValueError):
+        unwrap_ticks_array([[-1]], None, limit=100)
+
+    with pytest.raises(ValueError):
+        unwrap_ticks_array([[100]], None, limit=100)
@@ -0,0 +1,134 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import threading
+import typing as t
+
+import pytest
+
+from acconeer.exptool._core.recording.h5_record import SaverQueueFullError, ThreadedH5Saver
+
+
+class _FakeSaver:
+    def __init__(self) -> None:
+        self.samples: list[int] = []
+        self.stopped = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def _start(self) -> None:
+        pass
+
+    def _write_server_info(self, group: t.Any, server_info: t.Any) -> None:
+        pass
+
+    def _start_session(self, group: t.Any, *, config: t.Any, metadata: t.Any, **kwargs: t.Any):
+        pass
+
+    def _sample(self, group: t.Any, results: t.Iterable[int]) -> None:
+        self.gate.wait()
+        for result in results:
+            if result < 0:
+                raise RuntimeError("Negative result")
+            self.samples.append(result)
+
+    def _stop_session(self, group: t.Any) -> None:
+        self.stopped = True
+
+
+def test_all_results_are_written_in_order_when_stopping():
+    fake = _FakeSaver()
+    saver = ThreadedH5Saver(fake, queue_size=4)
+
+    saver._start_session(None, config=None, metadata=None)
+    for i in range(100):
+        saver._sample(None, [i])
+    saver._stop_session(None)
+
+    assert fake.samples == list(range(100))
+    assert fake.stopped
+    assert saver.stats.num_written == 100
+    assert saver.stats.num_dropped == 0
+    assert saver.stats.queue_depth == 0
+
+
+def test_drop_oldest_drops_results_when_writer_is_stalled():
+    fake = _FakeSaver()
+    fake.gate.clear()
+    saver = ThreadedH5Saver(fake, queue_size=2, back_pressure="drop_oldest")
+
+    saver._start_session(None, config=None, metadata=None)
+    for i in range(10):
+        saver._sample(None, [i])
+    fake.gate.set()
+    saver._stop_session(None)
+
+    assert saver.stats.num_dropped > 0
+    assert saver.stats.num_dropped + saver.stats.num_written == 10
+    assert fake.samples[-1] == 9
+
+
+def test_raise_raises_when_writer_is_stalled():
+    fake = _FakeSaver()
+    fake.gate.clear()
+    saver = ThreadedH5Saver(fake, queue_size=1, back_pressure="raise")
+
+    saver._start_session(None, config=None, metadata=None)
+    with pytest.raises(SaverQueueFullError):
+        for i in range(10):
+            saver._sample(None, [i])
+
+    fake.gate.set()
+    saver._stop_session(None)
+
+
+def test_writer_errors_are_raised_in_the_sampling_thread():
+    fake = _FakeSaver()
+    saver = ThreadedH5Saver(fake)
+
+    saver._start_session(None, config=None, metadata=None)
+    saver._sample(None, [-1])
+
+    with pytest.raises(RuntimeError, match="Negative result"):
+        saver._stop_session(None)
+
+
+def test_wrapped_saver_is_stopped_after_a_writer_error():
+    fake = _FakeSaver()
+    saver = ThreadedH5Saver(fake)
+
+    saver._start_session(None, config=None, metadata=None)
+    saver._sample(None, [1])
+    saver._sample(None, [-1])
+
+    with pytest.raises(RuntimeError, match="Negative result"):
+        saver._stop_session(None)
+
+    assert fake.samples == [1]
+    assert fake.stopped
+
+
+def test_raise_queues_no_part_of_a_sample_that_does_not_fit():
+    fake = _FakeSaver()
+    fake.gate.clear()
+    saver = ThreadedH5Saver(fake, queue_size=3, back_pressure="raise")
+
+    saver._start_session(None, config=None, metadata=None)
+    saver._sample(None, [0])
+
+    # The writer may hold the first result while waiting, leaving room for 2 or 3 results
+    with pytest.raises(SaverQueueFullError):
+        saver._sample(None, [1, 2, 3, 4])
+
+    fake.gate.set()
+    saver._stop_session(None)
+
+    assert fake.samples == [0]
+
+
+@pytest.mark.parametrize("kwargs", [{"queue_size": 0}, {"back_pressure": "ignore"}])
+def test_invalid_arguments_raise(kwargs):
+    with pytest.raises(ValueError):
+        ThreadedH5Saver(_FakeSaver(), **kwargs)
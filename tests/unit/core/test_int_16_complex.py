@@ -0,0 +1,59 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+import numpy as np
+import pytest
+
+from acconeer.exptool._core.int_16_complex import (
+    INT_16_COMPLEX,
+    complex_array_to_int16_complex,
+    int16_complex_array_to_complex,
+)
+
+
+@pytest.fixture
+def int16_complex_array():
+    rng = np.random.default_rng(0)
+    array = np.empty((4, 3, 10), dtype=INT_16_COMPLEX)
+    array["real"] = rng.integers(-(2**15), 2**15, size=array.shape)
+    array["imag"] = rng.integers(-(2**15), 2**15, size=array.shape)
+    return array
+
+
+def _reference_conversion(array):
+    return array["real"].astype(float) + 1j * array["imag"].astype(float)
+
+
+@pytest.mark.parametrize("dtype", [np.complex128, np.complex64])
+def test_conversion_matches_reference(int16_complex_array, dtype):
+    converted = int16_complex_array_to_complex(int16_complex_array, dtype=dtype)
+
+    assert converted.dtype == dtype
+    np.testing.assert_array_equal(converted, _reference_conversion(int16_complex_array))
+
+
+def test_conversion_of_non_contiguous_array(int16_complex_array):
+    view = int16_complex_array[:, ::2, 3:7]
+    assert not view.flags.c_contiguous
+
+    np.testing.assert_array_equal(
+        int16_complex_array_to_complex(view), _reference_conversion(view)
+    )
+
+
+def test_conversion_into_out(int16_complex_array):
+    out = np.empty(int16_complex_array.shape, dtype=np.complex64)
+
+    assert int16_complex_array_to_complex(int16_complex_array, out=out) is out
+    np.testing.assert_array_equal(out, _reference_conversion(int16_complex_array))
+
+    with pytest.raises(ValueError):
+        int16_complex_array_to_complex(int16_complex_array, out=out[0])
+
+    with pytest.raises(ValueError):
+        int16_complex_array_to_complex(int16_complex_array, out=out.real.copy())
+
+
+def test_round_trip(int16_complex_array):
+    converted = int16_complex_array_to_complex(int16_complex_array)
+    np.testing.assert_array_equal(complex_array_to_int16_complex(converted), int16_complex_array)
@@ -0,0 +1,102 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from acconeer.exptool._core import profiling
+from acconeer.exptool._core.profiling import StageProfiler
+
+
+def test_stages_are_counted_in_order_first_timed() -> None:
+    profiler = StageProfiler()
+
+    for _ in range(3):
+        with profiler.measure("b"):
+            pass
+        with profiler.measure("a"):
+            time.sleep(0.001)
+
+    stats = profiler.stats
+    assert list(stats) == ["b", "a"]
+    assert stats["a"].count == 3
+    assert stats["a"].counts.sum() == 3
+    assert stats["a"].min_s >= 0.001
+    assert stats["a"].min_s <= stats["a"].mean_s <= stats["a"].max_s
+    assert stats["a"].total_s == pytest.approx(3 * stats["a"].mean_s)
+
+
+def test_percentiles_are_within_a_bin(monkeypatch: pytest.MonkeyPatch) -> None:
+    durations_ns = [1_000] * 98 + [1_000_000] * 2
+    timestamps_ns = iter(
+        [timestamp for duration_ns in durations_ns for timestamp in (0, duration_ns)]
+    )
+    monkeypatch.setattr(profiling.time, "perf_counter_ns", lambda: next(timestamps_ns))
+
+    profiler = StageProfiler()
+    for _ in durations_ns:
+        with profiler.measure("stage"):
+            pass
+    monkeypatch.undo()
+
+    stats = profiler.stats["stage"]
+    assert stats.percentile(0) == pytest.approx(1e-6)
+    assert stats.percentile(50) == pytest.approx(1e-6)
+    assert stats.percentile(99) == pytest.approx(1e-3)
+    assert stats.percentile(100) == pytest.approx(1e-3)
+
+    with pytest.raises(ValueError):
+        stats.percentile(101)
+
+
+def test_nested_measures_of_a_stage_are_timed_separately() -> None:
+    profiler = StageProfiler()
+
+    with profiler.measure("stage"):
+        with profiler.measure("stage"):
+            pass
+        time.sleep(0.001)
+
+    stats = profiler.stats["stage"]
+    assert stats.count == 2
+    assert stats.min_s < 0.001 <= stats.max_s
+
+
+def test_reset_forgets_durations() -> None:
+    profiler = StageProfiler()
+    with profiler.measure("stage"):
+        pass
+
+    profiler.reset()
+    assert profiler.stats == {}
+
+    with profiler.measure("stage"):
+        pass
+    assert profiler.stats["stage"].count == 1
+
+
+def test_summary_has_a_row_per_stage() -> None:
+    profiler = StageProfiler()
+    for stage in ["read_header", "process"]:
+        with profiler.measure(stage):
+            pass
+
+    (header, *rows) = profiler.summary().splitlines()
+    assert header.split()[:2] == ["stage", "count"]
+    assert [row.split()[0] for row in rows] == ["read_header", "process"]
+
+
+def test_laps_time_consecutive_stages(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(profiling.time, "perf_counter_ns", iter([30, 100]).__next__)
+    profiler = StageProfiler()
+
+    timestamp = profiler.lap("first", 10)
+    profiler.lap("second", timestamp)
+    monkeypatch.undo()
+
+    stats = profiler.stats
+    assert stats["first"].total_s == pytest.approx(20e-9)
+    assert stats["second"].total_s == pytest.approx(70e-9)
@@ -0,0 +1,168 @@
+# Copyright (c) Acconeer AB, 2024
+# All rights reserved
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+from acconeer.exptool import a111
+from acconeer.exptool.a111._clients.base import BaseClient, ClientError
+from acconeer.exptool.a111._clients.mock.client import MockClient
+from acconeer.exptool.a111._clients.multiwrap import MultiClientWrapper
+
+
+class _DelayedClient(BaseClient):
+    """Returns the frame index as data, after sleeping the delay of each frame"""
+
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self._delays = delays
+
+    def _connect(self):
+        return {"mock": True}
+
+    def _setup_session(self, config):
+        return {}
+
+    def _start_session(self):
+        self._frame_idx = 0
+
+    def _get_next(self):
+        if self._frame_idx >= len(self._delays):
+            raise RuntimeError("out of frames")
+
+        time.sleep(self._delays[self._frame_idx])
+        self._frame_idx += 1
+        return [{}], np.full((1, 3), self._frame_idx - 1)
+
+    def _stop_session(self):
+        pass
+
+    def _disconnect(self):
+        pass
+
+    @property
+    def description(self):
+        return "delayed"
+
+
+def _two_sensor_config():
+    config = a111.EnvelopeServiceConfig()
+    config.sensor = [1, 2]
+    config.update_rate = 100
+    return config
+
+
+@pytest.mark.parametrize("max_skew", [None, 1.0])
+def test_concurrent_matches_sequential(max_skew):
+    sequential = MultiClientWrapper([MockClient(), MockClient()])
+    concurrent = MultiClientWrapper(
+        [MockClient(), MockClient()], concurrent=True, max_skew=max_skew
+    )
+
+    for client in [sequential, concurrent]:
+        client.start_session(_two_sensor_config())
+
+    for _ in range(5):
+        (sequential_info, sequential_data) = sequential.get_next()
+        (concurrent_info, concurrent_data) = concurrent.get_next()
+
+        assert concurrent_info == sequential_info
+        assert concurrent_data.shape == sequential_data.shape
+
+    assert concurrent.dropped_frames == [0, 0]
+
+    for client in [sequential, concurrent]:
+        client.disconnect()
+
+
+def test_concurrent_reads_clients_at_the_same_time():
+    delays = [0.05] * 4
+    client = MultiClientWrapper([_DelayedClient(delays), _DelayedClient(delays)], concurrent=True)
+    client.start_session(_two_sensor_config())
+
+    start = time.perf_counter()
+    for frame_idx in range(3):
+        (_, data) = client.get_next()
+        np.testing.assert_array_equal(data[:, 0], [frame_idx, frame_idx])
+
+    assert time.perf_counter() - start < 2 * 3 * 0.05
+    client.disconnect()
+
+
+def test_frames_are_aligned_by_arrival():
+    client = MultiClientWrapper(
+        [_DelayedClient([0, 0, 0.3, 0.3, 0.3]), _DelayedClient([0.3, 0.3, 0.3])],
+        concurrent=True,
+        max_skew=0.15,
+    )
+    client.start_session(_two_sensor_config())
+
+    (_, data) = client.get_next()
+    np.testing.assert_array_equal(data[:, 0], [2, 0])
+    assert client.dropped_frames == [2, 0]
+
+    client.disconnect()
+
+
+def test_errors_of_a_client_are_raised():
+    client = MultiClientWrapper([_DelayedClient([0]), _DelayedClient([0])], concurrent=True)
+    client.start_session(_two_sensor_config())
+    client.get_next()
+
+    with pytest.raises(ClientError):
+        client.get_next()
+
+    client.disconnect()
+
+
+def test_oldest_frames_are_dropped_when_queues_are_full():
+    client = MultiClientWrapper(
+        [_DelayedClient([0] * 10), _DelayedClient([0] * 10)], concurrent=True, queue_size=2
+    )
+    client.start_session(_two_sensor_config())
+
+    # Let both clients stream all frames, and then fail, without taking any frames
+    time.sleep(0.2)
+
+    (_, data) = client.get_next()
+    np.testing.assert_array_equal(data[:, 0], [9, 9])
+    assert client.dropped_frames == [9, 9]
+
+    with pytest.raises(ClientError):
+        client.get_next()
+
+    client.disconnect()
+
+
+def test_frames_stay_paired_when_queues_overflow():
+    num_frames = 40
+    late_client = _DelayedClient([0.2] + [0.001] * (num_frames - 1))
+    steady_client = _DelayedClient([0.01] * num_frames)
+    client = MultiClientWrapper([late_client, steady_client], concurrent=True, queue_size=4)
+    client.start_session(_two_sensor_config())
+
+    # The late client then streams faster than the steady one, so both queues overflow
+    time.sleep(0.3)
+
+    frame_idxs = []
+    with pytest.raises(ClientError):
+        while True:
+            (_, data) = client.get_next()
+            assert data[0, 0] == data[1, 0]
+            frame_idxs.append(data[0, 0])
+
+    assert frame_idxs == sorted(frame_idxs)
+    assert frame_idxs[-1] == num_frames - 1
+    dropped_frames = client.dropped_frames
+    assert dropped_frames[0] == dropped_frames[1] == num_frames - len(frame_idxs)
+
+    client.disconnect()
+
+
+def test_queue_size_must_be_positive():
+    with pytest.raises(ValueError):
+        MultiClientWrapper([_DelayedClient([0])], concurrent=True, queue_size=0)
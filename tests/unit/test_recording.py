@@ -127,3 +127,129 @@ def ref_record_file_a121(tmp_path):
 def test_open_record_a121(ref_record_file_a121):
     with pytest.raises(Exception):
         a111.recording.load(ref_record_file_a121)
+
+
+def _sample_frames(mocker, recorders, num_frames):
+    for _ in range(num_frames):
+        data_info, data = mocker.get_next()
+        for recorder in recorders:
+            recorder.sample(data_info, data)
+
+
+def test_max_len_keeps_latest_frames(mocker):
+    config = a111.EnvelopeServiceConfig()
+    config.sensor = [1, 2]
+    session_info = mocker.start_session(config)
+
+    recorder = a111.recording.Recorder(sensor_config=config, session_info=session_info, max_len=3)
+    full_recorder = a111.recording.Recorder(sensor_config=config, session_info=session_info)
+    _sample_frames(mocker, [recorder, full_recorder], 5)
+
+    live_record = recorder.record
+    assert len(live_record.data) == 3
+    for (info, data), (expected_info, expected_data) in zip(
+        live_record, list(full_recorder.record)[2:]
+    ):
+        assert info == expected_info
+        np.testing.assert_array_equal(data, expected_data)
+
+    record = recorder.close()
+    full_record = full_recorder.close()
+
+    np.testing.assert_array_equal(record.data, full_record.data[2:])
+    assert record.data_info == full_record.data_info[2:]
+    np.testing.assert_allclose(record.sample_times, full_record.sample_times[2:], atol=1)
+
+
+@pytest.mark.parametrize("mode", a111.Mode)
+def test_recording_to_file(tmp_path, mode, mocker, monkeypatch):
+    config = a111._configs.MODE_TO_CONFIG_CLASS_MAP[mode]()
+    config.sensor = [1, 2]
+    session_info = mocker.start_session(config)
+
+    # Three frames per chunk, so that the file is written in several chunks
+    (_, data) = mocker.get_next()
+    monkeypatch.setattr(a111.recording._H5FrameWriter, "CHUNK_BYTES", 3 * data.nbytes)
+
+    path = tmp_path / "record.h5"
+    file_recorder = a111.recording.Recorder(
+        sensor_config=config, session_info=session_info, path=path
+    )
+    recorder = a111.recording.Recorder(sensor_config=config, session_info=session_info)
+    _sample_frames(mocker, [file_recorder, recorder], 10)
+
+    record = recorder.close()
+
+    with file_recorder.close() as file_record:
+        assert not isinstance(file_record.data, np.ndarray)
+        np.testing.assert_array_equal(file_record.data[4], record.data[4])
+        np.testing.assert_array_equal(file_record.data, record.data)
+        assert file_record.data_info[4] == record.data_info[4]
+        assert list(file_record.data_info) == record.data_info
+        np.testing.assert_allclose(file_record.sample_times, record.sample_times, atol=1)
+
+    loaded_record = a111.recording.load(path)
+    assert isinstance(loaded_record.data, np.ndarray)
+    assert loaded_record.data_info == record.data_info
+    assert loaded_record.sensor_config_dump == record.sensor_config_dump
+    assert loaded_record.session_info == record.session_info
+
+
+def test_recording_no_frames_to_file(tmp_path, mocker):
+    config = a111.EnvelopeServiceConfig()
+    session_info = mocker.start_session(config)
+    path = tmp_path / "record.h5"
+
+    recorder = a111.recording.Recorder(sensor_config=config, session_info=session_info, path=path)
+    with recorder.close() as record:
+        assert len(record.data) == 0
+
+    assert len(a111.recording.load(path).data_info) == 0
+
+
+def test_recording_to_file_with_max_len(tmp_path, mocker):
+    config = a111.EnvelopeServiceConfig()
+    session_info = mocker.start_session(config)
+
+    with pytest.raises(ValueError):
+        a111.recording.Recorder(
+            sensor_config=config, session_info=session_info, path=tmp_path / "a.h5", max_len=3
+        )
+
+
+def test_lazy_load(tmp_path, mocker):
+    config = a111.IQServiceConfig()
+    session_info = mocker.start_session(config)
+    recorder = a111.recording.Recorder(sensor_config=config, session_info=session_info)
+    _sample_frames(mocker, [recorder], 5)
+    record = recorder.close()
+
+    path = tmp_path / "record.h5"
+    a111.recording.save(path, record)
+    with a111.recording.load_h5(path, lazy=True) as lazy_record:
+        assert len(lazy_record.data) == 5
+        np.testing.assert_array_equal(lazy_record.data[3], record.data[3])
+        np.testing.assert_array_equal(np.array(lazy_record.data), record.data)
+        assert lazy_record.data_info == record.data_info
+
+    # The file is closed, so it can be written again
+    a111.recording.save(path, record)
+
+
+def test_closing_a_lazy_record_closes_its_file(tmp_path, mocker):
+    config = a111.EnvelopeServiceConfig()
+    session_info = mocker.start_session(config)
+    path = tmp_path / "record.h5"
+    recorder = a111.recording.Recorder(sensor_config=config, session_info=session_info, path=path)
+    _sample_frames(mocker, [recorder], 3)
+
+    record = recorder.close()
+    file = record.data.dataset.file
+    assert file.id.valid
+
+    record.close()
+    assert not file.id.valid
+
+    # Records kept in memory have no file to close
+    in_memory_record = a111.recording.load(path)
+    in_memory_record.close()
@@ -1,6 +1,8 @@
-# Copyright (c) Acconeer AB, 2022
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
+import pytest
+
 import acconeer.exptool.a111._clients.reg.protocol as ptcl
 from acconeer.exptool.a111 import Mode
 from acconeer.exptool.a111._clients.reg import regmap
@@ -60,6 +62,16 @@ def test_unpack_stream_data_segment():
     assert unpacked == unp_stream_data
 
 
+def test_unpack_truncated_stream_data_segment():
+    pkd_stream_data_segment = bytearray()
+    pkd_stream_data_segment.append(ptcl.STREAM_RESULT_INFO)
+    pkd_stream_data_segment.extend(b"\x0a\x00")
+    pkd_stream_data_segment.extend(pkd_reg_read_res_segment)
+
+    with pytest.raises(ptcl.ProtocolError):
+        ptcl.unpack_stream_data_segment(pkd_stream_data_segment)
+
+
 def test_pack_packet():
     packed = ptcl.pack_packet(unp_reg_write_req)
     assert packed == pkd_reg_write_req_packet
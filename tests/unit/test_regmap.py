@@ -1,4 +1,4 @@
-# Copyright (c) Acconeer AB, 2022
+# Copyright (c) Acconeer AB, 2022-2024
 # All rights reserved
 
 import inspect
@@ -51,6 +51,40 @@ def test_get_reg():
     assert regmap.get_reg(reg.addr, reg.modes[0]) == reg
 
 
+def _decode_result_info_per_reg(result_info, mode):
+    info = {}
+    for addr, enc_val in result_info:
+        try:
+            reg = regmap.get_reg(addr, mode)
+            val = reg.decode(enc_val)
+        except ValueError:
+            continue
+
+        k = regmap.STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, reg.stripped_name)
+        if k is not None:
+            info[k] = val
+
+    return info
+
+
+@pytest.mark.parametrize("mode", [Mode.POWER_BINS, Mode.ENVELOPE, Mode.IQ, Mode.SPARSE])
+def test_result_info_decoder_matches_get_reg(mode):
+    decoder = regmap.ResultInfoDecoder(mode)
+    unknown_addr = max(reg.addr for reg in regmap.REGISTERS) + 1
+
+    for enc_val in [b"\x00\x00\x00\x00", b"\x01\x00\x00\x00", b"\xff\xff\xff\xff"]:
+        result_info = [(reg.addr, enc_val) for reg in regmap.get_regs_for_mode(mode)]
+        result_info.append((unknown_addr, enc_val))
+
+        assert decoder.decode(result_info) == _decode_result_info_per_reg(result_info, mode)
+
+    assert [reg for _, reg in decoder.data_info_regs] == [
+        reg
+        for reg in regmap.get_data_info_regs(mode)
+        if regmap.STRIPPED_NAME_TO_INFO_REMAP.get(reg.stripped_name, 0) is not None
+    ]
+
+
 def test_config_to_reg_map_completeness():
     all_param_keys = set()
 